@@ -2,6 +2,11 @@
 from datetime import datetime
 
 class Document:
+    # Attributs fixes (pas de __dict__ par instance) ; le contenu complet peut être lu à la demande
+    # depuis un DocumentStore (voir Class.document_store)
+    __slots__ = ("source_nom", "auteur", "titre", "description", "url", "urlImage", "datePubication",
+                 "contenu", "_full_content", "_magasin", "_doc_id")
+
     # Constructeur de la classe Document
     def __init__(self, source_nom, auteur, titre, description, url, urlImage, datePubication, contenu, full_content):
         """
@@ -37,7 +42,48 @@ class Document:
             raise TypeError("La date de publication doit être une chaîne ou un objet datetime")
         
         self.contenu = contenu
-        self.full_content = full_content
+        self._full_content = full_content
+        self._magasin = None
+        self._doc_id = None
+
+    @property
+    def full_content(self):
+        """Contenu complet, lu dans le magasin de documents s'il n'est pas en mémoire."""
+        if self._full_content is None and self._magasin is not None:
+            return self._magasin.body(self._doc_id)
+        return self._full_content
+
+    @full_content.setter
+    def full_content(self, full_content):
+        self._full_content = full_content
+
+    def attacher(self, magasin, doc_id):
+        """
+        Confie le contenu complet au magasin de documents : il n'est plus conservé par l'instance.
+
+        :param magasin: DocumentStore contenant le document.
+        :param doc_id: Identifiant du document dans le magasin.
+        """
+        self._magasin = magasin
+        self._doc_id = doc_id
+        self._full_content = None
+
+    # Sérialisation (pickle) : le contenu complet est toujours inclus
+    def __getstate__(self):
+        etat = {champ: getattr(self, champ) for champ in self.__slots__ if not champ.startswith("_")}
+        etat["full_content"] = self.full_content
+        return etat
+
+    def __setstate__(self, etat):
+        # Les anciens pickles (avant __slots__) fournissent le __dict__ de l'instance, de même forme
+        if isinstance(etat, tuple):
+            etat = {**(etat[0] or {}), **(etat[1] or {})}
+        for champ in self.__slots__:
+            if not champ.startswith("_"):
+                setattr(self, champ, etat.get(champ))
+        self._full_content = etat.get("full_content", etat.get("_full_content"))
+        self._magasin = None
+        self._doc_id = None
 
     # Getters
     def get_source_nom(self):
@@ -1,8 +1,15 @@
-import re
+import numpy as np
 import pandas as pd
-from collections import defaultdict
+from collections import Counter
+from Class.analyzer import ANALYSEUR_FR
 
 class Source:
+    # Moteur de recherche qui indexe la source (voir index), non enregistré avec la source
+    moteur = None
+    # Magasin de documents et identifiants des documents qui n'en sont pas encore lus (voir attacher_magasin)
+    _magasin = None
+    _differes = None
+
     def __init__(self, name, ndoc=0, production=None):
         """
         Initialise une instance de la classe Source.
@@ -13,18 +20,90 @@ class Source:
         """
         self.name = name
         self.ndoc = ndoc
-        self.production = production if production is not None else {}
+        self._production = production if production is not None else {}
+
+    @property
+    def production(self):
+        """Dictionnaire associant un ID à un document ; les documents différés sont construits au premier accès."""
+        if self._differes:
+            # Les documents différés précèdent ceux ajoutés depuis (identifiants croissants)
+            self._production = {**{doc_id: self._magasin[doc_id] for doc_id in self._differes}, **self._production}
+            self._differes = None
+        return self._production
+
+    @production.setter
+    def production(self, production):
+        self._production = production
+        self._differes = None
+
+    def attacher_magasin(self, magasin, doc_ids):
+        """
+        Rattache à la source des documents d'un magasin (DocumentStore) sans les construire :
+        ils ne le sont qu'au premier accès à production.
+
+        :param magasin: DocumentStore contenant les documents.
+        :param doc_ids: Identifiants des documents de la source dans le magasin (croissants).
+        """
+        self._magasin = magasin
+        if self._differes is None:
+            self._differes = {}
+        self._differes.update(dict.fromkeys(doc_ids, True))
+        self.ndoc += len(doc_ids)
 
     def add(self, document, doc_id):
         """
-        Ajoute un document à la production de la source.
+        Ajoute un document à la production de la source. Si la source est déjà indexée,
+        le document l'est aussi (voir SearchEngine.add_source_documents) ; un document ajouté
+        sous un identifiant déjà utilisé remplace l'ancien, dans la source comme dans l'index.
 
         :param document: Document à ajouter
         :param doc_id: Identifiant unique du document
         """
-        self.production[doc_id] = document
+        if doc_id in self._production or (self._differes and doc_id in self._differes):
+            if self.moteur is not None:
+                self.moteur.remove_documents([i for i, cle in self.moteur.documents_source(self.name) if cle == doc_id])
+            self.remove(doc_id)
+        self._ranger(document, doc_id)
+        if self.moteur is not None:
+            self.moteur.add_source_documents(self.name, [document], [doc_id])
+
+    def _ranger(self, document, doc_id):
+        """Range un document dans la production de la source, sans l'indexer."""
+        self._production[doc_id] = document
         self.ndoc += 1
 
+    def remove(self, doc_id):
+        """
+        Retire un document de la production de la source.
+
+        :param doc_id: Identifiant unique du document
+        :return: Le document retiré, ou None s'il n'existe pas
+        """
+        if self._differes and self._differes.pop(doc_id, None):
+            document = self._magasin[doc_id]
+        else:
+            document = self._production.pop(doc_id, None)
+        if document is not None:
+            self.ndoc -= 1
+        return document
+
+    def __getstate__(self):
+        # Les documents différés sont construits : le magasin n'est pas enregistré avec la source
+        self.production
+        etat = self.__dict__.copy()
+        for attribut in ("moteur", "_magasin", "_differes"):
+            etat.pop(attribut, None)
+        return etat
+
+    def __setstate__(self, etat):
+        # Sources enregistrées avant que production ne soit une propriété...
+        if "production" in etat:
+            etat["_production"] = etat.pop("production")
+        # ... ou avec un cache de comptes de termes, désormais lus dans l'index
+        etat.pop("_comptes", None)
+        etat.pop("_analyseur_comptes", None)
+        self.__dict__.update(etat)
+
     def __str__(self):
         """
         Retourne une représentation textuelle de la source.
@@ -37,102 +116,70 @@ class Source:
             f"Documents disponibles : {', '.join(map(str, self.production.keys())) if self.production else 'Aucun document.'}"
         )
 
-    def search(self, keyword):
+    def index(self):
+        """
+        Retourne le moteur de recherche qui indexe les documents de la source.
+        Une source qui n'est rattachée à aucun moteur est indexée seule, une fois.
+
+        :return: SearchEngine
+        """
+        if self.moteur is None:
+            # Import local : le moteur de recherche dépend lui-même de Source
+            from Class.search_engine import SearchEngine
+            SearchEngine({self.name: self})
+        return self.moteur
+
+    def search(self, keyword, context_size=20):
         """
-        Recherche les passages contenant le mot-clé dans tous les documents des Sources.
+        Recherche les passages contenant le mot-clé dans les documents de la source.
 
         :param keyword: Mot-clé à rechercher
+        :param context_size: Nombre de caractères conservés de part et d'autre du mot-clé (int)
         :return: Liste des passages contenant le mot-clé
         """
-        # Concaténer tous les contenus des documents la première fois
-        if self._concatenated_content is None:
-            self._concatenated_content = " ".join(
-                doc.full_content for doc in self.production.values() if doc.full_content
-            )
-
-        # Rechercher les passages contenant le mot-clé
-        matches = re.finditer(rf"(.{{0,20}}{re.escape(keyword)}.{{0,20}})", self._concatenated_content, re.IGNORECASE)
-        
-        # Retourner les passages trouvés
-        return [match.group(0) for match in matches]
-    
+        return [gauche + motif + droit for _, gauche, motif, droit in
+                self.index().concordance(keyword, context_size, sources=[self.name])]
+
     def concorde(self, expression, context_size=30):
         """
-        Construit un concordancier pour une expression donnée.
+        Construit un concordancier pour une expression donnée, à partir des positions de l'index
+        (voir SearchEngine.concordance) : les contextes restent dans le document de chaque occurrence.
 
-        :param expression: Expression régulière à rechercher (str)
+        :param expression: Mot ou suite de mots à rechercher (str)
         :param context_size: Taille du contexte gauche et droit (int)
-        :return: DataFrame avec les colonnes 'contexte gauche', 'motif trouvé', 'contexte droit'
-        """
-        # Construire le contenu concaténé si ce n'est pas déjà fait
-        if self._concatenated_content is None:
-            self._concatenated_content = " ".join(
-                doc.full_content for doc in self.production.values() if doc.full_content
-            )
-        
-        # Expression régulière pour capturer le motif avec le contexte
-        pattern = re.compile(rf"(.{{0,{context_size}}})({expression})(.{{0,{context_size}}})", re.IGNORECASE)
-        matches = pattern.findall(self._concatenated_content)
-        
-        # Construire un DataFrame à partir des résultats
-        df = pd.DataFrame(matches, columns=["contexte gauche", "motif trouvé", "contexte droit"])
-        return df
-    
+        :return: DataFrame avec les colonnes 'doc_id', 'contexte gauche', 'motif trouvé', 'contexte droit'
+        """
+        occurrences = self.index().concordance(expression, context_size, sources=[self.name])
+        return pd.DataFrame(occurrences, columns=["doc_id", "contexte gauche", "motif trouvé", "contexte droit"])
+
     def nettoyer_texte(self, texte):
         """
         Nettoie une chaîne de caractères en supprimant les stop words et en appliquant des transformations :
         - Convertit le texte en minuscules.
-        - Remplace les passages à la ligne par des espaces.
-        - Supprime les ponctuations et les chiffres.
-        - Supprime les caractères spéciaux.
+        - Remplace les lettres accentuées par leur lettre de base.
+        - Supprime les ponctuations, les caractères spéciaux et les chiffres.
         - Supprime les mots présents dans une liste de stop words.
+        Le traitement est délégué à l'analyseur partagé (voir Class.analyzer).
 
         :param texte: Chaîne de caractères à nettoyer.
         :return: Texte nettoyé sans stop words.
         """
-        # Liste des stop words en français
-        stop_words_fr = [
-            'a', 'alors', 'ans', 'après', 'au', 'aucun', 'auquel', 'aussi', 'autre', 'autres', 'aux', 
-            'auxquels', 'avant', 'avec', 'avoir', 'b', 'bon', 'c', 'car', 'ce', 'cela', 'ces', 'cet', 
-            'cette', 'ceux', 'chaque', 'chez', 'ci', 'comme', 'comment', 'contre', 'd', 'dans', 'de', 
-            'dedans', 'dehors', 'depuis', 'des', 'desquels', 'deux', 'devrait', 'dit', 'doit', 'donc', 
-            'dont', 'dos', 'droite', 'du', 'duquel', 'début', 'e', 'elle', 'elles', 'en', 'encore', 
-            'entre', 'essai', 'est', 'et', 'eu', 'f', 'fait', 'faites', 'faut', 'fois', 'font', 'force', 
-            'g', 'h', 'haut', 'hors', 'i', 'ici', 'il', 'ils', 'j', 'je', 'jour', 'juste', 'k', 'l', 
-            'la', 'laquelle', 'le', 'lequel', 'les', 'lesquelles', 'lesquels', 'leur', 'leurs', 'là', 
-            'm', 'ma', 'maintenant', 'mais', 'mes', 'mien', 'moins', 'mon', 'mot', 'même', 'n', 'ne', 
-            'ni', 'nom', 'nommés', 'non', 'nos', 'notre', 'nous', 'nouveau', 'nouveaux', 'o', 'ont', 
-            'ou', 'où', 'p', 'par', 'parce', 'parole', 'pas', 'pendant', 'personnes', 'peu', 'peut', 
-            'pièce', 'plupart', 'plus', 'pour', 'pourquoi', 'q', 'quand', 'que', 'quel', 'quelle', 
-            'quelles', 'quels', 'qui', 'r', 's', 'sa', 'sans', 'ses', 'seulement', 'si', 'sien', 'son', 
-            'sont', 'sous', 'soyez', 'sujet', 'sur', 't', 'ta', 'tandis', 'tellement', 'tels', 'tes', 
-            'ton', 'tous', 'tout', 'trois', 'trop', 'très', 'tu', 'u', 'un', 'une', 'v', 'vient', 
-            'voient', 'vont', 'vos', 'votre', 'vous', 'vu', 'w', 'x', 'y', 'z', 'à', 'ça', 'étaient', 
-            'était', 'étant', 'état', 'étions', 'été', 'être',"cest","se","nest"
-        ]
-
-
-        # Conversion en minuscules
-        texte = texte.lower()
-
-        # Remplacement des passages à la ligne par des espaces
-        texte = texte.replace("\n", " ")
-
-        # Suppression des ponctuations et des chiffres
-        texte = re.sub(r'[^\w\s]', '', texte)  
-        texte = re.sub(r'\d+', '', texte) 
+        return ANALYSEUR_FR.analyser(texte)
 
-        # Suppression des caractères spéciaux
-        texte = texte.encode("ascii", "ignore").decode("utf-8") 
-
-        # Suppression des stop words
-        mots_filtres = [mot for mot in texte.split() if mot not in stop_words_fr]
-
-        # Recontitution du texte nettoyé
-        texte_nettoye = " ".join(mots_filtres)
-
-        return texte_nettoye
+    def comptes_termes(self):
+        """
+        Retourne les comptes de termes de chaque document, lus dans les lignes de l'index
+        du moteur (les documents ne sont pas retokenisés).
 
+        :return: Dictionnaire associant l'ID de chaque document à un Counter {mot: occurrences}.
+        """
+        moteur = self.index()
+        termes = moteur.vocab.termes
+        comptes = {}
+        for doc_id, cle in moteur.documents_source(self.name):
+            term_ids, tfs = moteur.ligne(doc_id)
+            comptes[cle] = Counter(dict(zip([termes[i] for i in term_ids.tolist()], tfs.tolist())))
+        return comptes
 
     def stats(self, n=10):
         """
@@ -140,53 +187,43 @@ class Source:
         - Nombre de mots différents.
         - Les n mots les plus fréquents.
         - Tableau freq avec term frequency et document frequency.
+        Les comptes sont lus dans les lignes de l'index du moteur (voir SearchEngine.comptes_termes).
 
         :param n: Nombre de mots les plus fréquents à afficher.
         :return: Un dictionnaire contenant les statistiques textuelles.
         """
-        vocabulaire = set()  # Pour stocker les mots uniques
-        freq_totale = defaultdict(int)  # Pour stocker les fréquences totales
-        freq_documents = defaultdict(int)  # Pour stocker les fréquences par document
-
-        # Parcourir les documents pour construire le vocabulaire et compter les occurrences
-        for _, doc in self.production.items():
-            texte_nettoye = self.nettoyer_texte(doc.full_content)
-            mots = texte_nettoye.split()
-            
-            # Ajouter les mots au vocabulaire et compter les occurrences
-            mots_uniques = set(mots)
-            vocabulaire.update(mots_uniques)
-            
-            # Compter les occurrences
-            for mot in mots:
-                freq_totale[mot] += 1
-            for mot in mots_uniques:
-                freq_documents[mot] += 1
+        moteur = self.index()
+        doc_ids = [doc_id for doc_id, _ in moteur.documents_source(self.name)]
+        term_ids, occurrences, document_frequency = moteur.comptes_termes(doc_ids)
+        termes = [moteur.vocab.termes[i] for i in term_ids.tolist()]
+        freq_totale = dict(zip(termes, occurrences.tolist()))  # Fréquences totales
+        freq_documents = dict(zip(termes, document_frequency.tolist()))  # Fréquences par document
 
         # Trier le vocabulaire pour attribuer des identifiants uniques
-        vocabulaire = sorted(vocabulaire)
+        vocabulaire = sorted(freq_totale)
         vocab = {
             mot: {
                 "id": idx,
                 "occurrences": freq_totale[mot],
                 "document_frequency": freq_documents[mot],
-                "length": len(mot)  
+                "length": len(mot)
             }
             for idx, mot in enumerate(vocabulaire)
         }
 
-        # Construire un DataFrame
+        # Construire un DataFrame des seuls n mots les plus fréquents (sélection partielle, sans trier tout le vocabulaire)
+        top = np.argpartition(-occurrences, n - 1)[:n] if 0 < n < len(occurrences) else np.arange(len(occurrences))
+        top = top[np.lexsort((top, -occurrences[top]))][:max(n, 0)]
         freq = pd.DataFrame({
-            "mots": list(freq_totale.keys()),
-            "term_frequency": list(freq_totale.values()),
-            "document_frequency": [freq_documents[mot] for mot in freq_totale.keys()],
-        }).sort_values(by="term_frequency", ascending=False)
+            "mots": [termes[i] for i in top.tolist()],
+            "term_frequency": occurrences[top].tolist(),
+            "document_frequency": document_frequency[top].tolist(),
+        })
 
         # Retourner toutes les informations sous forme de dictionnaire
         return {
             "vocabulaire": vocab,
             "freq_totale": freq_totale,
             "freq_documents": freq_documents,
-            "freq_table": freq.head(n)  
+            "freq_table": freq
         }
-
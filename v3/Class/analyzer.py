@@ -0,0 +1,239 @@
+import re
+import unicodedata
+
+import numpy as np
+
+# Liste des stop words en français (frozenset : test d'appartenance en temps constant)
+STOP_WORDS_FR = frozenset([
+    'a', 'alors', 'ans', 'après', 'au', 'aucun', 'auquel', 'aussi', 'autre', 'autres', 'aux',
+    'auxquels', 'avant', 'avec', 'avoir', 'b', 'bon', 'c', 'car', 'ce', 'cela', 'ces', 'cet',
+    'cette', 'ceux', 'chaque', 'chez', 'ci', 'comme', 'comment', 'contre', 'd', 'dans', 'de',
+    'dedans', 'dehors', 'depuis', 'des', 'desquels', 'deux', 'devrait', 'dit', 'doit', 'donc',
+    'dont', 'dos', 'droite', 'du', 'duquel', 'début', 'e', 'elle', 'elles', 'en', 'encore',
+    'entre', 'essai', 'est', 'et', 'eu', 'f', 'fait', 'faites', 'faut', 'fois', 'font', 'force',
+    'g', 'h', 'haut', 'hors', 'i', 'ici', 'il', 'ils', 'j', 'je', 'jour', 'juste', 'k', 'l',
+    'la', 'laquelle', 'le', 'lequel', 'les', 'lesquelles', 'lesquels', 'leur', 'leurs', 'là',
+    'm', 'ma', 'maintenant', 'mais', 'mes', 'mien', 'moins', 'mon', 'mot', 'même', 'n', 'ne',
+    'ni', 'nom', 'nommés', 'non', 'nos', 'notre', 'nous', 'nouveau', 'nouveaux', 'o', 'ont',
+    'ou', 'où', 'p', 'par', 'parce', 'parole', 'pas', 'pendant', 'personnes', 'peu', 'peut',
+    'pièce', 'plupart', 'plus', 'pour', 'pourquoi', 'q', 'quand', 'que', 'quel', 'quelle',
+    'quelles', 'quels', 'qui', 'r', 's', 'sa', 'sans', 'ses', 'seulement', 'si', 'sien', 'son',
+    'sont', 'sous', 'soyez', 'sujet', 'sur', 't', 'ta', 'tandis', 'tellement', 'tels', 'tes',
+    'ton', 'tous', 'tout', 'trois', 'trop', 'très', 'tu', 'u', 'un', 'une', 'v', 'vient',
+    'voient', 'vont', 'vos', 'votre', 'vous', 'vu', 'w', 'x', 'y', 'z', 'à', 'ça', 'étaient',
+    'était', 'étant', 'état', 'étions', 'été', 'être', "cest", "se", "nest"
+])
+
+# Expressions régulières compilées une seule fois
+_MOTIF_PONCTUATION = re.compile(r"[^\w\s]|\d")
+_MOTIF_NON_ASCII = re.compile(r"[^\x00-\x7f]+")
+# Séquence UTF-8 lue à tort en Latin-1 ("Ã©" au lieu de "é", "â\x80\x99" au lieu de "’")
+_MOTIF_MOJIBAKE = re.compile(r"[\xc2-\xf4][\x80-\xbf]+")
+# Blancs ASCII qui séparent les morceaux de texte (l'espace insécable peut appartenir à une séquence mal décodée)
+_BLANCS_ASCII = " \t\n\r\f\v"
+# Tables des caractères ASCII : blancs ASCII, caractères de mot (\w), blancs de str.split
+_TABLE_BLANCS = np.array([chr(c) in _BLANCS_ASCII for c in range(128)])
+_TABLE_MOTS = np.array([chr(c).isalnum() or chr(c) == "_" for c in range(128)])
+_TABLE_ESPACES = np.array([chr(c).isspace() for c in range(128)])
+
+# Lettres sans décomposition NFKD, repliées explicitement
+_LIGATURES = {"œ": "oe", "Œ": "OE", "æ": "ae", "Æ": "AE", "ß": "ss", "ø": "o", "Ø": "O",
+              "đ": "d", "Đ": "D", "ł": "l", "Ł": "L", "ı": "i"}
+
+
+def _construire_table_accents():
+    """
+    Précalcule la table str.translate qui replie les caractères latins accentués sur leur
+    lettre de base : décomposition NFKD puis suppression des diacritiques (é -> e, ﬁ -> fi).
+    Seules les correspondances donnant des lettres ASCII sans espace sont retenues.
+
+    :return: Table de traduction (dict {code: str}).
+    """
+    plages = [range(0x00C0, 0x0250), range(0x1E00, 0x1F00), range(0xFB00, 0xFB07), [0x00AA, 0x00BA]]
+    table = {}
+    for plage in plages:
+        for code in plage:
+            caractere = chr(code)
+            decompose = unicodedata.normalize("NFKD", caractere)
+            replie = "".join(c for c in decompose if not unicodedata.combining(c))
+            if replie != caractere and replie.isascii() and replie.isalpha():
+                table[code] = replie
+    for caractere, replie in _LIGATURES.items():
+        table[ord(caractere)] = replie
+    return table
+
+
+_TABLE_ACCENTS = _construire_table_accents()
+
+
+def _decoder_mojibake(match):
+    sequence = match.group()
+    try:
+        return sequence.encode("latin-1").decode("utf-8")
+    except UnicodeError:
+        return sequence
+
+
+def reparer_encodage(texte):
+    """Répare les séquences UTF-8 décodées en Latin-1 par erreur (prÃ©senter -> présenter)."""
+    return _MOTIF_MOJIBAKE.sub(_decoder_mojibake, texte)
+
+
+def minuscules(texte):
+    """Convertit le texte en minuscules."""
+    return texte.lower()
+
+
+def supprimer_ponctuation(texte):
+    """Supprime les ponctuations, les caractères spéciaux et les chiffres."""
+    return _MOTIF_PONCTUATION.sub("", texte)
+
+
+def _replier_sequence(match):
+    return match.group().translate(_TABLE_ACCENTS)
+
+
+def replier_accents(texte):
+    """
+    Remplace les lettres accentuées par leur lettre de base (é -> e, ç -> c, œ -> oe).
+    La table n'est appliquée qu'aux séquences non ASCII, le reste du texte est parcouru par l'expression régulière.
+    """
+    return _MOTIF_NON_ASCII.sub(_replier_sequence, texte)
+
+
+def supprimer_non_ascii(texte):
+    """Supprime les caractères non ASCII (dont les lettres accentuées)."""
+    return _MOTIF_NON_ASCII.sub("", texte)
+
+
+def _points_de_code(texte):
+    """Retourne les points de code du texte (np.ndarray de uint32)."""
+    return np.frombuffer(texte.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+
+def _classer(codes, table_ascii, predicat):
+    """
+    Indique les points de code qui appartiennent à une classe de caractères : lue dans table_ascii
+    pour les caractères ASCII, évaluée par predicat une seule fois par caractère non ASCII distinct.
+
+    :param codes: Points de code (np.ndarray).
+    :param table_ascii: Appartenance des 128 caractères ASCII (np.ndarray de bool).
+    :param predicat: Fonction str -> bool.
+    :return: Masque (np.ndarray de bool).
+    """
+    masque = np.zeros(len(codes), dtype=bool)
+    ascii_ = codes < 128
+    masque[ascii_] = table_ascii[codes[ascii_]]
+    autres = np.flatnonzero(~ascii_)
+    if len(autres):
+        distincts, inverse = np.unique(codes[autres], return_inverse=True)
+        masque[autres] = np.array([predicat(chr(c)) for c in distincts.tolist()], dtype=bool)[inverse]
+    return masque
+
+
+def _debuts_de_suites(masque):
+    """Retourne les indices où commence une suite de True dans un masque."""
+    return np.flatnonzero(masque & np.concatenate(([True], ~masque[:-1])))
+
+
+class Analyzer:
+    def __init__(self, filtres=None, stop_words=STOP_WORDS_FR):
+        """
+        Initialise une chaîne d'analyse de texte.
+        Chaque filtre est une fonction str -> str appliquée à tout le texte, dans l'ordre ;
+        le texte est ensuite découpé en mots et les stop words sont retirés.
+        Les stop words passent par les mêmes filtres ("été" devient "ete" si les accents sont repliés).
+
+        :param filtres: Liste de filtres (par défaut : encodage, minuscules, accents, ponctuation).
+        :param stop_words: Ensemble de mots à ignorer (par défaut : STOP_WORDS_FR).
+        """
+        if filtres is None:
+            filtres = [reparer_encodage, minuscules, replier_accents, supprimer_ponctuation]
+        self.filtres = list(filtres)
+        self.stop_words = frozenset(self.normaliser(mot) for mot in stop_words) if stop_words else frozenset()
+
+    def normaliser(self, texte):
+        """
+        Applique les filtres au texte.
+
+        :param texte: Chaîne de caractères à normaliser.
+        :return: Texte normalisé (str).
+        """
+        for filtre in self.filtres:
+            texte = filtre(texte)
+        return texte
+
+    def tokens(self, texte):
+        """
+        Découpe le texte normalisé en mots et retire les stop words.
+
+        :param texte: Chaîne de caractères à analyser.
+        :return: Liste des mots retenus.
+        """
+        stop_words = self.stop_words
+        return [mot for mot in self.normaliser(texte).split() if mot not in stop_words]
+
+    def positions(self, texte):
+        """
+        Découpe le texte comme tokens(), en conservant l'emplacement de chaque mot dans le texte d'origine.
+        Le texte est découpé en morceaux séparés par des blancs ASCII ; les morceaux, joints par des sauts
+        de ligne, sont normalisés en une seule fois. Les filtres ne font que transformer des caractères :
+        un mot normalisé provient donc toujours d'un seul morceau, celui dont il suit le saut de ligne
+        (si un filtre ajoute ou retire des sauts de ligne, chaque morceau est normalisé séparément).
+        Les bornes des morceaux et des mots sont calculées avec numpy sur les points de code.
+        La position d'un mot est son rang parmi les mots retenus (stop words exclus).
+
+        :param texte: Chaîne de caractères à analyser.
+        :return: Liste de tuples (mot, début, fin) : début et fin délimitent dans texte le morceau
+            d'où provient le mot, sans la ponctuation qui l'entoure.
+        """
+        codes = _points_de_code(texte)
+        dans_morceau = ~_TABLE_BLANCS[np.minimum(codes, 127)]  # les caractères non ASCII ne sont pas des blancs ASCII
+        debuts_morceaux = dans_morceau & np.concatenate(([True], ~dans_morceau[:-1]))
+        debuts = np.flatnonzero(debuts_morceaux)
+        if not len(debuts):
+            return []
+        fins = np.flatnonzero(dans_morceau & np.concatenate((~dans_morceau[1:], [True]))) + 1
+
+        # Cœur de chaque morceau : du premier au dernier caractère de mot (le morceau entier s'il n'en a pas)
+        coeurs_debut, coeurs_fin = debuts.copy(), fins.copy()
+        caracteres = np.flatnonzero(_classer(codes, _TABLE_MOTS, str.isalnum))
+        if len(caracteres):
+            morceaux_caracteres = (np.cumsum(debuts_morceaux) - 1)[caracteres]
+            premiers = np.flatnonzero(np.diff(morceaux_caracteres, prepend=-1))
+            derniers = np.append(premiers[1:], len(caracteres)) - 1
+            coeurs_debut[morceaux_caracteres[premiers]] = caracteres[premiers]
+            coeurs_fin[morceaux_caracteres[premiers]] = caracteres[derniers] + 1
+
+        # Normalisation des morceaux en une seule fois, un morceau par ligne
+        for blanc in _BLANCS_ASCII.replace("\n", ""):
+            texte = texte.replace(blanc, "\n")
+        morceaux = [morceau for morceau in texte.split("\n") if morceau]
+        normalise = self.normaliser("\n".join(morceaux))
+        codes = _points_de_code(normalise)
+        if np.count_nonzero(codes == 10) != len(morceaux) - 1:
+            normalise = "\n".join(self.normaliser(morceau).replace("\n", " ") for morceau in morceaux)
+            codes = _points_de_code(normalise)
+
+        # Morceau d'origine de chaque mot : nombre de sauts de ligne qui le précèdent
+        morceaux_mots = np.cumsum(codes == 10)[_debuts_de_suites(~_classer(codes, _TABLE_ESPACES, str.isspace))]
+        mots = normalise.split()
+        retenus = [mot not in self.stop_words for mot in mots]
+        morceaux_mots = morceaux_mots[np.array(retenus, dtype=bool)]
+        return list(zip([mot for mot, retenu in zip(mots, retenus) if retenu],
+                        coeurs_debut[morceaux_mots].tolist(), coeurs_fin[morceaux_mots].tolist()))
+
+    def analyser(self, texte):
+        """
+        Retourne le texte nettoyé : les mots retenus séparés par des espaces.
+
+        :param texte: Chaîne de caractères à nettoyer.
+        :return: Texte nettoyé sans stop words (str).
+        """
+        return " ".join(self.tokens(texte))
+
+    __call__ = tokens
+
+
+# Analyseur partagé par les sources et le moteur de recherche
+ANALYSEUR_FR = Analyzer()
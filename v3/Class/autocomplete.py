@@ -0,0 +1,76 @@
+from collections import Counter
+
+
+class CompletionTrie:
+    # Nombre de suggestions précalculées pour chaque préfixe
+    TAILLE_TOP = 10
+
+    # Longueur des n-grammes de titres proposés, et nombre minimal de titres qui doivent les contenir
+    NGRAMME_MAX = 3
+    NB_TITRES_MIN = 2
+
+    # Une apparition dans un titre compte comme POIDS_TITRE occurrences dans les contenus
+    POIDS_TITRE = 10
+
+    def __init__(self, suggestions, taille_top=None):
+        """
+        Initialise un trie de complétion : chaque préfixe de chaque suggestion est un noeud qui conserve
+        directement ses TAILLE_TOP meilleures suggestions. Une complétion n'est donc qu'une lecture
+        de dictionnaire, quelle que soit la taille du vocabulaire.
+
+        :param suggestions: Itérable de tuples (texte, score, document_frequency).
+        :param taille_top: Nombre de suggestions conservées par préfixe (par défaut : TAILLE_TOP).
+        """
+        self.taille_top = taille_top or self.TAILLE_TOP
+
+        # Les suggestions sont insérées de la meilleure à la moins bonne : un noeud plein est définitif
+        noeuds = {}
+        for texte, score, _ in sorted(suggestions, key=lambda s: (-s[1], -s[2], s[0])):
+            for fin in range(1, len(texte) + 1):
+                noeud = noeuds.setdefault(texte[:fin], [])
+                if len(noeud) < self.taille_top:
+                    noeud.append((texte, score))
+        # préfixe -> tuple de (texte, score), par score décroissant
+        self.noeuds = {prefixe: tuple(noeud) for prefixe, noeud in noeuds.items()}
+
+    @classmethod
+    def depuis_index(cls, termes, occurrences, df, titres, analyseur, taille_top=None):
+        """
+        Construit le trie à partir du vocabulaire et des titres :
+        - chaque terme présent dans les contenus, classé par occurrences puis par nombre de documents ;
+        - les n-grammes (2 à NGRAMME_MAX mots, stop words exclus) présents dans au moins NB_TITRES_MIN titres,
+          classés par nombre de titres x POIDS_TITRE.
+
+        :param termes: Termes du vocabulaire (liste indexée par identifiant).
+        :param occurrences: Occurrences totales de chaque terme (np.ndarray).
+        :param df: Nombre de documents contenant chaque terme (np.ndarray).
+        :param titres: Titres des documents actifs (itérable de str).
+        :param analyseur: Analyzer des documents.
+        :param taille_top: Nombre de suggestions conservées par préfixe.
+        :return: CompletionTrie
+        """
+        suggestions = [(termes[i], int(occurrences[i]), int(df[i]))
+                       for i in occurrences.nonzero()[0].tolist()]
+
+        # Un n-gramme n'est compté qu'une fois par titre
+        ngrammes = Counter()
+        for titre in titres:
+            mots = analyseur.tokens(titre if isinstance(titre, str) else "")
+            ngrammes.update({" ".join(mots[i:i + n]) for n in range(2, cls.NGRAMME_MAX + 1)
+                             for i in range(len(mots) - n + 1)})
+        suggestions += [(ngramme, nb * cls.POIDS_TITRE, nb) for ngramme, nb in ngrammes.items()
+                        if nb >= cls.NB_TITRES_MIN]
+        return cls(suggestions, taille_top)
+
+    def completer(self, prefixe, n=None):
+        """
+        Retourne les meilleures suggestions qui commencent par un préfixe normalisé.
+
+        :param prefixe: Préfixe (str), mots séparés par une espace.
+        :param n: Nombre maximal de suggestions (au plus taille_top).
+        :return: Liste de tuples (suggestion, score) par score décroissant.
+        """
+        return list(self.noeuds.get(prefixe, ())[:n or self.taille_top])
+
+    def __len__(self):
+        return len(self.noeuds)
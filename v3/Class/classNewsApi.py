@@ -1,37 +1,112 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date, datetime, timedelta
+
 import requests
+
+from Class.http_session import creer_session, delai_retry_after
+
+
+def date_windows(debut, fin, jours=1):
+    """
+    Découpe une période en fenêtres consécutives, pour dépasser la limite de résultats par requête.
+
+    :param debut: Date de début (date, datetime ou chaîne 'YYYY-MM-DD').
+    :param fin: Date de fin incluse (date, datetime ou chaîne 'YYYY-MM-DD').
+    :param jours: Durée de chaque fenêtre, en jours.
+    :return: Liste de tuples (début, fin) de dates.
+    """
+    debut, fin = _en_date(debut), _en_date(fin)
+    fenetres = []
+    while debut <= fin:
+        fin_fenetre = min(debut + timedelta(days=jours - 1), fin)
+        fenetres.append((debut, fin_fenetre))
+        debut = fin_fenetre + timedelta(days=1)
+    return fenetres
+
+
+def _en_date(valeur):
+    if isinstance(valeur, datetime):
+        return valeur.date()
+    if isinstance(valeur, date):
+        return valeur
+    return datetime.strptime(valeur, "%Y-%m-%d").date()
+
+
 class NewsAPIClient:
-    def __init__(self, api_key, base_url='https://newsapi.org/v2/everything', language='fr'):
+    def __init__(self, api_key, base_url='https://newsapi.org/v2/everything', language='fr',
+                 session=None, requetes_par_seconde=5.0, nb_essais=3):
         """
         Initialise le client NewsAPI.
-        
+
         :param api_key: La clé API de NewsAPI.
         :param base_url: URL de base de l'API (par défaut : 'https://newsapi.org/v2/everything').
         :param language: Langue des articles (par défaut : 'fr' pour le français).
+        :param session: Session HTTP réutilisée pour toutes les requêtes (par défaut : nouvelle session).
+        :param requetes_par_seconde: Débit maximal de requêtes vers l'API, tous threads confondus.
+        :param nb_essais: Nombre maximal de tentatives par requête (erreurs réseau, 429, 5xx).
         """
         self.api_key = api_key
         self.base_url = base_url
         self.language = language
-        
+        self.session = session or creer_session()
+        self.intervalle = 1.0 / requetes_par_seconde if requetes_par_seconde else 0.0
+        self.nb_essais = nb_essais
+        self._verrou = threading.Lock()
+        self._prochaine_requete = 0.0
+
         # Vérifie si la clé API est fournie
         if not self.api_key:
             raise ValueError("La clé API NewsAPI n'est pas fournie.")
 
+    def _attendre_creneau(self):
+        # Limitation de débit : chaque requête réserve le prochain créneau libre
+        with self._verrou:
+            maintenant = time.monotonic()
+            creneau = max(maintenant, self._prochaine_requete)
+            self._prochaine_requete = creneau + self.intervalle
+        if creneau > maintenant:
+            time.sleep(creneau - maintenant)
+
+    def _requete(self, params):
+        """
+        Envoie une requête à l'API en respectant la limite de débit.
+        Les erreurs réseau et les réponses 429/5xx sont retentées (délai Retry-After si fourni).
+
+        :param params: Paramètres de la requête (sans la clé API).
+        :return: requests.Response (dernière réponse obtenue).
+        """
+        params = dict(params, apiKey=self.api_key, language=self.language)
+        for essai in range(self.nb_essais):
+            self._attendre_creneau()
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=(5, 30))
+                if response.status_code != 429 and response.status_code < 500 or essai == self.nb_essais - 1:
+                    return response
+                attente = delai_retry_after(response.headers.get("Retry-After"), 2 ** essai)
+            except (requests.ConnectionError, requests.Timeout):
+                if essai == self.nb_essais - 1:
+                    raise
+                attente = 2 ** essai
+            time.sleep(attente)
+
     def search_news(self, theme, page_size):
         """
         Recherche des articles sur un thème spécifique.
-        
+
         :param theme: Le thème ou mot-clé pour la recherche.
         :param page_size: Nombre d'articles par page
         :return: Json Liste d'articles.
         """
         params = {
-            'q': theme,               
-            'pageSize': page_size,  
-            'apiKey': self.api_key,  
-            'language': self.language
+            'q': theme,
+            'pageSize': page_size,
         }
 
-        response = requests.get(self.base_url, params=params)
+        response = self._requete(params)
 
         # Vérification de la réponse de l'API
         if response.status_code == 200:
@@ -40,3 +115,69 @@ class NewsAPIClient:
         else:
             print("Erreur:", response.status_code, response.text)
             return None
+
+    def _page(self, theme, fenetre, page, page_size):
+        """
+        Récupère une page de résultats.
+
+        :return: Tuple (articles, nombre total de résultats) ; ([], 0) en cas d'erreur.
+        """
+        params = {'q': theme, 'pageSize': page_size, 'page': page, 'sortBy': 'publishedAt'}
+        if fenetre is not None:
+            params['from'], params['to'] = (_en_date(d).isoformat() for d in fenetre)
+        try:
+            response = self._requete(params)
+        except requests.RequestException as e:
+            print("Erreur:", theme, fenetre, page, e)
+            return [], 0
+        if response.status_code != 200:
+            # 426 : limite de pagination du forfait atteinte, les pages suivantes sont inaccessibles
+            if response.status_code != 426:
+                print("Erreur:", response.status_code, response.text)
+            return [], 0
+        donnees = response.json()
+        return donnees.get('articles', []), donnees.get('totalResults', 0)
+
+    def harvest(self, themes, fenetres=None, page_size=100, max_pages=None, max_workers=4):
+        """
+        Récupère tous les articles de plusieurs thèmes et fenêtres de dates.
+        La première page de chaque couple (thème, fenêtre) donne le nombre total de résultats ;
+        les pages suivantes sont alors demandées en parallèle. Les articles sont produits au fil
+        de l'arrivée des pages, sans doublon d'URL. Le nombre de pages en attente de lecture est
+        borné : si le consommateur est lent, les téléchargements ralentissent.
+
+        :param themes: Thème ou liste de thèmes.
+        :param fenetres: Liste de tuples (début, fin) de dates (voir date_windows), None pour toute la période.
+        :param page_size: Nombre d'articles par page (100 au maximum).
+        :param max_pages: Nombre maximal de pages par couple (thème, fenêtre).
+        :param max_workers: Nombre de requêtes simultanées.
+        :return: Générateur d'articles (dictionnaires de l'API).
+        """
+        if isinstance(themes, str):
+            themes = [themes]
+        requetes = deque((theme, fenetre, 1) for theme in themes for fenetre in (fenetres or [None]))
+        urls_vues = set()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executeur:
+            en_cours = {}
+            while requetes or en_cours:
+                while requetes and len(en_cours) < 2 * max_workers:
+                    theme, fenetre, page = requetes.popleft()
+                    future = executeur.submit(self._page, theme, fenetre, page, page_size)
+                    en_cours[future] = (theme, fenetre, page)
+
+                termines, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                for future in termines:
+                    theme, fenetre, page = en_cours.pop(future)
+                    articles, total = future.result()
+                    if page == 1:
+                        nb_pages = math.ceil(total / page_size)
+                        if max_pages is not None:
+                            nb_pages = min(nb_pages, max_pages)
+                        requetes.extend((theme, fenetre, p) for p in range(2, nb_pages + 1))
+                    for article in articles:
+                        url = article.get('url')
+                        if url and url in urls_vues:
+                            continue
+                        urls_vues.add(url)
+                        yield article
@@ -0,0 +1,232 @@
+import json
+import mmap
+import os
+from datetime import date, datetime
+
+import numpy as np
+
+from Class.Document import Document
+
+# Champs texte des documents, stockés en colonnes (une liste par champ)
+CHAMPS_TEXTE = ["titre", "description", "url", "urlImage", "contenu"]
+
+# Les dates de publication sont stockées en nombre de jours depuis cette date
+EPOQUE = date(1970, 1, 1).toordinal()
+
+
+def en_jours(valeur):
+    """
+    Convertit une date en nombre de jours depuis le 1er janvier 1970.
+
+    :param valeur: date, datetime ou chaîne 'YYYY-MM-DD'.
+    :return: int
+    """
+    if isinstance(valeur, str):
+        valeur = datetime.strptime(valeur, "%Y-%m-%d")
+    if isinstance(valeur, datetime):
+        valeur = valeur.date()
+    return valeur.toordinal() - EPOQUE
+
+
+class _Dictionnaire:
+    """Codage par dictionnaire d'une colonne de valeurs répétées (sources, auteurs) : valeur <-> identifiant."""
+
+    def __init__(self, valeurs=()):
+        self.valeurs = list(valeurs)
+        self.ids = {valeur: i for i, valeur in enumerate(self.valeurs)}
+
+    def coder(self, valeur):
+        identifiant = self.ids.get(valeur)
+        if identifiant is None:
+            identifiant = self.ids[valeur] = len(self.valeurs)
+            self.valeurs.append(valeur)
+        return identifiant
+
+    def table(self, valeurs):
+        """Retourne la table booléenne (indexée par identifiant) des valeurs demandées."""
+        table = np.zeros(len(self.valeurs), dtype=bool)
+        table[[self.ids[v] for v in valeurs if v in self.ids]] = True
+        return table
+
+
+class DocumentStore:
+    def __init__(self):
+        """
+        Initialise un magasin de documents aligné sur les identifiants de l'index.
+        Les métadonnées sont rangées en colonnes alignées sur les identifiants : une liste par champ texte,
+        des tableaux NumPy pour la date (en jours), la source et l'auteur (identifiants d'un dictionnaire
+        de valeurs), qui permettent de filtrer les documents sans les parcourir ; les contenus complets des documents enregistrés restent
+        dans un fichier (corps.bin) et ne sont lus, par position, qu'à la demande.
+        Seuls les contenus des documents ajoutés depuis le dernier enregistrement sont en mémoire.
+        Le magasin se comporte comme une liste de Document (len, indexation, itération, extend).
+        """
+        self.colonnes = {champ: [] for champ in CHAMPS_TEXTE}
+        self.dates = np.zeros(0, dtype=np.int32)
+        self.source_ids = np.zeros(0, dtype=np.int32)
+        self.auteur_ids = np.zeros(0, dtype=np.int32)
+        self.sources = _Dictionnaire()
+        self.auteurs = _Dictionnaire()
+        self._documents = []  # Document de chaque identifiant, construit au premier accès
+        self._corps = []  # contenu en mémoire, ou None s'il est dans le fichier
+        self._fichier = (np.zeros(1, dtype=np.int64), b"")  # (positions des contenus, octets du fichier)
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __getitem__(self, doc_id):
+        """
+        Retourne le Document d'un identifiant (construit à partir des colonnes au premier accès).
+
+        :param doc_id: Identifiant du document (int).
+        :return: Document dont le contenu complet est lu dans le magasin.
+        """
+        doc = self._documents[doc_id]
+        if doc is None:
+            doc = Document.__new__(Document)
+            for champ in CHAMPS_TEXTE:
+                setattr(doc, champ, self.colonnes[champ][doc_id])
+            doc.source_nom = self.sources.valeurs[self.source_ids[doc_id]]
+            doc.auteur = self.auteurs.valeurs[self.auteur_ids[doc_id]]
+            doc.datePubication = date.fromordinal(EPOQUE + int(self.dates[doc_id]))
+            doc.attacher(self, doc_id)
+            self._documents[doc_id] = doc
+        return doc
+
+    def __iter__(self):
+        for doc_id in range(len(self)):
+            yield self[doc_id]
+
+    def append(self, document):
+        """Ajoute un document (voir extend)."""
+        self.extend([document])
+
+    def extend(self, documents):
+        """
+        Ajoute des documents : leurs métadonnées sont copiées dans les colonnes et leur contenu
+        complet est confié au magasin (Document.attacher).
+
+        :param documents: Itérable de Document.
+        """
+        documents = list(documents)
+        jours, source_ids, auteur_ids = [], [], []
+        for doc in documents:
+            for champ in CHAMPS_TEXTE:
+                self.colonnes[champ].append(getattr(doc, champ))
+            jours.append(en_jours(doc.datePubication))
+            source_ids.append(self.sources.coder(doc.source_nom))
+            # Auteur absent (None ou NaN venant de pandas) : une seule valeur None
+            auteur_ids.append(self.auteurs.coder(doc.auteur if isinstance(doc.auteur, str) else None))
+            self._corps.append(doc.full_content or "")
+            doc.attacher(self, len(self._documents))
+            self._documents.append(doc)
+        self.dates = np.concatenate([self.dates, np.array(jours, dtype=np.int32)])
+        self.source_ids = np.concatenate([self.source_ids, np.array(source_ids, dtype=np.int32)])
+        self.auteur_ids = np.concatenate([self.auteur_ids, np.array(auteur_ids, dtype=np.int32)])
+
+    def filtre(self, since=None, until=None, sources=None, authors=None):
+        """
+        Calcule le masque des documents qui satisfont des filtres de métadonnées,
+        par opérations vectorisées sur les colonnes (sans construire de Document).
+
+        :param since: Date de publication minimale incluse (date, datetime ou 'YYYY-MM-DD').
+        :param until: Date de publication maximale incluse.
+        :param sources: Noms des sources acceptées.
+        :param authors: Noms des auteurs acceptés.
+        :return: Masque booléen aligné sur les identifiants, ou None sans filtre.
+        """
+        if since is None and until is None and sources is None and authors is None:
+            return None
+        masque = np.ones(len(self.dates), dtype=bool)
+        if since is not None:
+            masque &= self.dates >= en_jours(since)
+        if until is not None:
+            masque &= self.dates <= en_jours(until)
+        if sources is not None:
+            masque &= self.sources.table(sources)[self.source_ids]
+        if authors is not None:
+            masque &= self.auteurs.table(authors)[self.auteur_ids]
+        return masque
+
+    def body(self, doc_id):
+        """
+        Retourne le contenu complet d'un document.
+
+        :param doc_id: Identifiant du document (int).
+        :return: Contenu complet (str).
+        """
+        corps = self._corps[doc_id]
+        if corps is not None:
+            return corps
+        positions, octets = self._fichier
+        return octets[positions[doc_id]:positions[doc_id + 1]].decode("utf-8")
+
+    def save(self, path, supprimes=None):
+        """
+        Enregistre le magasin dans un répertoire : colonnes texte et dictionnaires des sources et auteurs
+        (documents.json), dates, sources et auteurs (dates.npy, source_ids.npy, auteur_ids.npy), contenus complets concaténés (corps.bin) et leurs positions (corps_positions.npy).
+
+        :param path: Chemin du répertoire (existant).
+        :param supprimes: Masque des documents supprimés, dont le contenu n'est pas conservé.
+        :return: Nombre de documents enregistrés.
+        """
+        nb_documents = len(self)
+        positions = np.zeros(nb_documents + 1, dtype=np.int64)
+        with open(os.path.join(path, "corps.bin"), "wb") as f:
+            for doc_id in range(nb_documents):
+                corps = b"" if supprimes is not None and supprimes[doc_id] else self.body(doc_id).encode("utf-8")
+                f.write(corps)
+                positions[doc_id + 1] = positions[doc_id] + len(corps)
+        np.save(os.path.join(path, "corps_positions.npy"), positions)
+        np.save(os.path.join(path, "dates.npy"), self.dates[:nb_documents])
+        np.save(os.path.join(path, "source_ids.npy"), self.source_ids[:nb_documents])
+        np.save(os.path.join(path, "auteur_ids.npy"), self.auteur_ids[:nb_documents])
+        metadonnees = {
+            "colonnes": {champ: valeurs[:nb_documents] for champ, valeurs in self.colonnes.items()},
+            "sources": self.sources.valeurs,
+            "auteurs": self.auteurs.valeurs,
+        }
+        with open(os.path.join(path, "documents.json"), "w", encoding="utf-8") as f:
+            json.dump(metadonnees, f, ensure_ascii=False)
+        return nb_documents
+
+    def ouvrir_corps(self, path, nb_documents, mmap_corps=True):
+        """
+        Lit désormais les contenus des nb_documents premiers documents dans le fichier d'un répertoire
+        (après save() ou au chargement) et libère leur copie en mémoire.
+
+        :param path: Chemin du répertoire.
+        :param nb_documents: Nombre de documents présents dans le fichier.
+        :param mmap_corps: Projeter le fichier en mémoire plutôt que de le lire.
+        """
+        positions = np.load(os.path.join(path, "corps_positions.npy"))
+        with open(os.path.join(path, "corps.bin"), "rb") as f:
+            if mmap_corps and positions[-1] > 0:
+                octets = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                octets = f.read()
+        # Le fichier est en place avant que les contenus en mémoire ne soient oubliés
+        self._fichier = (positions, octets)
+        self._corps = [None] * nb_documents + self._corps[nb_documents:]
+
+    @classmethod
+    def load(cls, path, mmap_corps=True):
+        """
+        Charge un magasin enregistré par save() ; aucun Document ni contenu n'est lu à ce stade.
+
+        :param path: Chemin du répertoire.
+        :param mmap_corps: Projeter le fichier des contenus en mémoire plutôt que de le lire.
+        :return: Instance de DocumentStore.
+        """
+        magasin = cls()
+        with open(os.path.join(path, "documents.json"), encoding="utf-8") as f:
+            metadonnees = json.load(f)
+        magasin.colonnes = metadonnees["colonnes"]
+        magasin.sources = _Dictionnaire(metadonnees["sources"])
+        magasin.auteurs = _Dictionnaire(metadonnees["auteurs"])
+        magasin.dates = np.load(os.path.join(path, "dates.npy"))
+        magasin.source_ids = np.load(os.path.join(path, "source_ids.npy"))
+        magasin.auteur_ids = np.load(os.path.join(path, "auteur_ids.npy"))
+        nb_documents = len(magasin.dates)
+        magasin._documents = [None] * nb_documents
+        magasin.ouvrir_corps(path, nb_documents, mmap_corps)
+        return magasin
@@ -0,0 +1,127 @@
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml est optionnel
+    lxml = None
+
+# Balises dont le contenu n'est jamais du texte d'article
+BALISES_IGNOREES = frozenset(["script", "style", "noscript", "template"])
+
+# Déclaration d'encodage dans les premiers octets d'une page (<meta charset=...>)
+_MOTIF_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w-]+)""", re.IGNORECASE)
+
+
+class ParagraphParser(HTMLParser):
+    """
+    Analyseur HTML en flux (html.parser de la bibliothèque standard) qui ne conserve que le texte
+    des paragraphes <p>, sans construire d'arbre. Le contenu des balises script/style est ignoré.
+    Comme en HTML, un <p> ouvert dans un paragraphe non fermé termine le précédent.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphes = []
+        self._courant = None
+        self._ignorees = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "p":
+            self._fermer()
+            self._courant = []
+        elif tag in BALISES_IGNOREES:
+            self._ignorees += 1
+
+    def handle_endtag(self, tag):
+        if tag == "p":
+            self._fermer()
+        elif tag in BALISES_IGNOREES and self._ignorees:
+            self._ignorees -= 1
+
+    def handle_data(self, data):
+        if self._courant is not None and not self._ignorees:
+            self._courant.append(data)
+
+    def _fermer(self):
+        if self._courant is not None:
+            self.paragraphes.append("".join(self._courant))
+            self._courant = None
+
+    def close(self):
+        super().close()
+        self._fermer()
+
+
+def extraire_html_parser(html):
+    """
+    Extrait le texte des paragraphes avec l'analyseur en flux ParagraphParser.
+
+    :param html: Contenu HTML (str).
+    :return: Texte des paragraphes séparés par des espaces.
+    """
+    parser = ParagraphParser()
+    parser.feed(html)
+    parser.close()
+    return " ".join(parser.paragraphes)
+
+
+def extraire_lxml(html):
+    """
+    Extrait le texte des paragraphes avec lxml (analyseur C), après retrait des balises script/style.
+
+    :param html: Contenu HTML (str).
+    :return: Texte des paragraphes séparés par des espaces.
+    """
+    if not html.strip():
+        return ""
+    racine = lxml.html.fromstring(html)
+    etree.strip_elements(racine, *BALISES_IGNOREES, with_tail=False)
+    return " ".join(p.text_content() for p in racine.iter("p"))
+
+
+def extraire_bs4(html):
+    """
+    Extrait le texte des paragraphes avec BeautifulSoup (méthode historique, la plus lente).
+
+    :param html: Contenu HTML (str).
+    :return: Texte des paragraphes séparés par des espaces.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    paragraphs = soup.find_all('p')
+    return " ".join([p.get_text() for p in paragraphs])
+
+
+# Extracteurs disponibles par nom (lxml seulement s'il est installé)
+EXTRACTEURS = {
+    "html_parser": extraire_html_parser,
+    "bs4": extraire_bs4,
+}
+if lxml is not None:
+    EXTRACTEURS["lxml"] = extraire_lxml
+
+# Extracteur par défaut : bibliothèque standard uniquement (lxml n'est pas une dépendance du projet)
+EXTRACTEUR_PAR_DEFAUT = "html_parser"
+
+
+def decoder_html(contenu, encodage=None):
+    """
+    Décode le corps d'une réponse HTTP : encodage annoncé par l'en-tête Content-Type,
+    sinon par une balise <meta charset>, sinon UTF-8.
+    (requests suppose ISO-8859-1 quand l'en-tête ne précise rien, d'où des textes
+    du type "prÃ©sident" pour des pages en UTF-8.)
+
+    :param contenu: Corps de la réponse (bytes).
+    :param encodage: Encodage déclaré par l'en-tête Content-Type (ou None).
+    :return: Texte HTML (str).
+    """
+    if not encodage:
+        declaration = _MOTIF_CHARSET.search(contenu[:2048])
+        encodage = declaration.group(1).decode("ascii") if declaration else "utf-8"
+    try:
+        return contenu.decode(encodage, errors="replace")
+    except LookupError:
+        return contenu.decode("utf-8", errors="replace")
@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class ContentCache:
+    def __init__(self, chemin="cache_http.sqlite", ttl=24 * 3600, taille_max=200 * 1024 * 1024,
+                 conservation=30 * 24 * 3600):
+        """
+        Initialise un cache disque du contenu extrait des articles, indexé par URL.
+        Pour chaque URL, le cache conserve le texte extrait et les en-têtes de validation
+        (ETag, Last-Modified) de la réponse HTTP :
+        - une entrée plus récente que ttl est servie sans requête réseau ;
+        - une entrée plus ancienne est revalidée par une requête conditionnelle
+          (If-None-Match / If-Modified-Since) : une réponse 304 la prolonge sans téléchargement ;
+        - au-delà de taille_max octets de texte, les entrées les moins récemment lues sont supprimées (LRU) ;
+        - à l'ouverture, les entrées qui n'ont pas été revalidées depuis conservation secondes sont supprimées.
+        Le cache est partagé entre threads (une connexion SQLite protégée par un verrou).
+
+        :param chemin: Chemin du fichier SQLite.
+        :param ttl: Durée de fraîcheur d'une entrée, en secondes.
+        :param taille_max: Taille maximale du texte stocké, en octets.
+        :param conservation: Durée au-delà de laquelle une entrée non revalidée est supprimée (voir purge).
+        """
+        self.chemin = chemin
+        self.ttl = ttl
+        self.taille_max = taille_max
+        self.conservation = conservation
+        self._verrou = threading.Lock()
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        with self._connexion:
+            self._connexion.execute("PRAGMA journal_mode=WAL")
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, contenu TEXT NOT NULL,"
+                " taille INTEGER NOT NULL, date_validation REAL NOT NULL, date_acces REAL NOT NULL)")
+            self._connexion.execute("CREATE INDEX IF NOT EXISTS pages_acces ON pages (date_acces)")
+        self.purge()
+
+    def get(self, url):
+        """
+        Retourne l'entrée d'une URL et met à jour sa date d'accès.
+
+        :param url: URL de l'article.
+        :return: Dictionnaire (contenu, etag, last_modified, frais) ou None si l'URL est absente.
+        """
+        maintenant = time.time()
+        with self._verrou, self._connexion:
+            ligne = self._connexion.execute(
+                "SELECT contenu, etag, last_modified, date_validation FROM pages WHERE url = ?", (url,)).fetchone()
+            if ligne is None:
+                return None
+            self._connexion.execute("UPDATE pages SET date_acces = ? WHERE url = ?", (maintenant, url))
+        contenu, etag, last_modified, date_validation = ligne
+        return {"contenu": contenu, "etag": etag, "last_modified": last_modified,
+                "frais": maintenant - date_validation < self.ttl}
+
+    def entetes_conditionnels(self, entree):
+        """
+        Construit les en-têtes d'une requête conditionnelle à partir d'une entrée du cache.
+
+        :param entree: Dictionnaire retourné par get() (ou None).
+        :return: Dictionnaire d'en-têtes HTTP.
+        """
+        entetes = {}
+        if entree:
+            if entree["etag"]:
+                entetes["If-None-Match"] = entree["etag"]
+            if entree["last_modified"]:
+                entetes["If-Modified-Since"] = entree["last_modified"]
+        return entetes
+
+    def put(self, url, contenu, etag=None, last_modified=None):
+        """
+        Enregistre le contenu extrait d'une URL puis applique la limite de taille.
+
+        :param url: URL de l'article.
+        :param contenu: Texte extrait (str).
+        :param etag: En-tête ETag de la réponse.
+        :param last_modified: En-tête Last-Modified de la réponse.
+        """
+        maintenant = time.time()
+        with self._verrou, self._connexion:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, contenu, len(contenu.encode("utf-8")), maintenant, maintenant))
+            self._evincer()
+
+    def touch(self, url):
+        """Marque une entrée comme revalidée (réponse 304 Not Modified)."""
+        maintenant = time.time()
+        with self._verrou, self._connexion:
+            self._connexion.execute(
+                "UPDATE pages SET date_validation = ?, date_acces = ? WHERE url = ?", (maintenant, maintenant, url))
+
+    def _evincer(self):
+        # Suppression des entrées les moins récemment lues jusqu'à repasser sous la taille maximale
+        taille = self._connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM pages").fetchone()[0]
+        if taille <= self.taille_max:
+            return
+        a_supprimer = []
+        for url, taille_entree in self._connexion.execute("SELECT url, taille FROM pages ORDER BY date_acces"):
+            if taille <= self.taille_max:
+                break
+            a_supprimer.append((url,))
+            taille -= taille_entree
+        self._connexion.executemany("DELETE FROM pages WHERE url = ?", a_supprimer)
+
+    def purge(self, age_max=None):
+        """
+        Supprime les entrées qui n'ont pas été revalidées depuis plus de age_max secondes.
+        Les entrées simplement expirées (plus vieilles que ttl) restent utiles aux requêtes conditionnelles :
+        seules les entrées bien plus anciennes sont supprimées par défaut.
+
+        :param age_max: Âge maximal en secondes (par défaut : conservation).
+        :return: Nombre d'entrées supprimées (int).
+        """
+        age_max = self.conservation if age_max is None else age_max
+        with self._verrou, self._connexion:
+            return self._connexion.execute(
+                "DELETE FROM pages WHERE date_validation < ?", (time.time() - age_max,)).rowcount
+
+    def __len__(self):
+        with self._verrou:
+            return self._connexion.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        """Ferme la connexion SQLite."""
+        with self._verrou:
+            self._connexion.close()
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Nombre de connexions conservées par site
+TAILLE_POOL = 16
+
+
+def creer_session(taille_pool=TAILLE_POOL):
+    """
+    Crée une session HTTP dont les connexions sont réutilisées (keep-alive) entre les requêtes.
+
+    :param taille_pool: Nombre de connexions conservées par site.
+    :return: requests.Session
+    """
+    session = requests.Session()
+    adaptateur = HTTPAdapter(pool_connections=taille_pool, pool_maxsize=taille_pool)
+    session.mount("http://", adaptateur)
+    session.mount("https://", adaptateur)
+    return session
+
+
+def delai_retry_after(valeur, defaut):
+    """
+    Convertit l'en-tête Retry-After en délai d'attente. Il peut donner un nombre de secondes
+    ou une date HTTP (RFC 9110) ; une valeur absente ou illisible donne le délai par défaut.
+
+    :param valeur: Valeur de l'en-tête (str ou None).
+    :param defaut: Délai en secondes si l'en-tête est inutilisable.
+    :return: Délai en secondes (float, jamais négatif).
+    """
+    if not valeur:
+        return defaut
+    try:
+        return max(0.0, float(valeur))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(valeur)
+    except (TypeError, ValueError):
+        return defaut
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,409 @@
+import heapq
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from Class.positions import PositionalPostings
+
+# Nombre d'identifiants de documents par bloc pour l'élagage de top_k_wand
+TAILLE_BLOC = 128
+
+
+class InvertedIndex:
+    def __init__(self, mat_csr, mat_csc=None, offset=0, positions=None, champs=None):
+        """
+        Initialise un segment d'index inversé à partir d'une matrice Documents x Termes.
+        La liste de postings du terme t est la tranche indptr[t]:indptr[t+1] des tableaux
+        doc_ids (identifiants de documents triés) et tfs (fréquences du terme dans le document),
+        c'est-à-dire la colonne t de la matrice au format CSC.
+        Les occurrences de chaque posting sont rangées dans le même ordre : le posting j (dans l'ordre CSC)
+        a tfs[j] occurrences, tranche pos_indptr[j]:pos_indptr[j+1] des tableaux de positions.
+
+        :param mat_csr: Matrice creuse csr_matrix des documents du segment (documents en lignes).
+        :param mat_csc: La même matrice au format CSC (calculée si absente).
+        :param offset: Identifiant global du premier document du segment (int).
+        :param positions: PositionalPostings : rang de chaque occurrence dans son document
+            (voir Analyzer.positions) et emplacement dans le contenu complet, dans l'ordre des postings.
+        :param champs: Dictionnaire {nom du champ: InvertedIndex} des postings des autres champs
+            des mêmes documents (titre, description), sur le même vocabulaire.
+        """
+        self.mat_csr = mat_csr
+        self.mat_csc = mat_csc if mat_csc is not None else mat_csr.tocsc()
+        self.mat_csc.sort_indices()
+        self.offset = offset
+        self.nb_documents, self.nb_termes = self.mat_csc.shape
+        self.indptr = self.mat_csc.indptr
+        self.doc_ids = self.mat_csc.indices
+        self.tfs = self.mat_csc.data
+        self.positions = positions
+        self.champs = champs if champs is not None else {}
+        self._pos_indptr = None
+
+    @property
+    def pos_indptr(self):
+        """Début des occurrences de chaque posting (somme cumulée des tfs, calculée au premier accès)."""
+        if self._pos_indptr is None:
+            pos_indptr = np.zeros(len(self.tfs) + 1, dtype=np.int64)
+            np.cumsum(self.tfs, out=pos_indptr[1:])
+            self._pos_indptr = pos_indptr
+        return self._pos_indptr
+
+    def postings(self, term_id):
+        """
+        Retourne la liste de postings d'un terme dans le segment.
+
+        :param term_id: Identifiant du terme (int).
+        :return: Tuple (doc_ids globaux, tfs) de tableaux NumPy triés par doc_id.
+        """
+        if term_id >= self.nb_termes:
+            return np.array([], dtype=np.int64), np.array([], dtype=self.tfs.dtype)
+        debut, fin = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.doc_ids[debut:fin].astype(np.int64) + self.offset, self.tfs[debut:fin]
+
+    def occurrences(self, term_id):
+        """
+        Retourne les occurrences d'un terme dans le segment.
+        Seuls les postings et les positions du terme sont lus.
+
+        :param term_id: Identifiant du terme (int).
+        :return: Tuple (doc_ids globaux, rangs, debuts, fins) de tableaux alignés, une entrée par occurrence,
+            triés par document puis par rang.
+        """
+        if term_id >= self.nb_termes or self.positions is None:
+            vide = np.array([], dtype=np.int64)
+            return vide, vide, vide, vide
+        debut, fin = self.indptr[term_id], self.indptr[term_id + 1]
+        doc_ids = np.repeat(self.doc_ids[debut:fin].astype(np.int64) + self.offset, self.tfs[debut:fin].astype(np.int64))
+        return (doc_ids,) + self.positions.lire(self.pos_indptr[debut:fin + 1])
+
+    def occurrences_expression(self, term_ids):
+        """
+        Retrouve les occurrences consécutives d'une suite de termes (expression entre guillemets).
+
+        :param term_ids: Identifiants des termes, dans l'ordre de l'expression.
+        :return: Tuple (doc_ids, debuts, fins) : document et emplacement de chaque occurrence de l'expression.
+        """
+        doc_ids, rangs, debuts, fins = self.occurrences(term_ids[0])
+        # Clé (document, rang) triée : le terme suivant doit se trouver au rang suivant du même document
+        cles = (doc_ids << 32) + rangs
+        for decalage, term_id in enumerate(term_ids[1:], start=1):
+            if len(cles) == 0:
+                break
+            docs_suivant, rangs_suivant, _, fins_suivant = self.occurrences(term_id)
+            cles_suivant = (docs_suivant << 32) + (rangs_suivant - decalage)
+            _, retenus, trouves = np.intersect1d(cles, cles_suivant, assume_unique=True, return_indices=True)
+            cles, debuts, fins = cles[retenus], debuts[retenus], fins_suivant[trouves]
+        return cles >> 32, debuts, fins
+
+    def documents_proches(self, term_id_a, term_id_b, distance):
+        """
+        Retrouve les documents où deux termes apparaissent à au plus distance mots l'un de l'autre,
+        dans un ordre quelconque (opérateur NEAR/k).
+
+        :param term_id_a: Identifiant du premier terme.
+        :param term_id_b: Identifiant du second terme.
+        :param distance: Écart maximal entre les rangs des deux termes (int).
+        :return: Identifiants globaux triés des documents (np.ndarray).
+        """
+        docs_a, rangs_a, _, _ = self.occurrences(term_id_a)
+        docs_b, rangs_b, _, _ = self.occurrences(term_id_b)
+        if len(docs_a) == 0 or len(docs_b) == 0:
+            return np.array([], dtype=np.int64)
+        cles_a = (docs_a << 32) + rangs_a
+        cles_b = (docs_b << 32) + rangs_b
+        # Occurrence de b la plus proche de chaque occurrence de a, de part et d'autre ;
+        # un écart inférieur à 2**32 implique le même document
+        suivantes = np.minimum(np.searchsorted(cles_b, cles_a), len(cles_b) - 1)
+        precedentes = np.maximum(suivantes - 1, 0)
+        ecart = np.minimum(np.abs(cles_b[suivantes] - cles_a), np.abs(cles_b[precedentes] - cles_a))
+        return np.unique(docs_a[ecart <= distance])
+
+    def ligne(self, doc_id):
+        """
+        Retourne les termes d'un document du segment.
+
+        :param doc_id: Identifiant global du document (int).
+        :return: Tuple (term_ids, tfs).
+        """
+        i = doc_id - self.offset
+        debut, fin = self.mat_csr.indptr[i], self.mat_csr.indptr[i + 1]
+        return self.mat_csr.indices[debut:fin], self.mat_csr.data[debut:fin]
+
+    def triplets(self):
+        """
+        Retourne tous les postings du segment.
+
+        :return: Tuple (doc_ids globaux, term_ids, tfs) de tableaux alignés.
+        """
+        termes = np.repeat(np.arange(self.nb_termes), np.diff(self.indptr))
+        return self.doc_ids.astype(np.int64) + self.offset, termes, self.tfs
+
+    def colonnes(self, term_ids):
+        """
+        Extrait les colonnes des termes de la requête (seuls leurs postings sont copiés).
+
+        :param term_ids: Identifiants triés des termes.
+        :return: Tuple (sous-matrice CSC, positions des termes retenus dans term_ids).
+        """
+        positions = np.flatnonzero(term_ids < self.nb_termes)
+        return self.mat_csc[:, term_ids[positions]], positions
+
+    @staticmethod
+    def fusionner(segments, supprimes, nb_termes):
+        """
+        Fusionne des segments consécutifs en un seul, en retirant les postings des documents supprimés.
+        Les identifiants des documents sont conservés (les lignes supprimées restent vides).
+        Les occurrences sont réordonnées comme les postings du segment fusionné.
+
+        :param segments: Liste de InvertedIndex consécutifs.
+        :param supprimes: Masque booléen global des documents supprimés.
+        :param nb_termes: Taille du vocabulaire (int).
+        :return: Nouveau segment InvertedIndex.
+        """
+        matrices = [csr_matrix((s.mat_csr.data, s.mat_csr.indices, s.mat_csr.indptr),
+                               shape=(s.nb_documents, nb_termes)) for s in segments]
+        fusion = vstack(matrices, format="csr")
+        offset = segments[0].offset
+        masque = supprimes[offset:offset + fusion.shape[0]]
+        if masque.any():
+            lignes = np.repeat(np.arange(fusion.shape[0]), np.diff(fusion.indptr))
+            fusion.data[masque[lignes]] = 0
+            fusion.eliminate_zeros()
+
+        segment = InvertedIndex(fusion, offset=offset)
+        for champ in segments[0].champs:
+            segment.champs[champ] = InvertedIndex.fusionner([s.champs[champ] for s in segments], supprimes, nb_termes)
+        if all(s.positions is not None for s in segments):
+            rangs, debuts, fins = InvertedIndex._fusionner_positions(segments, supprimes)
+            segment.positions = PositionalPostings.encoder(rangs, debuts, fins, segment.pos_indptr)
+        return segment
+
+    @staticmethod
+    def _fusionner_positions(segments, supprimes):
+        """
+        Réordonne les occurrences de plusieurs segments dans l'ordre des postings de leur fusion
+        (terme, puis document), sans celles des documents supprimés.
+
+        :return: Tuple (rangs, debuts, fins).
+        """
+        termes, docs, tfs, debuts_blocs, occurrences = [], [], [], [], []
+        base = 0
+        for s in segments:
+            occurrences.append(s.positions.lire(s.pos_indptr))
+            termes.append(np.repeat(np.arange(s.nb_termes), np.diff(s.indptr)))
+            docs.append(s.doc_ids.astype(np.int64) + s.offset)
+            tfs.append(s.tfs.astype(np.int64))
+            debuts_blocs.append(s.pos_indptr[:-1] + base)
+            base += s.pos_indptr[-1]
+        termes, docs, tfs, debuts_blocs = (np.concatenate(t) for t in (termes, docs, tfs, debuts_blocs))
+
+        retenus = ~supprimes[docs]
+        ordre = np.lexsort((docs[retenus], termes[retenus]))
+        tfs, debuts_blocs = tfs[retenus][ordre], debuts_blocs[retenus][ordre]
+
+        # Indice de chaque occurrence dans les tableaux concaténés : début de son bloc + rang dans le bloc
+        nouveaux_debuts = np.cumsum(tfs) - tfs
+        indices = np.repeat(debuts_blocs - nouveaux_debuts, tfs) + np.arange(int(tfs.sum()))
+        return tuple(np.concatenate([valeurs[i] for valeurs in occurrences])[indices] for i in range(3))
+
+
+def _galop(tableau, valeur, debut):
+    """
+    Recherche exponentielle : plus petit indice i >= debut tel que tableau[i] >= valeur.
+    Le pas double jusqu'à dépasser la valeur, puis une recherche dichotomique termine dans le dernier intervalle :
+    le coût dépend de la distance parcourue, pas de la taille du tableau.
+    """
+    n = len(tableau)
+    borne, pas = debut, 1
+    while borne < n and tableau[borne] < valeur:
+        debut = borne + 1
+        borne += pas
+        pas *= 2
+    return debut + int(np.searchsorted(tableau[debut:min(borne + 1, n)], valeur))
+
+
+def intersection_galop(docs_a, docs_b):
+    """
+    Intersection de deux listes triées de documents (sans doublon).
+    Chaque document de la liste la plus courte est cherché par galop dans la plus longue, à partir
+    de la position précédente : seule une partie de la longue liste est lue. Pour des listes de tailles
+    voisines, une fusion vectorisée est plus rapide.
+
+    :param docs_a: Identifiants triés (np.ndarray).
+    :param docs_b: Identifiants triés (np.ndarray).
+    :return: Tuple (indices dans docs_a, indices dans docs_b) des documents communs.
+    """
+    if len(docs_a) > len(docs_b):
+        indices_b, indices_a = intersection_galop(docs_b, docs_a)
+        return indices_a, indices_b
+    if len(docs_a) * 8 >= len(docs_b):
+        _, indices_a, indices_b = np.intersect1d(docs_a, docs_b, assume_unique=True, return_indices=True)
+        return indices_a, indices_b
+
+    indices_a, indices_b = [], []
+    j = 0
+    for i, doc in enumerate(docs_a.tolist()):
+        j = _galop(docs_b, doc, j)
+        if j == len(docs_b):
+            break
+        if docs_b[j] == doc:
+            indices_a.append(i)
+            indices_b.append(j)
+    return np.array(indices_a, dtype=np.int64), np.array(indices_b, dtype=np.int64)
+
+
+def union_tas(listes):
+    """
+    Union de listes triées de documents par fusion sur un tas (heapq.merge) :
+    les scores d'un document présent dans plusieurs listes sont additionnés.
+
+    :param listes: Liste de tuples (doc_ids triés, scores).
+    :return: Tuple (doc_ids triés, scores).
+    """
+    listes = [(docs, scores) for docs, scores in listes if len(docs)]
+    if len(listes) == 1:
+        return listes[0]
+    docs, scores = [], []
+    for doc, score in heapq.merge(*[zip(d.tolist(), s.tolist()) for d, s in listes]):
+        if docs and docs[-1] == doc:
+            scores[-1] += score
+        else:
+            docs.append(doc)
+            scores.append(score)
+    return np.array(docs, dtype=np.int64), np.array(scores, dtype=np.float64)
+
+
+def difference_saut(docs, docs_exclus):
+    """
+    Retire d'une liste triée les documents d'une autre liste triée (négation) : les documents exclus
+    sont sautés par galop (voir intersection_galop), sans parcourir toute la liste des exclus.
+
+    :param docs: Identifiants triés (np.ndarray).
+    :param docs_exclus: Identifiants triés des documents à retirer (np.ndarray).
+    :return: Masque booléen des documents de docs conservés.
+    """
+    conserves = np.ones(len(docs), dtype=bool)
+    if len(docs) and len(docs_exclus):
+        conserves[intersection_galop(docs, docs_exclus)[0]] = False
+    return conserves
+
+
+def selectionner_top_k(doc_ids, scores, k):
+    """
+    Sélectionne les k meilleurs documents parmi des candidats, en un seul passage :
+    les scores nuls sont écartés (ce qui donne le nombre de documents trouvés), puis
+    np.argpartition isole les k meilleurs en O(n) et seuls ces k sont triés.
+
+    :param doc_ids: Identifiants des documents candidats (np.ndarray).
+    :param scores: Scores des candidats (np.ndarray).
+    :param k: Nombre de documents à retourner (int).
+    :return: Tuple (doc_ids, scores, nb_hits) triés par score décroissant.
+    """
+    positifs = scores > 0
+    doc_ids, scores = doc_ids[positifs], scores[positifs]
+    nb_hits = len(scores)
+    k = max(0, min(k, nb_hits))
+    if k < nb_hits:
+        meilleurs = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=np.int64)
+    else:
+        meilleurs = np.arange(nb_hits)
+    ordre = meilleurs[np.argsort(-scores[meilleurs], kind="stable")]
+    return doc_ids[ordre], scores[ordre], nb_hits
+
+
+def top_k_taat(listes, k):
+    """
+    Score terme par terme (Term-At-A-Time) : les postings de chaque terme de la requête
+    sont accumulés, puis les k meilleurs documents sont retenus.
+
+    :param listes: Une entrée (doc_ids, contributions) par terme de la requête.
+    :param k: Nombre de documents à retourner (int).
+    :return: Tuple (doc_ids, scores, nb_hits) triés par score décroissant.
+    """
+    listes = [(docs, scores) for docs, scores in listes if len(docs)]
+    if not listes:
+        return np.array([], dtype=np.int64), np.array([]), 0
+
+    # Accumulation des contributions par document
+    candidats, inverse = np.unique(np.concatenate([docs for docs, _ in listes]), return_inverse=True)
+    accumulateurs = np.bincount(inverse, weights=np.concatenate([scores for _, scores in listes]))
+
+    return selectionner_top_k(candidats, accumulateurs, k)
+
+
+def nombre_documents_trouves(listes):
+    """
+    Compte les documents de score non nul d'une requête : union de toutes les listes de postings
+    (coût proportionnel à leur taille totale, comme top_k_taat).
+
+    :param listes: Une entrée (doc_ids, contributions) par terme de la requête.
+    :return: Nombre de documents (int).
+    """
+    docs = [docs[scores > 0] for docs, scores in listes if len(docs)]
+    return len(np.unique(np.concatenate(docs))) if docs else 0
+
+
+def top_k_wand(listes, k, compter=False, taille_bloc=None):
+    """
+    Top-k avec élagage par blocs (Block-Max WAND), vectorisé avec NumPy :
+    l'espace des documents est découpé en blocs de taille_bloc identifiants ; la borne supérieure d'un bloc
+    est la somme, sur les termes, de la plus forte contribution du terme dans le bloc. Les blocs sont évalués
+    par lots, de la plus forte borne à la plus faible (accumulation vectorisée des postings du lot),
+    et l'évaluation s'arrête dès que la borne du bloc suivant ne dépasse plus le score du k-ième document.
+    Une requête d'un seul terme ne peut rien élaguer : ses contributions sont directement sélectionnées.
+
+    :param listes: Une entrée (doc_ids, contributions) par terme de la requête.
+    :param k: Nombre de documents à retourner (int).
+    :param compter: Compter tous les documents trouvés (voir nombre_documents_trouves).
+    :param taille_bloc: Nombre d'identifiants de documents par bloc (par défaut : TAILLE_BLOC).
+    :return: Tuple (doc_ids, scores, nb_hits) triés par score décroissant. Sans compter, nb_hits n'est connu
+        que si aucun bloc n'a été élagué ; il vaut None sinon.
+    """
+    listes = [(docs, scores) for docs, scores in listes if len(docs)]
+    if k <= 0:
+        return np.array([], dtype=np.int64), np.array([]), nombre_documents_trouves(listes) if compter else None
+    if not listes:
+        return np.array([], dtype=np.int64), np.array([]), 0
+    if len(listes) == 1:
+        return selectionner_top_k(listes[0][0], listes[0][1], k)
+    taille_bloc = taille_bloc or TAILLE_BLOC
+
+    # Borne supérieure de chaque bloc : maxima des contributions de chaque terme par bloc, sommés sur les termes
+    blocs_termes, maxima = [], []
+    for docs, scores in listes:
+        blocs, debuts = np.unique(docs // taille_bloc, return_index=True)
+        blocs_termes.append(blocs)
+        maxima.append(np.maximum.reduceat(scores, debuts))
+    blocs, inverse = np.unique(np.concatenate(blocs_termes), return_inverse=True)
+    bornes = np.bincount(inverse, weights=np.concatenate(maxima), minlength=len(blocs))
+
+    # Postings rangés par bloc, dans l'ordre décroissant des bornes
+    ordre_blocs = np.argsort(-bornes, kind="stable")
+    rang = np.empty(len(blocs), dtype=np.int64)
+    rang[ordre_blocs] = np.arange(len(blocs))
+    docs = np.concatenate([docs for docs, _ in listes])
+    scores = np.concatenate([scores for _, scores in listes])
+    cles = rang[np.searchsorted(blocs, docs // taille_bloc)]
+    permutation = np.argsort(cles, kind="stable")
+    fins_blocs = np.searchsorted(cles[permutation], np.arange(1, len(blocs) + 1))
+    bornes = bornes[ordre_blocs]
+
+    meilleurs_docs, meilleurs_scores = np.array([], dtype=np.int64), np.array([])
+    nb_trouves, seuil, evalues, lot = 0, 0.0, 0, 1
+    while evalues < len(blocs) and bornes[evalues] > seuil:
+        # Lot de blocs dont la borne dépasse le seuil courant (taille doublée à chaque lot)
+        fin = evalues + int(np.count_nonzero(bornes[evalues:evalues + lot] > seuil))
+        debut_postings = fins_blocs[evalues - 1] if evalues else 0
+        selection = permutation[debut_postings:fins_blocs[fin - 1]]
+        candidats, inverse = np.unique(docs[selection], return_inverse=True)
+        accumules = np.bincount(inverse, weights=scores[selection], minlength=len(candidats))
+        nb_trouves += int(np.count_nonzero(accumules > 0))
+        meilleurs_docs, meilleurs_scores, _ = selectionner_top_k(
+            np.concatenate([meilleurs_docs, candidats]), np.concatenate([meilleurs_scores, accumules]), k)
+        if len(meilleurs_scores) == k:
+            seuil = meilleurs_scores[-1]
+        evalues, lot = fin, 2 * lot
+
+    if compter:
+        nb_hits = nombre_documents_trouves(listes)
+    else:
+        nb_hits = nb_trouves if evalues == len(blocs) else None
+    return meilleurs_docs, meilleurs_scores, nb_hits
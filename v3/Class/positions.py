@@ -0,0 +1,96 @@
+import numpy as np
+
+
+def encoder_deltas(valeurs, pos_indptr):
+    """
+    Code par différences des valeurs croissantes rangées par posting : la première valeur de chaque
+    posting est conservée, les suivantes sont remplacées par l'écart avec la précédente.
+    Le tableau obtenu utilise le plus petit type entier non signé suffisant.
+
+    :param valeurs: Valeurs de toutes les occurrences, croissantes dans chaque posting (np.ndarray).
+    :param pos_indptr: Début des occurrences de chaque posting (np.ndarray de taille nb_postings + 1).
+    :return: Tableau des écarts (np.ndarray).
+    """
+    valeurs = np.asarray(valeurs, dtype=np.int64)
+    deltas = np.diff(valeurs, prepend=0)
+    debuts = pos_indptr[:-1][np.diff(pos_indptr) > 0]
+    deltas[debuts] = valeurs[debuts]
+    return deltas.astype(np.min_scalar_type(int(deltas.max())) if len(deltas) else np.uint8)
+
+
+def decoder_deltas(deltas, pos_indptr):
+    """
+    Retrouve les valeurs codées par encoder_deltas() pour une suite de postings consécutifs.
+
+    :param deltas: Écarts des occurrences de ces postings.
+    :param pos_indptr: Début des occurrences de chaque posting, relatif au premier (commence à 0).
+    :return: Valeurs (np.ndarray int64).
+    """
+    cumul = np.cumsum(deltas, dtype=np.int64)
+    if len(cumul) == 0:
+        return cumul
+    # Somme cumulée remise à zéro au début de chaque posting
+    tailles = np.diff(pos_indptr)
+    avant = np.concatenate([[0], cumul])[pos_indptr[:-1]]
+    return cumul - np.repeat(avant, tailles)
+
+
+class PositionalPostings:
+    # Tableaux enregistrés sur disque (voir tableaux)
+    NOMS = ("pos_rangs", "pos_debuts", "pos_longueurs")
+
+    def __init__(self, tableaux=None, chargeur=None):
+        """
+        Initialise les positions des occurrences d'un segment, rangées dans l'ordre de ses postings :
+        rang de chaque occurrence dans le document, début dans le contenu complet (codés par différences
+        à l'intérieur de chaque posting) et longueur du mot. Les tableaux peuvent n'être lus qu'au
+        premier accès (chargeur) : une recherche sans expression ni proximité ne les lit jamais.
+
+        :param tableaux: Dictionnaire {nom: np.ndarray} des tableaux codés (voir NOMS).
+        :param chargeur: Fonction sans argument retournant ce dictionnaire, appelée au premier accès.
+        """
+        self._tableaux = tableaux
+        self._chargeur = chargeur
+
+    @classmethod
+    def encoder(cls, rangs, debuts, fins, pos_indptr):
+        """
+        Code les positions des occurrences d'un segment.
+
+        :param rangs: Rang de chaque occurrence dans son document.
+        :param debuts: Début de chaque occurrence dans le contenu complet.
+        :param fins: Fin de chaque occurrence dans le contenu complet.
+        :param pos_indptr: Début des occurrences de chaque posting (voir InvertedIndex.pos_indptr).
+        :return: PositionalPostings
+        """
+        longueurs = np.asarray(fins, dtype=np.int64) - np.asarray(debuts, dtype=np.int64)
+        return cls({
+            "pos_rangs": encoder_deltas(rangs, pos_indptr),
+            "pos_debuts": encoder_deltas(debuts, pos_indptr),
+            "pos_longueurs": longueurs.astype(np.min_scalar_type(int(longueurs.max())) if len(longueurs) else np.uint8),
+        })
+
+    def tableaux(self):
+        """Retourne les tableaux codés, lus au premier appel si nécessaire."""
+        if self._tableaux is None:
+            self._tableaux = self._chargeur()
+        return self._tableaux
+
+    @property
+    def charge(self):
+        """Indique si les tableaux ont été lus."""
+        return self._tableaux is not None
+
+    def lire(self, pos_indptr):
+        """
+        Décode les occurrences d'une suite de postings consécutifs.
+
+        :param pos_indptr: Tranche de InvertedIndex.pos_indptr couvrant ces postings (bornes incluses).
+        :return: Tuple (rangs, debuts, fins) de tableaux int64.
+        """
+        tableaux = self.tableaux()
+        debut, fin = int(pos_indptr[0]), int(pos_indptr[-1])
+        relatif = pos_indptr - debut
+        rangs = decoder_deltas(tableaux["pos_rangs"][debut:fin], relatif)
+        debuts = decoder_deltas(tableaux["pos_debuts"][debut:fin], relatif)
+        return rangs, debuts, debuts + tableaux["pos_longueurs"][debut:fin]
@@ -0,0 +1,508 @@
+import re
+
+import numpy as np
+
+from Class.inverted_index import intersection_galop, union_tas, difference_saut
+
+# Éléments d'une requête : expression entre guillemets (fermante facultative), opérateur NEAR/k, ou mot brut
+_MOTIF_ELEMENT = re.compile(r'"([^"]*)"?|\bNEAR/(\d+)\b|[^\s"]+')
+
+# Jokers d'un mot brut : * (suite de lettres), ? suivi d'une lettre (un ? final reste une ponctuation)
+_MOTIF_JOKER = re.compile(r"\*|\?(?=\w)")
+
+
+def normaliser_motif(brut, analyseur):
+    """
+    Normalise un mot brut qui contient des jokers : les morceaux entre jokers passent par l'analyseur
+    (sans filtrage des stop words), les jokers sont conservés.
+
+    :param brut: Mot brut (str), par exemple "Intellig*".
+    :param analyseur: Analyzer des documents.
+    :return: Motif normalisé (str), ou None si le mot ne contient pas de joker ou pas de lettre.
+    """
+    jokers = _MOTIF_JOKER.findall(brut)
+    if not jokers:
+        return None
+    morceaux = [analyseur.normaliser(morceau).replace(" ", "") for morceau in _MOTIF_JOKER.split(brut)]
+    if not any(morceaux):
+        return None
+    return "".join(m + j for m, j in zip(morceaux, jokers + [""]))
+
+
+class Requete:
+    def __init__(self, termes, phrases=(), proximites=(), motifs=()):
+        """
+        Requête analysée.
+
+        :param termes: Tous les mots normalisés de la requête, dans l'ordre (ils servent au calcul des scores).
+        :param phrases: Expressions entre guillemets : tuples de mots qui doivent se suivre dans le document.
+        :param proximites: Tuples (mot_a, mot_b, k) : les deux mots doivent apparaître à au plus k mots l'un de l'autre.
+        :param motifs: Motifs normalisés avec jokers (intellig*), développés en termes du vocabulaire par le moteur.
+        """
+        self.termes = tuple(termes)
+        self.phrases = tuple(phrases)
+        self.proximites = tuple(proximites)
+        self.motifs = tuple(motifs)
+
+    @property
+    def contraintes(self):
+        """Indique si la requête impose des expressions ou des proximités (qui nécessitent les positions)."""
+        return bool(self.phrases or self.proximites)
+
+    def __repr__(self):
+        return (f"Requete(termes={self.termes}, phrases={self.phrases}, proximites={self.proximites}, "
+                f"motifs={self.motifs})")
+
+
+def analyser_requete(texte, analyseur):
+    """
+    Analyse une requête :
+    - les mots libres sont des termes de la requête ;
+    - "intelligence artificielle" : les mots doivent se suivre dans le document ;
+    - robot NEAR/5 emploi : les deux mots doivent apparaître à au plus 5 mots l'un de l'autre
+      (dernier mot avant l'opérateur, premier mot après) ;
+    - intellig*, r?bot : motifs, hors expressions et proximités.
+    Chaque élément passe par l'analyseur des documents ; les stop words sont ignorés
+    (ils ne comptent pas dans les rangs des mots, voir Analyzer.positions).
+
+    :param texte: Requête brute (str).
+    :param analyseur: Analyzer des documents.
+    :return: Requete
+    """
+    elements = []  # mots de chaque élément, ou distance d'un opérateur NEAR (int)
+    phrases = []
+    motifs = []
+    for match in _MOTIF_ELEMENT.finditer(texte):
+        phrase, distance = match.group(1), match.group(2)
+        if distance is not None:
+            elements.append(int(distance))
+            continue
+        motif = normaliser_motif(match.group(), analyseur) if phrase is None else None
+        if motif is not None:
+            motifs.append(motif)
+            continue
+        mots = analyseur.tokens(match.group() if phrase is None else phrase)
+        if phrase is not None and len(mots) > 1:
+            phrases.append(tuple(mots))
+        elements.append(mots)
+
+    proximites = []
+    for i, element in enumerate(elements):
+        if not isinstance(element, int):
+            continue
+        gauche = next((e for e in reversed(elements[:i]) if not isinstance(e, int) and e), None)
+        droite = next((e for e in elements[i + 1:] if not isinstance(e, int) and e), None)
+        if gauche and droite:
+            proximites.append((gauche[-1], droite[0], element))
+
+    termes = [mot for element in elements if not isinstance(element, int) for mot in element]
+    return Requete(termes, phrases, proximites, motifs)
+
+
+#### LANGAGE BOOLÉEN ####
+# Une requête qui contient AND, OR, NOT, des parenthèses, un champ (titre:mot) ou un poids (mot^2)
+# est analysée en un plan d'exécution : un arbre de noeuds évalués sur les listes de postings.
+#
+#   requete  := ou
+#   ou       := et (["OR"] et)*          (juxtaposition = OR, comme une requête sans opérateur)
+#   et       := unaire ("AND" unaire)*
+#   unaire   := "NOT" unaire | primaire
+#   primaire := [champ:] "(" ou ")" [^poids] | [champ:] mot [^poids] | [champ:] "expression" [^poids]
+#               | primaire NEAR/k primaire
+#
+# Les termes sans champ sont cherchés dans tous les champs, avec le poids de chaque champ.
+# Un mot à jokers (intellig*) ou absent du vocabulaire est remplacé par l'union des termes
+# qu'il désigne (voir Noeud.developper).
+
+# Poids des champs (un terme trouvé dans le titre compte davantage)
+POIDS_CHAMPS = {"titre": 2.0, "description": 1.5, "full_content": 1.0}
+
+# Imbrication maximale des groupes : au-delà, les parenthèses ouvrantes sont ignorées
+PROFONDEUR_MAX = 32
+
+_MOTIF_BOOLEEN = re.compile(r'\b(?:AND|OR|NOT)\b|[()]|\b(?:titre|description|full_content):|\^\d')
+_MOTIF_JETON = re.compile(r'''
+    (?P<ouvrante>\() | (?P<fermante>\)) | (?P<near>\bNEAR/(?P<distance>\d+)\b) | \^(?P<poids_groupe>\d+(?:\.\d+)?)
+    | (?:(?P<champ>titre|description|full_content):)?
+      (?: (?P<groupe>(?=\()) | "(?P<phrase>[^"]*)"? | (?P<mot>[^\s"()^]+) )
+      (?:\^(?P<poids>\d+(?:\.\d+)?))?
+''', re.VERBOSE)
+
+
+def est_booleenne(texte):
+    """Indique si une requête utilise le langage booléen (opérateurs, parenthèses, champs ou poids)."""
+    return _MOTIF_BOOLEEN.search(texte) is not None
+
+
+class Noeud:
+    """Noeud du plan d'exécution : retourne les documents qui le satisfont, triés, avec leur score."""
+    poids = 1.0
+
+    def executer(self, contexte):
+        """
+        Évalue le noeud.
+
+        :param contexte: ContexteRequete (postings et positions de l'index).
+        :return: Tuple (doc_ids triés, scores).
+        """
+        docs, scores = self._executer(contexte)
+        return docs, scores * self.poids if self.poids != 1.0 else scores
+
+    def termes(self):
+        """Retourne les mots des termes positifs du noeud (ceux qui comptent dans le score)."""
+        return []
+
+    def developper(self, fonction):
+        """
+        Remplace les termes inconnus ou à jokers par les termes du vocabulaire qu'ils désignent.
+
+        :param fonction: Fonction mot -> liste de termes (voir TermDictionary.developper).
+        :return: Noeud développé (le noeud lui-même s'il n'y a rien à développer).
+        """
+        return self
+
+    def _suffixe(self):
+        return f"^{self.poids:g}" if self.poids != 1.0 else ""
+
+
+class Terme(Noeud):
+    def __init__(self, mot, champ=None):
+        self.mot = mot
+        self.champ = champ
+
+    def _executer(self, contexte):
+        return contexte.postings(self.mot, self.champ)
+
+    def termes(self):
+        return [self.mot]
+
+    def developper(self, fonction):
+        termes = fonction(self.mot)
+        if termes == [self.mot]:
+            return self
+        # Aucun terme : le noeud garde le mot, qui ne sélectionne aucun document
+        noeud = Ou([Terme(terme, self.champ) for terme in termes]) if termes else self
+        noeud.poids = self.poids
+        return noeud
+
+    def __repr__(self):
+        return f"{self.champ + ':' if self.champ else ''}{self.mot}{self._suffixe()}"
+
+
+class Phrase(Noeud):
+    def __init__(self, mots, champ=None):
+        self.mots = tuple(mots)
+        self.champ = champ
+
+    def _executer(self, contexte):
+        # Les positions ne sont connues que pour le contenu complet : ailleurs, tous les mots sont requis
+        champ = self.champ or "full_content"
+        docs, scores = Et([Terme(mot, champ) for mot in self.mots]).executer(contexte)
+        if champ != "full_content" or len(docs) == 0:
+            return docs, scores
+        indices, _ = intersection_galop(docs, contexte.documents_expression(self.mots))
+        return docs[indices], scores[indices]
+
+    def termes(self):
+        return list(self.mots)
+
+    def __repr__(self):
+        return f'{self.champ + ":" if self.champ else ""}"{" ".join(self.mots)}"{self._suffixe()}'
+
+
+class Proximite(Noeud):
+    def __init__(self, mot_a, mot_b, distance):
+        self.mot_a = mot_a
+        self.mot_b = mot_b
+        self.distance = distance
+
+    def _executer(self, contexte):
+        # Contrainte seule : les deux mots sont aussi des opérandes du Et qui l'entoure et portent le score
+        docs = contexte.documents_proches(self.mot_a, self.mot_b, self.distance)
+        return docs, np.zeros(len(docs))
+
+    def developper(self, fonction):
+        termes_a, termes_b = fonction(self.mot_a), fonction(self.mot_b)
+        if termes_a == [self.mot_a] and termes_b == [self.mot_b]:
+            return self
+        # Proximité de l'un des termes désignés par le premier mot avec l'un de ceux du second
+        paires = [Proximite(a, b, self.distance) for a in termes_a for b in termes_b]
+        noeud = Ou(paires) if paires else self
+        noeud.poids = self.poids
+        return noeud
+
+    def __repr__(self):
+        return f"({self.mot_a} NEAR/{self.distance} {self.mot_b}){self._suffixe()}"
+
+
+class Non(Noeud):
+    def __init__(self, enfant):
+        self.enfant = enfant
+
+    def developper(self, fonction):
+        enfant = self.enfant.developper(fonction)
+        return self if enfant is self.enfant else Non(enfant)
+
+    def _executer(self, contexte):
+        # Une négation seule ne sélectionne rien ; elle est appliquée par Et (voir Et._executer)
+        return np.array([], dtype=np.int64), np.array([])
+
+    def __repr__(self):
+        return f"NOT {self.enfant!r}"
+
+
+class Et(Noeud):
+    def __init__(self, enfants):
+        self.enfants = list(enfants)
+
+    def developper(self, fonction):
+        enfants = [enfant.developper(fonction) for enfant in self.enfants]
+        if all(e is enfant for e, enfant in zip(enfants, self.enfants)):
+            return self
+        noeud = Et(enfants)
+        noeud.poids = self.poids
+        return noeud
+
+    def _executer(self, contexte):
+        positifs = [enfant for enfant in self.enfants if not isinstance(enfant, Non)]
+        negatifs = [enfant.enfant for enfant in self.enfants if isinstance(enfant, Non)]
+        if not positifs:
+            return np.array([], dtype=np.int64), np.array([])
+
+        # Intersection en partant de la liste la plus courte : elle borne toutes les suivantes
+        resultats = sorted((enfant.executer(contexte) for enfant in positifs), key=lambda r: len(r[0]))
+        docs, scores = resultats[0]
+        for docs_enfant, scores_enfant in resultats[1:]:
+            if len(docs) == 0:
+                break
+            indices, indices_enfant = intersection_galop(docs, docs_enfant)
+            docs, scores = docs[indices], scores[indices] + scores_enfant[indices_enfant]
+
+        # Négation : les documents des termes exclus sont sautés
+        for negatif in negatifs:
+            if len(docs) == 0:
+                break
+            conserves = difference_saut(docs, negatif.executer(contexte)[0])
+            docs, scores = docs[conserves], scores[conserves]
+        return docs, scores
+
+    def termes(self):
+        return [mot for enfant in self.enfants for mot in enfant.termes()]
+
+    def __repr__(self):
+        return "(" + " AND ".join(map(repr, self.enfants)) + ")" + self._suffixe()
+
+
+class Ou(Noeud):
+    def __init__(self, enfants):
+        self.enfants = list(enfants)
+
+    def developper(self, fonction):
+        enfants = [enfant.developper(fonction) for enfant in self.enfants]
+        if all(e is enfant for e, enfant in zip(enfants, self.enfants)):
+            return self
+        noeud = Ou(enfants)
+        noeud.poids = self.poids
+        return noeud
+
+    def _executer(self, contexte):
+        return union_tas([enfant.executer(contexte) for enfant in self.enfants])
+
+    def termes(self):
+        return [mot for enfant in self.enfants for mot in enfant.termes()]
+
+    def __repr__(self):
+        return "(" + " OR ".join(map(repr, self.enfants)) + ")" + self._suffixe()
+
+
+class _Analyseur:
+    """Analyse descendante récursive d'une requête booléenne (voir la grammaire ci-dessus)."""
+
+    def __init__(self, texte, analyseur):
+        self.jetons = [m for m in _MOTIF_JETON.finditer(texte) if m.group().strip()]
+        self.i = 0
+        self.analyseur = analyseur
+        self.profondeur = 0
+
+    def _courant(self):
+        return self.jetons[self.i] if self.i < len(self.jetons) else None
+
+    def _operateur(self, nom):
+        jeton = self._courant()
+        if jeton is not None and jeton.group("mot") == nom and jeton.group("champ") is None:
+            self.i += 1
+            return True
+        return False
+
+    def ou(self, champ=None):
+        enfants = []
+        while True:
+            noeud = self.et(champ)
+            if noeud is not None:
+                enfants.append(noeud)
+            jeton = self._courant()
+            if jeton is None or jeton.group("fermante"):
+                break
+            self._operateur("OR")
+        # Une négation juxtaposée exclut des documents de l'union des autres termes
+        positifs = [e for e in enfants if not isinstance(e, Non)]
+        negatifs = [e for e in enfants if isinstance(e, Non)]
+        noeud = positifs[0] if len(positifs) == 1 else Ou(positifs) if positifs else None
+        if negatifs and noeud is not None:
+            return Et([noeud] + negatifs)
+        return noeud
+
+    def et(self, champ):
+        enfants = []
+        noeud = self.unaire(champ)
+        if noeud is not None:
+            enfants.append(noeud)
+        while self._operateur("AND"):
+            noeud = self.unaire(champ)
+            if noeud is not None:
+                enfants.append(noeud)
+        return enfants[0] if len(enfants) == 1 else Et(enfants) if enfants else None
+
+    def unaire(self, champ):
+        # Négations successives comptées sans récursion (NOT NOT ... mot) : elles s'annulent deux à deux
+        negations = 0
+        while self._operateur("NOT"):
+            negations += 1
+        noeud = self.primaire(champ)
+        # a NEAR/k b : dernier mot à gauche, premier mot à droite
+        while self._courant() is not None and self._courant().group("near"):
+            distance = int(self._courant().group("distance"))
+            self.i += 1
+            droite = self.primaire(champ)
+            mots_gauche = noeud.termes() if noeud is not None else []
+            mots_droite = droite.termes() if droite is not None else []
+            if mots_gauche and mots_droite:
+                noeud = Et([noeud, droite, Proximite(mots_gauche[-1], mots_droite[0], distance)])
+            else:
+                noeud = noeud or droite
+        if negations % 2 and noeud is not None:
+            noeud = Non(noeud)
+        return noeud
+
+    def primaire(self, champ):
+        jeton = self._courant()
+        if jeton is None or jeton.group("fermante") or jeton.group("near"):
+            return None
+        if jeton.group("poids_groupe"):
+            # Poids isolé : ignoré
+            self.i += 1
+            return None
+        self.i += 1
+        champ = jeton.group("champ") or champ
+        if jeton.group("ouvrante") or jeton.group("groupe") is not None:
+            if jeton.group("groupe") is not None:
+                self.i += 1  # parenthèse ouvrante qui suit le champ
+            if self.profondeur >= PROFONDEUR_MAX:
+                # Imbrication trop profonde : la parenthèse est ignorée, la suite est analysée au même niveau
+                return None
+            self.profondeur += 1
+            noeud = self.ou(champ)
+            self.profondeur -= 1
+            if self._courant() is not None and self._courant().group("fermante"):
+                self.i += 1
+            poids = None
+            if self._courant() is not None and self._courant().group("poids_groupe"):
+                poids = self._courant().group("poids_groupe")
+                self.i += 1
+        else:
+            texte = jeton.group("phrase") if jeton.group("phrase") is not None else jeton.group("mot")
+            motif = normaliser_motif(texte, self.analyseur) if jeton.group("phrase") is None else None
+            mots = [motif] if motif is not None else self.analyseur.tokens(texte)
+            if not mots:
+                noeud = None
+            elif len(mots) == 1:
+                noeud = Terme(mots[0], champ)
+            elif jeton.group("phrase") is not None:
+                noeud = Phrase(mots, champ)
+            else:
+                noeud = Et([Terme(mot, champ) for mot in mots])
+            poids = jeton.group("poids")
+        if noeud is not None and poids:
+            noeud.poids = float(poids)
+        return noeud
+
+
+def plan_requete(texte, analyseur):
+    """
+    Construit le plan d'exécution d'une requête booléenne.
+    Exemples : intelligence AND artificielle NOT robot ; titre:openai OR description:"modèle de langage"^2 ;
+    (apple OR google) AND titre:(intelligence artificielle).
+
+    :param texte: Requête brute (str).
+    :param analyseur: Analyzer des documents.
+    :return: Noeud racine, ou None si la requête ne contient aucun terme.
+    """
+    analyse = _Analyseur(texte, analyseur)
+    noeud = analyse.ou()
+    # Parenthèses fermantes en trop : le reste de la requête est analysé à la suite
+    while analyse._courant() is not None:
+        analyse.i += 1
+        suite = analyse.ou()
+        if suite is not None:
+            noeud = Ou([noeud, suite]) if noeud is not None else suite
+    return noeud
+
+
+class ContexteRequete:
+    def __init__(self, segments, ids, ranker, etat, poids, champs=POIDS_CHAMPS):
+        """
+        Donne au plan d'exécution accès aux postings et aux positions d'un instantané de l'index.
+
+        :param segments: Segments de l'index (InvertedIndex).
+        :param ids: Dictionnaire {mot: identifiant} du vocabulaire.
+        :param ranker: Fonction de pertinence (Ranker).
+        :param etat: État précalculé de la fonction de pertinence.
+        :param poids: Dictionnaire {term_id: poids du terme dans la requête}.
+        :param champs: Poids de chaque champ.
+        """
+        self.segments = segments
+        self.ids = ids
+        self.ranker = ranker
+        self.etat = etat
+        self.poids = poids
+        self.champs = champs
+
+    def postings(self, mot, champ=None):
+        """
+        Documents contenant un mot dans un champ (dans tous les champs si champ est None), avec leur score :
+        - contenu complet : impact de la fonction de pertinence ;
+        - titre, description : tf / (tf + 1), les champs courts n'ont pas de normalisation propre.
+        Chaque contribution est multipliée par le poids du terme dans la requête et par celui du champ.
+
+        :return: Tuple (doc_ids triés, scores).
+        """
+        term_id = self.ids.get(mot)
+        if term_id is None:
+            return np.array([], dtype=np.int64), np.array([])
+        w = self.poids.get(term_id, 1.0)
+        listes = []
+        for nom in ([champ] if champ else list(self.champs)):
+            morceaux = [(segment if nom == "full_content" else segment.champs[nom]).postings(term_id)
+                        for segment in self.segments]
+            docs = np.concatenate([d for d, _ in morceaux])
+            tfs = np.concatenate([t for _, t in morceaux]).astype(np.float64)
+            if nom == "full_content":
+                impacts = self.ranker.impacts(self.etat, term_id, docs, tfs)
+            else:
+                impacts = tfs / (tfs + 1)
+            listes.append((docs, impacts * (w * self.champs[nom])))
+        return union_tas(listes) if len(listes) > 1 else listes[0]
+
+    def documents_expression(self, mots):
+        """Documents dont le contenu complet contient les mots consécutifs (identifiants triés)."""
+        term_ids = [self.ids.get(mot) for mot in mots]
+        if None in term_ids:
+            return np.array([], dtype=np.int64)
+        return np.unique(np.concatenate([s.occurrences_expression(term_ids)[0] for s in self.segments]))
+
+    def documents_proches(self, mot_a, mot_b, distance):
+        """Documents dont le contenu complet contient les deux mots à au plus distance mots (identifiants triés)."""
+        a, b = self.ids.get(mot_a), self.ids.get(mot_b)
+        if a is None or b is None:
+            return np.array([], dtype=np.int64)
+        return np.concatenate([s.documents_proches(a, b, distance) for s in self.segments])
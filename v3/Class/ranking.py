@@ -0,0 +1,131 @@
+import numpy as np
+
+
+class Ranker:
+    """
+    Fonction de pertinence de base : cosinus sur les fréquences brutes (TF)
+    avec un vecteur de requête binaire.
+
+    Une fonction de pertinence se décompose en :
+    - un état précalculé sous forme de vecteurs NumPy (IDF par terme, normalisation par document),
+      calculé une seule fois par version de l'index ;
+    - un impact par posting (contribution d'un terme à un document pour un poids de requête de 1),
+      calculé de façon vectorisée sur les seuls postings des termes de la requête ;
+    - un poids par terme de la requête, tiré du vecteur IDF.
+    Le score d'un document est la somme des impacts de ses postings pondérés par la requête.
+    """
+    nom = "cosine"
+
+    def parametres(self):
+        """Retourne les paramètres de la fonction (tuple), utilisés pour la mise en cache."""
+        return ()
+
+    def cle(self):
+        """Retourne une clé identifiant la fonction et ses paramètres."""
+        return (self.nom,) + self.parametres()
+
+    def preparer(self, moteur):
+        """
+        Précalcule les vecteurs utilisés par la fonction.
+
+        :param moteur: SearchEngine (df, normes et longueurs des documents, segments...).
+        :return: Dictionnaire d'état, contenant au moins "idf" (un poids par terme du vocabulaire).
+        """
+        return {"idf": np.ones(len(moteur.df)), "normes": moteur.doc_norms}
+
+    def impacts(self, etat, term_ids, doc_ids, tfs):
+        """
+        Calcule l'impact de postings.
+
+        :param etat: Dictionnaire retourné par preparer().
+        :param term_ids: Terme de chaque posting (int ou tableau aligné sur doc_ids).
+        :param doc_ids: Identifiants des documents (np.ndarray).
+        :param tfs: Fréquences du terme dans chaque document (np.ndarray).
+        :return: Tableau NumPy aligné sur doc_ids.
+        """
+        return tfs / (etat["normes"][doc_ids] + 1e-10)
+
+    def query_weights(self, idf_requete):
+        """
+        Calcule les poids des termes de la requête.
+
+        :param idf_requete: Valeurs IDF des termes de la requête (np.ndarray).
+        :return: Poids des termes (np.ndarray).
+        """
+        norme = np.linalg.norm(idf_requete)
+        return idf_requete / norme if norme > 0 else idf_requete
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}{self.parametres()}"
+
+
+class TfIdfRanker(Ranker):
+    """Cosinus entre vecteurs TF-IDF (idf = log(N / df))."""
+    nom = "tfidf"
+
+    def preparer(self, moteur):
+        idf = np.log(max(moteur.nb_documents_actifs(), 1) / np.maximum(moteur.df, 1))
+        # Normes des vecteurs TF-IDF : dépendent de l'IDF, donc de tout le corpus
+        carres = np.zeros(len(moteur.documents))
+        for segment in moteur.segments:
+            doc_ids, termes, tfs = segment.triplets()
+            carres += np.bincount(doc_ids, weights=(tfs * idf[termes]) ** 2, minlength=len(carres))
+        return {"idf": idf, "normes": np.sqrt(carres)}
+
+    def impacts(self, etat, term_ids, doc_ids, tfs):
+        return tfs * etat["idf"][term_ids] / (etat["normes"][doc_ids] + 1e-10)
+
+
+class BM25Ranker(Ranker):
+    """Okapi BM25 avec les paramètres k1 (saturation de tf) et b (normalisation par la longueur)."""
+    nom = "bm25"
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+
+    def parametres(self):
+        return (self.k1, self.b)
+
+    def idf(self, moteur):
+        nb_documents = moteur.nb_documents_actifs()
+        return np.log(1 + (nb_documents - moteur.df + 0.5) / (moteur.df + 0.5))
+
+    def preparer(self, moteur):
+        nb_documents = moteur.nb_documents_actifs()
+        longueur_moyenne = moteur.doc_lengths.sum() / nb_documents if nb_documents else 0.0
+        normalisation = self.k1 * (1 - self.b + self.b * moteur.doc_lengths / (longueur_moyenne + 1e-10))
+        return {"idf": self.idf(moteur), "normalisation": normalisation}
+
+    def impacts(self, etat, term_ids, doc_ids, tfs):
+        return tfs * (self.k1 + 1) / (tfs + etat["normalisation"][doc_ids])
+
+    def query_weights(self, idf_requete):
+        return idf_requete
+
+
+class BM25PlusRanker(BM25Ranker):
+    """BM25+ : BM25 avec une borne inférieure delta pour les documents longs."""
+    nom = "bm25+"
+
+    def __init__(self, k1=1.2, b=0.75, delta=1.0):
+        super().__init__(k1, b)
+        self.delta = delta
+
+    def parametres(self):
+        return (self.k1, self.b, self.delta)
+
+    def idf(self, moteur):
+        return np.log((moteur.nb_documents_actifs() + 1) / np.maximum(moteur.df, 1))
+
+    def impacts(self, etat, term_ids, doc_ids, tfs):
+        return super().impacts(etat, term_ids, doc_ids, tfs) + self.delta
+
+
+# Fonctions de pertinence disponibles par nom
+RANKERS = {
+    "cosine": Ranker(),
+    "tfidf": TfIdfRanker(),
+    "bm25": BM25Ranker(),
+    "bm25+": BM25PlusRanker(),
+}
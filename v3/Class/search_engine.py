@@ -1,75 +1,550 @@
+import json
+import os
+import shutil
+import threading
 import numpy as np
-from collections import defaultdict
-from scipy.sparse import csr_matrix
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from scipy.sparse import csr_matrix, csc_matrix, vstack
+from Class.document_store import DocumentStore, en_jours
+from Class.vocabulary import Vocabulary
+from Class.Source import Source
+from Class.inverted_index import InvertedIndex, selectionner_top_k, top_k_taat, top_k_wand
+from Class.positions import PositionalPostings
+from Class.term_dictionary import TermDictionary
+from Class.autocomplete import CompletionTrie
+from Class.ranking import Ranker, RANKERS
+from Class.analyzer import ANALYSEUR_FR
+from Class.query_parser import analyser_requete, est_booleenne, plan_requete, ContexteRequete
 
 class SearchEngine:
-    def __init__(self, source):
+    # Nombre de requêtes dont l'analyse est conservée en cache
+    TAILLE_CACHE_REQUETES = 1024
+
+    # Nombre de classements complets conservés en cache (voir search)
+    TAILLE_CACHE_RESULTATS = 256
+
+    # Profondeur minimale du classement calculé par le backend "daat" (seuls les premiers documents sont classés)
+    PROFONDEUR_DAAT = 10
+
+    # Politique de fusion par niveaux (voir _choisir_fusion) : le niveau d'un segment est le logarithme
+    # en base FACTEUR_NIVEAU de son nombre de postings ; SEGMENTS_PAR_NIVEAU segments voisins d'un même
+    # niveau (à ECART_NIVEAU près) sont fusionnés en arrière-plan
+    SEGMENTS_PAR_NIVEAU = 8
+    FACTEUR_NIVEAU = 8
+    ECART_NIVEAU = 0.75
+
+    # Version du format de l'index sur disque (voir save / load)
+    FORMAT_INDEX = 8
+
+    # Champs courts indexés séparément du contenu complet (requêtes booléennes, voir Class.query_parser)
+    CHAMPS = ("titre", "description")
+
+    def __init__(self, source, analyseur=None):
         """
         Initialise le moteur de recherche avec un objet de type Source.
         La matrice Documents x Termes est construite automatiquement.
 
         :param source: Objet contenant les sources et les documents (type source).
+        :param analyseur: Analyzer appliqué aux documents comme aux requêtes (par défaut : ANALYSEUR_FR).
         """
-        self.source = source
-        self.vocab = {}
-        self.mat_TF = None
-        self.documents = []  
+        self._initialiser(source, analyseur)
 
         # Construire la matrice Documents x Termes
         self._build_vocab_and_matrix()
 
+    def _initialiser(self, source, analyseur):
+        """
+        Initialise les attributs du moteur (commun à la construction et au chargement depuis le disque).
+
+        :param source: Dictionnaire des sources.
+        :param analyseur: Analyzer ou None.
+        """
+        self.source = source
+        self.analyseur = analyseur or ANALYSEUR_FR
+        # Vocabulaire : identifiant de chaque terme et statistiques dans des tableaux NumPy (voir Vocabulary)
+        self.vocab = Vocabulary()
+        # Documents alignés sur les lignes de la matrice : métadonnées en colonnes, contenus lus à la demande
+        self.documents = DocumentStore()
+
+        # L'index est une suite de segments (InvertedIndex) couvrant des plages consécutives de documents
+        self.segments = []
+
+        # Vecteurs globaux alignés sur les identifiants des documents et des termes
+        self.doc_norms = np.zeros(0)
+        self.doc_lengths = np.zeros(0)
+        self.supprimes = np.zeros(0, dtype=bool)
+
+        # Compteur incrémenté à chaque modification du corpus
+        self.generation = 0
+
+        self._cles_sources = []  # (nom de la source, identifiant dans Source.production) de chaque document
+        self._nb_supprimes = 0
+        self._rankers = {}
+        self._verrou = threading.RLock()
+        self._verrou_fusion = threading.Lock()
+        self._fusion = None
+
+        # Dictionnaire des termes (préfixes, jokers, fautes de frappe), construit à la première requête qui en a besoin
+        self._dictionnaire = None
+
+        # Trie de complétion (voir autocomplete), reconstruit à la première suggestion de chaque génération
+        self._completion = None
+        self._generation_completion = None
+
+        # Analyse des requêtes mémorisée (LRU) par chaîne brute
+        self._analyser_requete = lru_cache(maxsize=self.TAILLE_CACHE_REQUETES)(self._termes_requete)
+
+        # Classements complets mémorisés (LRU), valables pour une seule génération de l'index
+        self._resultats = OrderedDict()
+        self._generation_resultats = 0
+
     # Utilisation de Chat GPT afin de comprendre comment contruire la matrice Documents x Termes
     def _build_vocab_and_matrix(self):
         """
         Construit le vocabulaire et la matrice Documents x Termes (TF).
         """
-        rows, cols, data = [], [], []
-        vocab_index = {} 
-        current_doc_id = 0
-        
-        # Parcourir les sources pour construire le vocabulaire et la matrice
-        for _, source_obj in self.source.items():
-            # Appel à stats pour récupérer le vocabulaire et les fréquences
-            stats_result = source_obj.stats()
-            vocab_source = stats_result["vocabulaire"]
-
-            # Mettre à jour le vocabulaire global avec les mots de la source
-            for mot, infos in vocab_source.items():
-                if mot not in self.vocab:
-                    self.vocab[mot] = {
-                        "id": len(self.vocab), 
-                        "occurrences": infos["occurrences"],
-                        "document_frequency": infos["document_frequency"],
-                    }
-                    vocab_index[mot] = self.vocab[mot]["id"]
-                else:
-                    # Mettre à jour les fréquences globales
-                    self.vocab[mot]["occurrences"] += infos["occurrences"]
-                    self.vocab[mot]["document_frequency"] += infos["document_frequency"]
-
-            # Construire la matrice TF pour les documents de la source
-            for _, doc in source_obj.production.items():
-                texte_nettoye = source_obj.nettoyer_texte(doc.full_content)
-                mots = texte_nettoye.split()
-                freq_doc = defaultdict(int)
-
-                # Compter les occurrences dans le document
-                for mot in mots:
-                    if mot in vocab_index:
-                        freq_doc[mot] += 1
-
-                # Ajouter les données à la matrice TF
-                for mot, count in freq_doc.items():
-                    rows.append(current_doc_id)
-                    cols.append(vocab_index[mot])
-                    data.append(count)
-
-                # Stocker le document dans la liste globale
-                self.documents.append(doc)
-                current_doc_id += 1
-
-        # Construire la matrice sparse
-        self.mat_TF = csr_matrix((data, (rows, cols)), shape=(len(self.documents), len(self.vocab)))
+        documents, analyses, cles = [], [], []
+
+        # Parcourir les sources : chaque document n'est tokenisé qu'une seule fois,
+        # ses mots et leurs positions alimentent à la fois le vocabulaire, la matrice et les positions
+        for nom, source_obj in self.source.items():
+            source_obj.moteur = self
+            for doc_id, doc in source_obj.production.items():
+                documents.append(doc)
+                analyses.append(self.analyseur.positions(doc.full_content or ""))
+                cles.append((nom, doc_id))
+
+        self._ajouter_segment(documents, analyses, cles)
+
+    def _ajouter_segment(self, documents, analyses, cles):
+        """
+        Indexe des documents dans un nouveau segment et met à jour le vocabulaire et les vecteurs globaux.
+        Le coût est proportionnel aux documents ajoutés (hors extension des vecteurs globaux).
+
+        :param documents: Liste de Document.
+        :param analyses: Mots de chaque document avec leur emplacement (voir Analyzer.positions).
+        :param cles: (nom de la source, identifiant dans la source) de chaque document.
+        """
+        rows, cols, rangs, debuts, fins = [], [], [], [], []
+        identifiant = self.vocab.identifiant
+        for current_doc_id, analyse in enumerate(analyses):
+            rows.extend([current_doc_id] * len(analyse))
+            rangs.extend(range(len(analyse)))
+            for mot, debut, fin in analyse:
+                cols.append(identifiant(mot))
+                debuts.append(debut)
+                fins.append(fin)
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+
+        # Termes des champs courts, sur le même vocabulaire (sans positions)
+        termes_champs = {}
+        for champ in self.CHAMPS:
+            lignes, colonnes = [], []
+            for current_doc_id, doc in enumerate(documents):
+                texte = getattr(doc, champ)
+                for mot in self.analyseur.tokens(texte if isinstance(texte, str) else ""):
+                    lignes.append(current_doc_id)
+                    colonnes.append(identifiant(mot))
+            termes_champs[champ] = (lignes, colonnes)
+        forme = (len(documents), len(self.vocab))
+
+        # Construire la matrice sparse du segment : les occurrences d'un même terme dans un document sont sommées
+        mat = csr_matrix((np.ones(len(cols), dtype=np.int64), (rows, cols)), shape=forme)
+        champs = {
+            champ: InvertedIndex(csr_matrix((np.ones(len(colonnes), dtype=np.int64), (lignes, colonnes)), shape=forme),
+                                 offset=len(self.documents))
+            for champ, (lignes, colonnes) in termes_champs.items()
+        }
+
+        # Occurrences rangées dans l'ordre des postings : terme, document, puis rang dans le document
+        ordre = np.lexsort((rows, cols))
+        segment = InvertedIndex(mat, offset=len(self.documents), champs=champs)
+        rangs, debuts, fins = (np.array(valeurs, dtype=np.int64)[ordre] for valeurs in (rangs, debuts, fins))
+        segment.positions = PositionalPostings.encoder(rangs, debuts, fins, segment.pos_indptr)
+
+        # Normes et longueurs des documents calculées une seule fois, sans densifier la matrice ;
+        # réutilisées par toutes les fonctions de pertinence
+        self.doc_norms = np.concatenate([self.doc_norms, np.sqrt(np.asarray(mat.multiply(mat).sum(axis=1)).ravel())])
+        self.doc_lengths = np.concatenate([self.doc_lengths, np.asarray(mat.sum(axis=1)).ravel().astype(np.float64)])
+        self.supprimes = np.concatenate([self.supprimes, np.zeros(len(documents), dtype=bool)])
+
+        # Statistiques des termes (occurrences, fréquences documentaires, termes les plus fréquents)
+        self.vocab.ajouter_comptes(mat)
+
+        self.documents.extend(documents)
+        self._cles_sources.extend(cles)
+        self.segments = self.segments + [segment]
+        self.generation += 1
+
+    def add_documents(self, docs):
+        """
+        Ajoute des documents à l'index sans le reconstruire : ils sont tokenisés, rangés dans
+        leur source et indexés dans un nouveau segment. Si la politique de fusion le demande
+        (voir _choisir_fusion), une fusion est lancée en arrière-plan.
+
+        :param docs: Itérable de Document.
+        :return: Liste des identifiants attribués aux documents.
+        """
+        docs = list(docs)
+        analyses = [self.analyseur.positions(doc.full_content or "") for doc in docs]
+
+        with self._verrou:
+            offset = len(self.documents)
+            cles = []
+            for doc_id, doc in enumerate(docs, start=offset):
+                if doc.source_nom not in self.source:
+                    self.source[doc.source_nom] = Source(doc.source_nom)
+                    self.source[doc.source_nom].moteur = self
+                self.source[doc.source_nom]._ranger(doc, doc_id)
+                cles.append((doc.source_nom, doc_id))
+            self._indexer(docs, analyses, cles)
+
+        self._planifier_fusion()
+        return list(range(offset, offset + len(docs)))
+
+    def add_source_documents(self, nom, docs, cles):
+        """
+        Indexe des documents déjà rangés dans une source sous leurs propres identifiants
+        (voir Source.add), dans un nouveau segment.
+
+        :param nom: Nom de la source (str).
+        :param docs: Liste de Document.
+        :param cles: Identifiant de chaque document dans Source.production.
+        :return: Liste des identifiants attribués aux documents dans l'index.
+        """
+        analyses = [self.analyseur.positions(doc.full_content or "") for doc in docs]
+        with self._verrou:
+            offset = len(self.documents)
+            self._indexer(docs, analyses, [(nom, cle) for cle in cles])
+
+        self._planifier_fusion()
+        return list(range(offset, offset + len(docs)))
+
+    def _indexer(self, docs, analyses, cles):
+        """
+        Indexe dans un nouveau segment des documents tokenisés, déjà rangés dans leur source
+        (appelé sous le verrou).
+
+        :param docs: Liste de Document.
+        :param analyses: Positions des mots de chaque document (voir Analyzer.positions).
+        :param cles: (nom de la source, identifiant dans Source.production) de chaque document.
+        """
+        self._ajouter_segment(docs, analyses, cles)
+
+        # Les développements mémorisés (motifs, corrections) sont classés par occurrences, qui ont changé
+        self._analyser_requete.cache_clear()
+
+    def remove_documents(self, ids):
+        """
+        Supprime des documents de l'index : ils sont marqués comme supprimés (pierre tombale),
+        retirés de leur source et des statistiques du vocabulaire. Leurs postings sont ignorés
+        à la recherche puis effacés lors de la prochaine fusion de segments.
+
+        :param ids: Identifiants des documents à supprimer.
+        :return: Nombre de documents effectivement supprimés (int).
+        """
+        retires = 0
+        with self._verrou:
+            lignes = []
+            for doc_id in ids:
+                if doc_id < 0 or doc_id >= len(self.documents) or self.supprimes[doc_id]:
+                    continue
+
+                # Termes du document, retirés des statistiques du vocabulaire après la boucle
+                lignes.append(self._segment(doc_id).ligne(doc_id))
+
+                self.doc_lengths[doc_id] = 0
+                self.doc_norms[doc_id] = 0
+                self.supprimes[doc_id] = True
+                self._nb_supprimes += 1
+
+                nom, cle = self._cles_sources[doc_id]
+                if nom in self.source:
+                    self.source[nom].remove(cle)
+                retires += 1
+
+            if retires:
+                self.vocab.retirer_comptes(np.concatenate([term_ids for term_ids, _ in lignes]),
+                                           np.concatenate([tfs for _, tfs in lignes]))
+                self.generation += 1
+                # Les développements mémorisés (motifs, corrections) dépendent des termes encore présents
+                self._analyser_requete.cache_clear()
+        return retires
+
+    def _segment(self, doc_id):
+        """
+        Retourne le segment contenant un document.
+
+        :param doc_id: Identifiant du document (int).
+        :return: InvertedIndex.
+        """
+        segments = self.segments
+        return segments[bisect_right([s.offset for s in segments], doc_id) - 1]
+
+    def documents_source(self, nom):
+        """
+        Retourne les documents actifs d'une source.
+
+        :param nom: Nom de la source (str).
+        :return: Liste de tuples (identifiant dans l'index, identifiant dans Source.production).
+        """
+        with self._verrou:
+            cles_sources, supprimes = self._cles_sources, self.supprimes
+            return [(doc_id, cle) for doc_id, (source, cle) in enumerate(cles_sources)
+                    if source == nom and not supprimes[doc_id]]
+
+    def ligne(self, doc_id):
+        """
+        Retourne les termes d'un document, lus dans la ligne de son segment.
+
+        :param doc_id: Identifiant du document (int).
+        :return: Tuple (term_ids, tfs).
+        """
+        with self._verrou:
+            return self._segment(doc_id).ligne(doc_id)
+
+    def comptes_termes(self, doc_ids):
+        """
+        Agrège les termes d'un ensemble de documents à partir des lignes de l'index (sans retokeniser).
+
+        :param doc_ids: Identifiants des documents.
+        :return: Tuple (term_ids présents, occurrences, document_frequency) de tableaux alignés.
+        """
+        with self._verrou:
+            lignes = [self._segment(doc_id).ligne(doc_id) for doc_id in doc_ids]
+        if not lignes:
+            vide = np.array([], dtype=np.int64)
+            return vide, vide, vide
+        term_ids = np.concatenate([t for t, _ in lignes]).astype(np.int64)
+        tfs = np.concatenate([tf for _, tf in lignes]).astype(np.int64)
+        presents, inverses = np.unique(term_ids, return_inverse=True)
+        occurrences = np.bincount(inverses, weights=tfs, minlength=len(presents)).astype(np.int64)
+        document_frequency = np.bincount(inverses, minlength=len(presents))
+        return presents, occurrences, document_frequency
+
+    def _planifier_fusion(self):
+        """Lance en arrière-plan les fusions demandées par la politique de fusion, si aucune n'est en cours."""
+        if self._choisir_fusion() is not None and (self._fusion is None or not self._fusion.is_alive()):
+            self._fusion = threading.Thread(target=self._fusionner_par_niveaux, daemon=True)
+            self._fusion.start()
+
+    def _choisir_fusion(self):
+        """
+        Politique de fusion par niveaux : le coût d'indexation reste en n log n, chaque posting n'étant
+        recopié qu'une fois par niveau. Les segments sont parcourus par groupes : un groupe va du premier
+        segment restant au dernier dont le niveau est à moins de ECART_NIVEAU du plus haut niveau restant
+        (les petits segments intercalés en font partie). Les SEGMENTS_PAR_NIVEAU premiers segments
+        du premier groupe qui en compte assez sont fusionnés : seuls des segments voisins et de tailles
+        comparables sont fusionnés, leur fusion passe au niveau suivant.
+
+        :return: Tuple (debut, fin) des segments à fusionner (self.segments[debut:fin]), ou None.
+        """
+        segments = self.segments
+        tailles = np.array([max(s.mat_csr.nnz, 1) for s in segments], dtype=np.float64)
+        niveaux = np.log(tailles) / np.log(self.FACTEUR_NIVEAU)
+        debut = 0
+        while len(segments) - debut >= self.SEGMENTS_PAR_NIVEAU:
+            restants = niveaux[debut:]
+            fin = debut + int(np.flatnonzero(restants >= restants.max() - self.ECART_NIVEAU)[-1]) + 1
+            if fin - debut >= self.SEGMENTS_PAR_NIVEAU:
+                return debut, debut + self.SEGMENTS_PAR_NIVEAU
+            debut = fin
+        return None
+
+    def _fusionner_par_niveaux(self):
+        """Effectue les fusions demandées par la politique de fusion, jusqu'à ce qu'il n'y en ait plus."""
+        with self._verrou_fusion:
+            while True:
+                choix = self._choisir_fusion()
+                if choix is None:
+                    return
+                self._fusionner(*choix)
+
+    def fusionner(self):
+        """
+        Fusionne tous les segments existants en un seul et efface les postings des documents supprimés.
+        Les recherches en cours continuent sur les anciens segments ; les segments ajoutés pendant
+        la fusion sont conservés après le segment fusionné.
+
+        :return: Le segment fusionné (InvertedIndex).
+        """
+        with self._verrou_fusion:
+            return self._fusionner()
+
+    def _fusionner(self, debut=0, fin=None):
+        """
+        Fusionne les segments self.segments[debut:fin] (tous par défaut), à appeler en détenant
+        _verrou_fusion (toujours acquis avant _verrou) : les segments ne sont alors modifiés que
+        par l'ajout de nouveaux segments à la fin.
+
+        :return: Le segment fusionné (InvertedIndex).
+        """
+        # Instantané des segments et des suppressions : une suppression pendant la fusion ne doit pas
+        # retirer un document des postings sans retirer ses positions (il reste marqué dans self.supprimes)
+        with self._verrou:
+            segments = self.segments[debut:fin]
+            supprimes = self.supprimes.copy()
+            nb_termes = len(self.vocab)
+        fusion = InvertedIndex.fusionner(segments, supprimes, nb_termes)
+        with self._verrou:
+            self.segments = self.segments[:debut] + [fusion] + self.segments[debut + len(segments):]
+        return fusion
+
+    def nb_documents_actifs(self):
+        """
+        Retourne le nombre de documents indexés et non supprimés.
+
+        :return: Nombre de documents (int).
+        """
+        return len(self.documents) - self._nb_supprimes
+
+    @property
+    def mat_TF(self):
+        """
+        Matrice Term Frequency (TF) de tout le corpus, assemblée à partir des segments.
+        Les lignes des documents supprimés restent présentes jusqu'à la prochaine fusion.
+        """
+        matrices = [csr_matrix((s.mat_csr.data, s.mat_csr.indices, s.mat_csr.indptr),
+                               shape=(s.nb_documents, len(self.vocab))) for s in self.segments]
+        if len(matrices) == 1:
+            return matrices[0]
+        if not matrices:
+            return csr_matrix((0, len(self.vocab)))
+        return vstack(matrices, format="csr")
+
+    def save(self, path):
+        """
+        Enregistre l'index dans un répertoire versionné de fichiers .npy (chargeables en mémoire
+        partagée avec np.load(..., mmap_mode="r")) : vocabulaire, tableaux CSR et CSC, positions des occurrences,
+        normes et longueurs des documents, documents supprimés, ainsi que le magasin de documents
+        (métadonnées en colonnes et fichier des contenus complets). Les segments sont d'abord fusionnés en un seul.
+        Le répertoire est écrit à côté puis renommé, un index existant n'est jamais laissé à moitié écrit.
+
+        :param path: Chemin du répertoire de l'index (str).
+        """
+        temporaire = path.rstrip(os.sep) + ".tmp"
+        if os.path.exists(temporaire):
+            shutil.rmtree(temporaire)
+        os.makedirs(temporaire)
+
+        with self._verrou_fusion, self._verrou:
+            segment = self._fusionner()
+            tableaux = {
+                **self.vocab.tableaux(),
+                **self._tableaux_segment(segment),
+                **segment.positions.tableaux(),
+                "doc_norms": self.doc_norms,
+                "doc_lengths": self.doc_lengths,
+                "supprimes": self.supprimes,
+            }
+            for champ in self.CHAMPS:
+                tableaux.update(self._tableaux_segment(segment.champs[champ], champ + "_"))
+            for nom, tableau in tableaux.items():
+                np.save(os.path.join(temporaire, nom + ".npy"), np.asarray(tableau))
+
+            # Métadonnées en colonnes et contenus complets (voir DocumentStore)
+            nb_documents = self.documents.save(temporaire, self.supprimes)
+
+            meta = {
+                "version": self.FORMAT_INDEX,
+                "nb_documents": nb_documents,
+                "nb_termes": len(self.vocab),
+            }
+
+        with open(os.path.join(temporaire, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(temporaire, path)
+
+        # Les contenus enregistrés sont désormais lus dans le fichier plutôt que gardés en mémoire
+        with self._verrou:
+            self.documents.ouvrir_corps(path, nb_documents)
+
+    @staticmethod
+    def _tableaux_segment(segment, prefixe=""):
+        """Retourne les tableaux CSR et CSC d'un segment à enregistrer, nommés avec un préfixe (champ)."""
+        return {
+            prefixe + "csr_indptr": segment.mat_csr.indptr,
+            prefixe + "csr_indices": segment.mat_csr.indices,
+            prefixe + "csr_data": segment.mat_csr.data,
+            prefixe + "csc_indptr": segment.mat_csc.indptr,
+            prefixe + "csc_indices": segment.mat_csc.indices,
+            prefixe + "csc_data": segment.mat_csc.data,
+        }
+
+    @classmethod
+    def load(cls, path, mmap=True, analyseur=None):
+        """
+        Charge un index enregistré par save() sans retokeniser le corpus.
+        Avec mmap=True, les postings sont projetés en mémoire en lecture seule et ne sont lus qu'à l'usage ;
+        les vecteurs par document sont copiés en mémoire pour permettre les ajouts et suppressions.
+
+        :param path: Chemin du répertoire de l'index (str).
+        :param mmap: Projeter les tableaux en mémoire plutôt que de les lire (bool).
+        :param analyseur: Analyzer des requêtes ; doit être celui utilisé à la construction (par défaut : ANALYSEUR_FR).
+        :return: Instance de SearchEngine.
+        """
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != cls.FORMAT_INDEX:
+            raise ValueError(f"Version d'index non supportée : {meta.get('version')} (attendue : {cls.FORMAT_INDEX})")
+
+        def charger(nom):
+            return np.load(os.path.join(path, nom + ".npy"), mmap_mode="r" if mmap else None)
+
+        moteur = cls.__new__(cls)
+        moteur._initialiser({}, analyseur)
+        forme = (meta["nb_documents"], meta["nb_termes"])
+
+        def charger_segment(prefixe=""):
+            # Matrices reconstruites sur les tableaux chargés, sans copie ni tri
+            mat_csr = csr_matrix((charger(prefixe + "csr_data"), charger(prefixe + "csr_indices"),
+                                  charger(prefixe + "csr_indptr")), shape=forme, copy=False)
+            mat_csc = csc_matrix((charger(prefixe + "csc_data"), charger(prefixe + "csc_indices"),
+                                  charger(prefixe + "csc_indptr")), shape=forme, copy=False)
+            mat_csc.has_sorted_indices = True
+            return mat_csr, mat_csc
+
+        # Positions des occurrences lues à la première expression ou proximité recherchée
+        positions = PositionalPostings(chargeur=lambda: {nom: charger(nom) for nom in PositionalPostings.NOMS})
+        champs = {champ: InvertedIndex(*charger_segment(champ + "_")) for champ in cls.CHAMPS}
+        mat_csr, mat_csc = charger_segment()
+        moteur.segments = [InvertedIndex(mat_csr, mat_csc, positions=positions, champs=champs)]
+        moteur.doc_norms = np.array(charger("doc_norms"))
+        moteur.doc_lengths = np.array(charger("doc_lengths"))
+        moteur.supprimes = np.array(charger("supprimes"))
+        moteur._nb_supprimes = int(moteur.supprimes.sum())
+        moteur.vocab = Vocabulary(Vocabulary.decoder_termes(charger("vocab_octets"), charger("vocab_positions")),
+                                  charger("vocab_occurrences"), np.diff(mat_csc.indptr))
+
+        # Documents reconstruits à partir des métadonnées (contenus lus à la demande dans le fichier)
+        moteur.documents = DocumentStore.load(path, mmap)
+
+        # Sources reconstruites depuis la colonne des sources, sans construire de Document
+        # (chaque source construit les siens au premier accès, voir Source.attacher_magasin)
+        noms_sources = moteur.documents.sources.valeurs
+        source_ids = moteur.documents.source_ids
+        moteur._cles_sources = [(noms_sources[id_source], doc_id)
+                                for doc_id, id_source in enumerate(source_ids.tolist())]
+        actifs = ~moteur.supprimes
+        for id_source in np.unique(source_ids[actifs]).tolist():
+            nom = noms_sources[id_source]
+            moteur.source[nom] = Source(nom)
+            moteur.source[nom].moteur = moteur
+            moteur.source[nom].attacher_magasin(moteur.documents,
+                                                np.flatnonzero(actifs & (source_ids == id_source)).tolist())
+
+        return moteur
+
+    @property
+    def df(self):
+        """Nombre de documents contenant chaque terme (np.ndarray indexé par identifiant de terme)."""
+        return self.vocab.df
 
     def get_vocab(self):
         """
@@ -87,53 +562,481 @@ class SearchEngine:
         """
         return self.mat_TF
 
-    def search(self, query, nb_doc):
+    def _dictionnaire_termes(self):
+        """Retourne le dictionnaire des termes, à jour des termes ajoutés au vocabulaire."""
+        with self._verrou:
+            if self._dictionnaire is None:
+                self._dictionnaire = TermDictionary(self.vocab)
+            else:
+                self._dictionnaire.mettre_a_jour()
+            return self._dictionnaire
+
+    def _developper(self, mot):
+        """Termes du vocabulaire désignés par un mot de requête ou un motif (voir TermDictionary.developper)."""
+        if mot in self.vocab.ids:
+            return [mot]
+        return self._dictionnaire_termes().developper(mot)
+
+    def _termes_requete(self, query):
+        """
+        Analyse une requête avec le même analyseur que les documents (voir Class.query_parser).
+        Appelée via self._analyser_requete, qui mémorise le résultat par chaîne brute.
+        Les motifs (intellig*) et les mots absents du vocabulaire (fautes de frappe) sont développés
+        en termes du vocabulaire, qui comptent tous dans le score.
+
+        :param query: Requête brute (str).
+        :return: Tuple (termes normalisés, identifiants triés des termes recherchés, contraintes, plan, développements).
+            Les contraintes sont des tuples ("phrase", term_ids) et ("near", (term_id_a, term_id_b), k) ;
+            None si une contrainte porte sur un mot absent du vocabulaire (aucun document ne la satisfait).
+            Le plan d'exécution n'est construit que pour une requête booléenne (None sinon) ;
+            les termes sont alors les termes positifs du plan.
+            Les développements associent à chaque motif ou mot corrigé la liste des termes recherchés à sa place.
+        """
+        developpements = {}
+
+        def developper(mot):
+            termes = self._developper(mot)
+            if termes != [mot]:
+                developpements[mot] = tuple(termes)
+            return termes
+
+        ids = self.vocab.ids
+        if est_booleenne(query):
+            plan = plan_requete(query, self.analyseur)
+            plan = plan.developper(developper) if plan is not None else None
+            termes = tuple(plan.termes()) if plan is not None else ()
+            term_ids = np.unique([ids[mot] for mot in termes if mot in ids]).astype(np.int64)
+            term_ids.flags.writeable = False
+            return termes, term_ids, (), plan, developpements
+
+        requete = analyser_requete(query, self.analyseur)
+        recherches = [terme for mot in requete.termes + requete.motifs for terme in developper(mot)]
+        term_ids = np.unique([ids[mot] for mot in recherches if mot in ids]).astype(np.int64)
+        term_ids.flags.writeable = False
+
+        contraintes = []
+        for mots in requete.phrases:
+            contraintes.append(("phrase", tuple(ids.get(mot) for mot in mots)))
+        for mot_a, mot_b, distance in requete.proximites:
+            contraintes.append(("near", (ids.get(mot_a), ids.get(mot_b)), distance))
+        if any(None in contrainte[1] for contrainte in contraintes):
+            contraintes = None
+        else:
+            contraintes = tuple(contraintes)
+        return requete.termes + requete.motifs, term_ids, contraintes, None, developpements
+
+    def _ranker(self, ranker):
+        """
+        Retourne une fonction de pertinence et son état précalculé (vecteur IDF, normalisation
+        par document). L'état est calculé une seule fois par fonction (et jeu de paramètres)
+        et par génération de l'index, puis réutilisé à chaque requête.
+
+        :param ranker: Nom de la fonction ("cosine", "tfidf", "bm25", "bm25+") ou instance de Ranker.
+        :return: Tuple (Ranker, dictionnaire d'état).
+        """
+        if not isinstance(ranker, Ranker):
+            if ranker not in RANKERS:
+                raise ValueError(f"Fonction de pertinence inconnue : {ranker}")
+            ranker = RANKERS[ranker]
+
+        cle = ranker.cle()
+        cache = self._rankers.get(cle)
+        if cache is None or cache[0] != self.generation:
+            cache = self._rankers[cle] = (self.generation, ranker.preparer(self))
+        return ranker, cache[1]
+
+    def search(self, query, nb_doc, backend="matrix", ranker="cosine", since=None, until=None, sources=None,
+               authors=None, total=True):
         """
         Recherche les documents les plus pertinents pour une requête donnée.
 
-        :param query: Mots-clés de la requête (str).
+        :param query: Mots-clés de la requête (str). Une expression entre guillemets ("intelligence artificielle")
+            impose que ses mots se suivent, a NEAR/k b que a et b soient à au plus k mots l'un de l'autre ;
+            tous les mots de la requête comptent dans le score. Un motif (intellig*, r?bot) est remplacé par
+            les termes les plus fréquents qui lui correspondent, un mot inconnu par ses corrections (artificiele).
+            Avec AND, OR, NOT, des parenthèses, un champ (titre:, description:, full_content:) ou un poids (mot^2),
+            la requête est exécutée comme une requête booléenne sur les listes de postings (voir Class.query_parser) ;
+            le backend est alors sans effet.
         :param nb_doc: Nombre de documents à retourner (int).
-        :return: Liste des documents les plus pertinents avec leurs scores.
-        """
-        # Nettoyer et vectoriser la requête
-        query = query.lower()
-        mots = query.split()
-        query_vector = np.zeros(len(self.vocab))
-        for mot in mots:
-            if mot in self.vocab:
-                query_vector[self.vocab[mot]["id"]] = 1  
-
-        # Calculer les similarités avec les documents
-        doc_vectors = self.mat_TF.toarray() 
-        query_norm = np.linalg.norm(query_vector)
-        doc_norms = np.linalg.norm(doc_vectors, axis=1)
-        similarity = np.dot(doc_vectors, query_vector) / (doc_norms * query_norm + 1e-10)
-
-        # Trier les scores et récupérer les documents les plus pertinents
-        non_zero_indices = np.where(similarity > 0)[0]
-        top_indices = np.argsort(similarity)[::-1][:nb_doc]
-        results = [(self.documents[idx], similarity[idx]) for idx in top_indices if similarity[idx] > 0]
-
-        return results, len(non_zero_indices)
-    
-    
+        :param backend: Méthode de calcul des scores (str) :
+            - "matrix" : produit matrice creuse x vecteur creux ;
+            - "taat" : index inversé, accumulation terme par terme ;
+            - "daat" : index inversé, document par document avec élagage WAND.
+        :param ranker: Fonction de pertinence (str ou Ranker) : "cosine" (TF brut, par défaut),
+            "tfidf", "bm25", "bm25+", ou une instance paramétrée comme BM25Ranker(k1=1.5, b=0.7).
+        :param since: Date de publication minimale incluse (date, datetime ou 'YYYY-MM-DD').
+        :param until: Date de publication maximale incluse.
+        :param sources: Noms des sources acceptées (liste).
+        :param authors: Noms des auteurs acceptés (liste).
+        :param total: Compter tous les documents trouvés (bool). Seul le backend "daat" en fait l'économie :
+            avec total=False, nb_hits vaut None s'il n'est pas connu sans l'union de toutes les listes de postings.
+        :return: Tuple (liste des documents les plus pertinents avec leurs scores, nb_hits).
+        Les filtres forment un masque sur les colonnes du magasin de documents, appliqué aux postings
+        avant le calcul des scores : seuls les documents retenus sont évalués et comptés.
+        Le classement complet est mis en cache par (termes de la requête, fonction de pertinence, backend, filtres)
+        pour la génération courante de l'index : une autre valeur de nb_doc n'est qu'une tranche de ce classement.
+        Avec "daat", seuls les PROFONDEUR_DAAT premiers documents (au moins nb_doc) sont classés et mis en cache,
+        pour que l'élagage WAND reste efficace ; une page plus profonde relance le calcul.
+        """
+        if backend not in ("matrix", "taat", "daat"):
+            raise ValueError(f"Backend inconnu : {backend}")
+
+        # Analyser la requête et retrouver les identifiants de ses termes
+        _, term_ids, contraintes, plan, _ = self._analyser_requete(query)
+        if len(term_ids) == 0 or contraintes is None:
+            return [], 0
+
+        # Instantané cohérent de l'index (les ajouts concurrents créent de nouveaux segments)
+        with self._verrou:
+            ranker, etat = self._ranker(ranker)
+            if plan is not None:
+                cle = (repr(plan), ranker.cle(), "booleen", self._cle_filtres(since, until, sources, authors))
+            else:
+                cle = (term_ids.tobytes(), contraintes, ranker.cle(), backend,
+                       self._cle_filtres(since, until, sources, authors))
+            generation = self.generation
+            classement = self._classement_en_cache(cle)
+            nb_documents = len(self.documents)
+            if plan is None and backend == "daat":
+                # WAND n'élague que sous le score du k-ième document : seul le début du classement est calculé,
+                # puis recalculé plus profond (au moins le double) si une page plus lointaine est demandée
+                profondeur = max(nb_doc, self.PROFONDEUR_DAAT)
+                if classement is not None:
+                    precedent = len(classement[0])
+                    # Sans décompte (nb_hits None), d'autres documents peuvent suivre ceux déjà classés
+                    disponibles = classement[2] if classement[2] is not None else nb_doc
+                    if precedent < min(nb_doc, disponibles):
+                        classement, profondeur = None, max(profondeur, 2 * precedent)
+                    elif total and classement[2] is None:
+                        # Même profondeur, recalculée cette fois avec le décompte
+                        classement, profondeur = None, max(profondeur, precedent)
+            if classement is None:
+                segments = self.segments
+                exclus = self._exclus(since, until, sources, authors)
+
+        if classement is None:
+            if contraintes:
+                # Seuls les documents qui satisfont les expressions et proximités sont évalués
+                exclus = self._exclus_contraintes(segments, contraintes, nb_documents, exclus)
+            # Classement de tous les documents trouvés (des premiers seulement pour "daat"), calculé une seule fois
+            poids = ranker.query_weights(etat["idf"][term_ids])
+            if plan is not None:
+                classement = self._executer_plan(plan, segments, ranker, etat, term_ids, poids, nb_documents, exclus)
+            elif backend in ("taat", "daat"):
+                listes = self._listes_postings(segments, ranker, etat, term_ids, poids, exclus)
+                classement = top_k_taat(listes, nb_documents) if backend == "taat" \
+                    else top_k_wand(listes, profondeur, compter=total)
+            else:
+                classement = self._score_matrix(segments, ranker, etat, term_ids, poids, nb_documents, exclus)
+            with self._verrou:
+                self._mettre_en_cache(cle, generation, classement)
+
+        doc_ids, scores, nb_hits = classement
+        nb_doc = max(nb_doc, 0)
+        results = [(self.documents[d], score) for d, score in zip(doc_ids[:nb_doc].tolist(), scores[:nb_doc])]
+        return results, nb_hits
+
+    def _executer_plan(self, plan, segments, ranker, etat, term_ids, poids, nb_doc, exclus=None):
+        """
+        Exécute le plan d'une requête booléenne sur les listes de postings : seules les listes des termes
+        de la requête sont lues, les documents exclus (supprimés, filtres) ne sont écartés que parmi les résultats.
+
+        :return: Tuple (doc_ids, scores, nb_hits) triés par score décroissant.
+        """
+        contexte = ContexteRequete(segments, self.vocab.ids, ranker, etat, dict(zip(term_ids.tolist(), poids)))
+        doc_ids, scores = plan.executer(contexte)
+        if exclus is not None and len(doc_ids):
+            retenus = ~exclus[doc_ids]
+            doc_ids, scores = doc_ids[retenus], scores[retenus]
+        return selectionner_top_k(doc_ids, scores, nb_doc)
+
+    @staticmethod
+    def _exclus_contraintes(segments, contraintes, nb_documents, exclus=None):
+        """
+        Ajoute aux documents exclus ceux qui ne satisfont pas les contraintes de la requête.
+        Seules les positions des termes des contraintes sont lues.
+
+        :param segments: Segments de l'index.
+        :param contraintes: Contraintes de la requête (voir _termes_requete).
+        :param nb_documents: Nombre de documents de l'index (int).
+        :param exclus: Masque des documents déjà exclus, ou None.
+        :return: Nouveau masque booléen des documents exclus.
+        """
+        retenus = np.ones(nb_documents, dtype=bool)
+        for contrainte in contraintes:
+            satisfait = np.zeros(nb_documents, dtype=bool)
+            for segment in segments:
+                if contrainte[0] == "phrase":
+                    satisfait[segment.occurrences_expression(contrainte[1])[0]] = True
+                else:
+                    satisfait[segment.documents_proches(*contrainte[1], contrainte[2])] = True
+            retenus &= satisfait
+        return ~retenus if exclus is None else exclus | ~retenus
+
+    @staticmethod
+    def _cle_filtres(since, until, sources, authors):
+        """Normalise les filtres d'une recherche pour la clé du cache de classements."""
+        return (
+            en_jours(since) if since is not None else None,
+            en_jours(until) if until is not None else None,
+            tuple(sorted(set(sources))) if sources is not None else None,
+            tuple(sorted(set(authors))) if authors is not None else None,
+        )
+
+    def _classement_en_cache(self, cle):
+        """
+        Retourne un classement mémorisé pour la génération courante (à appeler sous self._verrou).
+
+        :param cle: Clé de la recherche.
+        :return: Tuple (doc_ids, scores, nb_hits) ou None.
+        """
+        # Toute modification du corpus rend les classements mémorisés obsolètes
+        if self._generation_resultats != self.generation:
+            self._resultats.clear()
+            self._generation_resultats = self.generation
+        classement = self._resultats.get(cle)
+        if classement is not None:
+            self._resultats.move_to_end(cle)
+        return classement
+
+    def _mettre_en_cache(self, cle, generation, classement):
+        """
+        Mémorise un classement calculé pour une génération donnée (à appeler sous self._verrou) ;
+        ignoré si l'index a changé pendant le calcul.
+        """
+        if generation != self.generation or generation != self._generation_resultats:
+            return
+        for tableau in classement[:2]:
+            tableau.flags.writeable = False
+        self._resultats[cle] = classement
+        if len(self._resultats) > self.TAILLE_CACHE_RESULTATS:
+            self._resultats.popitem(last=False)
+
+    def _exclus(self, since, until, sources, authors):
+        """
+        Calcule le masque des documents exclus de la recherche : documents supprimés
+        et documents ne satisfaisant pas les filtres de métadonnées.
+
+        :return: Masque booléen aligné sur les identifiants, ou None si aucun document n'est exclu.
+        """
+        filtre = self.documents.filtre(since, until, sources, authors)
+        if filtre is None:
+            return self.supprimes if self._nb_supprimes else None
+        return ~filtre | self.supprimes
+
+    def _listes_postings(self, segments, ranker, etat, term_ids, poids, exclus=None):
+        """
+        Rassemble, pour chaque terme de la requête, ses postings dans tous les segments
+        (hors documents exclus) et leurs contributions pondérées.
+
+        :return: Liste de tuples (doc_ids, contributions), un par terme.
+        """
+        listes = []
+        for term_id, w in zip(term_ids.tolist(), poids):
+            morceaux = [segment.postings(term_id) for segment in segments]
+            doc_ids = np.concatenate([docs for docs, _ in morceaux])
+            tfs = np.concatenate([tfs for _, tfs in morceaux])
+            if exclus is not None:
+                retenus = ~exclus[doc_ids]
+                doc_ids, tfs = doc_ids[retenus], tfs[retenus]
+            listes.append((doc_ids, ranker.impacts(etat, term_id, doc_ids, tfs) * w))
+        return listes
+
+    def _score_matrix(self, segments, ranker, etat, term_ids, poids, nb_doc, exclus=None):
+        """
+        Calcule les scores, segment par segment, par produit de la matrice creuse des impacts
+        des termes de la requête avec le vecteur creux de la requête.
+
+        :return: Tuple (doc_ids, scores, nb_hits) triés par score décroissant.
+        """
+        candidats, similarites = [], []
+        for segment in segments:
+            # Seules les colonnes des termes de la requête sont extraites, la matrice n'est jamais densifiée
+            colonnes, positions = segment.colonnes(term_ids)
+            if colonnes.nnz == 0:
+                continue
+            lignes, tfs = colonnes.indices, colonnes.data
+            doc_ids = lignes.astype(np.int64) + segment.offset
+            numeros = np.repeat(np.arange(len(positions)), np.diff(colonnes.indptr))
+            if exclus is not None:
+                # Postings des documents exclus écartés avant le calcul des impacts
+                retenus = ~exclus[doc_ids]
+                lignes, tfs, doc_ids, numeros = lignes[retenus], tfs[retenus], doc_ids[retenus], numeros[retenus]
+                if len(doc_ids) == 0:
+                    continue
+            impacts = ranker.impacts(etat, term_ids[positions][numeros], doc_ids, tfs)
+            indptr = colonnes.indptr
+            if exclus is not None:
+                indptr = np.concatenate([[0], np.cumsum(np.bincount(numeros, minlength=len(positions)))])
+            matrice = csc_matrix((impacts, lignes, indptr), shape=colonnes.shape)
+
+            query_vector = csc_matrix(
+                (poids[positions], (np.arange(len(positions)), np.zeros(len(positions), dtype=np.int64))),
+                shape=(len(positions), 1)
+            )
+            produit = matrice @ query_vector
+            candidats.append(produit.indices.astype(np.int64) + segment.offset)
+            similarites.append(produit.data)
+
+        if not candidats:
+            return np.array([], dtype=np.int64), np.array([]), 0
+
+        # Sélection des meilleurs documents parmi les seuls candidats
+        return selectionner_top_k(np.concatenate(candidats), np.concatenate(similarites), nb_doc)
+
+    def concordance(self, expression, context_size=30, nb_max=None, sources=None):
+        """
+        Concordancier (KWIC) : retrouve les occurrences d'une expression avec leur contexte gauche et droit.
+        L'expression passe par l'analyseur ; ses mots doivent se suivre dans le document (stop words ignorés).
+        Les occurrences sont lues dans les positions de l'index : seules celles des termes de l'expression
+        sont parcourues, et seuls les contenus des documents trouvés sont lus. Un contexte ne déborde
+        jamais sur un autre document.
+
+        :param expression: Mot ou suite de mots (str).
+        :param context_size: Nombre de caractères des contextes gauche et droit (int).
+        :param nb_max: Nombre maximal d'occurrences retournées (int, par défaut toutes).
+        :param sources: Noms des sources dont les documents sont retenus (liste, par défaut toutes).
+        :return: Liste de tuples (doc_id, contexte gauche, motif trouvé, contexte droit),
+            par document puis par position.
+        """
+        termes = self._analyser_requete(expression)[0]
+        ids = self.vocab.ids
+        if not termes or any(mot not in ids for mot in termes):
+            return []
+        term_ids = [ids[mot] for mot in termes]
+
+        with self._verrou:
+            segments = self.segments
+            supprimes = self.supprimes
+            cles_sources = self._cles_sources
+
+        resultats = []
+        for segment in segments:
+            if nb_max is not None and len(resultats) >= nb_max:
+                break
+            doc_ids, debuts, fins = segment.occurrences_expression(term_ids)
+            for doc_id, debut, fin in zip(doc_ids.tolist(), debuts.tolist(), fins.tolist()):
+                if supprimes[doc_id] or (sources is not None and cles_sources[doc_id][0] not in sources):
+                    continue
+                if nb_max is not None and len(resultats) >= nb_max:
+                    break
+                resultats.append((doc_id, debut, fin))
+
+        # Contexte pris dans le contenu complet de chaque document trouvé (lu une seule fois par document)
+        contextes, corps, doc_courant = [], "", None
+        for doc_id, debut, fin in resultats:
+            if doc_id != doc_courant:
+                corps, doc_courant = self.documents.body(doc_id), doc_id
+            contextes.append((doc_id, corps[max(0, debut - context_size):debut], corps[debut:fin],
+                              corps[fin:fin + context_size]))
+        return contextes
+
     def get_word_stats(self, word):
         """
         Récupère les statistiques d'un mot dans le vocabulaire.
+        Le mot passe par le même analyseur que les documents (accents, ponctuation...).
+        Un motif (intellig*) ou un mot mal orthographié (artificiele) est développé comme dans search :
+        les statistiques portent alors sur l'ensemble des termes qu'il désigne.
 
         :param word: Le mot pour lequel on veut obtenir les statistiques (str).
-        :return: Un dictionnaire contenant les statistiques du mot, ou None si le mot n'existe pas.
-        """
-        word = word.lower()  
-        if word in self.vocab:
-            stats = self.vocab[word]
-            return {
-                "occurrences": stats["occurrences"],
-                "document_frequency": stats["document_frequency"],
-                "length": len(word)
-            }
-        else:
+        :return: Un dictionnaire contenant les statistiques du mot et les termes comptés ("termes"),
+            ou None si le mot ne désigne aucun terme présent.
+        """
+        termes = self._analyser_requete(word)[0]
+        if len(termes) != 1:
             return None
+        trouves = [t for t in self._developper(termes[0]) if t in self.vocab and self.vocab[t]["occurrences"] > 0]
+        if not trouves:
+            return None
+        if trouves == [termes[0]]:
+            stats = self.vocab[termes[0]]
+            document_frequency = stats["document_frequency"]
+        else:
+            # Documents contenant au moins un des termes : union des postings des segments
+            ids = [self.vocab.ids[t] for t in trouves]
+            with self._verrou:
+                segments, supprimes = self.segments, self.supprimes
+            docs = np.unique(np.concatenate([s.postings(i)[0] for s in segments for i in ids]))
+            document_frequency = int(np.count_nonzero(~supprimes[docs]))
+        return {
+            "occurrences": sum(self.vocab[t]["occurrences"] for t in trouves),
+            "document_frequency": document_frequency,
+            "length": len(termes[0]),
+            "termes": trouves
+        }
+
+    def _trie_completion(self):
+        """Retourne le trie de complétion de la génération courante, construit au premier appel."""
+        with self._verrou:
+            if self._completion is not None and self._generation_completion == self.generation:
+                return self._completion
+            # Instantané du vocabulaire et des titres ; la construction a lieu hors du verrou
+            generation = self.generation
+            termes = self.vocab.termes[:len(self.vocab.occurrences)]
+            occurrences, df = self.vocab.occurrences.copy(), self.vocab.df.copy()
+            titres = [titre for titre, supprime in zip(self.documents.colonnes["titre"], self.supprimes.tolist())
+                      if not supprime]
 
+        trie = CompletionTrie.depuis_index(termes, occurrences, df, titres, self.analyseur)
+        with self._verrou:
+            if self._generation_completion is None or generation >= self._generation_completion:
+                self._completion, self._generation_completion = trie, generation
+        return trie
 
-    
\ No newline at end of file
+    def autocomplete(self, prefix, n=5):
+        """
+        Suggère des complétions pour le début d'une requête (recherche au fil de la saisie).
+        Le texte saisi passe par l'analyseur ; le dernier mot, sauf s'il est suivi d'une espace, est un début de mot.
+        Les suggestions sont les termes du vocabulaire (classés par occurrences puis par nombre de documents)
+        et les n-grammes fréquents des titres. Si aucun n-gramme ne prolonge les mots déjà saisis,
+        seul le dernier mot est complété (les suggestions ne sont alors que des termes).
+
+        :param prefix: Texte saisi (str).
+        :param n: Nombre maximal de suggestions (int, au plus CompletionTrie.TAILLE_TOP).
+        :return: Liste de tuples (suggestion, score) par score décroissant.
+        """
+        trie = self._trie_completion()
+        morceaux = prefix.split()
+        if not morceaux:
+            return []
+        termine = prefix[-1].isspace()
+        mots = self.analyseur.tokens(" ".join(morceaux if termine else morceaux[:-1]))
+        debut = "" if termine else self.analyseur.normaliser(morceaux[-1]).replace(" ", "")
+
+        cle = " ".join(mots + [debut]) if debut else " ".join(mots) + " "
+        suggestions = trie.completer(cle, n) if cle.strip() else []
+        if not suggestions and mots and debut:
+            # Aucun n-gramme ne prolonge les mots déjà saisis : dernier mot complété seul, à leur suite
+            # (seule liste retournée, pour garder un même barème de scores)
+            debut_requete = " ".join(mots) + " "
+            suggestions = [(debut_requete + texte, score) for texte, score in trie.completer(debut, trie.taille_top)
+                           if " " not in texte][:n]
+        return suggestions
+
+    def apply_suggestion(self, prefix, suggestion):
+        """
+        Applique au texte saisi une suggestion de autocomplete() : le dernier mot saisi est remplacé
+        par sa complétion (suivie des mots qui la prolongent dans un n-gramme), le reste du texte
+        est gardé tel que saisi (casse, accents, syntaxe de la requête).
+
+        :param prefix: Texte saisi (str).
+        :param suggestion: Suggestion retournée par autocomplete(prefix) (str).
+        :return: Texte complété (str).
+        """
+        morceaux = prefix.split()
+        termine = not morceaux or prefix[-1].isspace()
+        mots = self.analyseur.tokens(" ".join(morceaux if termine else morceaux[:-1]))
+        # La suggestion commence par les mots déjà saisis, analysés
+        suite = " ".join(suggestion.split()[len(mots):])
+        return (prefix if termine else prefix[:len(prefix) - len(morceaux[-1])]) + suite
+
+    def get_top_words(self, n=5):
+        """
+        Retourne les mots les plus fréquents du corpus (classement tenu à jour par le vocabulaire,
+        sans tri du vocabulaire entier).
+
+        :param n: Nombre de mots (int).
+        :return: Liste de tuples (mot, occurrences, document_frequency) par occurrences décroissantes.
+        """
+        with self._verrou:
+            return self.vocab.top(n)
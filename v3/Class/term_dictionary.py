@@ -0,0 +1,196 @@
+import re
+from itertools import combinations
+
+import numpy as np
+
+
+def distance_edition(a, b, distance_max):
+    """
+    Distance de Damerau-Levenshtein restreinte (insertion, suppression, substitution,
+    transposition de deux lettres voisines), calculée ligne par ligne et abandonnée
+    dès que toute la ligne dépasse distance_max.
+
+    :param a: Premier mot (str).
+    :param b: Second mot (str).
+    :param distance_max: Distance au-delà de laquelle le calcul s'arrête (int).
+    :return: Distance (int), ou distance_max + 1 si elle dépasse distance_max.
+    """
+    if abs(len(a) - len(b)) > distance_max:
+        return distance_max + 1
+    precedente, courante = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        avant, precedente, courante = precedente, courante, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cout = 0 if a[i - 1] == b[j - 1] else 1
+            courante[j] = min(precedente[j] + 1, courante[j - 1] + 1, precedente[j - 1] + cout)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                courante[j] = min(courante[j], avant[j - 2] + 1)
+        if min(courante) > distance_max:
+            return distance_max + 1
+    return courante[-1]
+
+
+class TermDictionary:
+    # Nombre maximal de termes retournés par une expansion de préfixe ou de motif
+    MAX_EXPANSIONS = 20
+
+    # Nombre maximal de corrections proposées pour un mot inconnu
+    MAX_CORRECTIONS = 3
+
+    # Distance d'édition maximale des corrections (1 pour les mots de LONGUEUR_COURTE lettres ou moins)
+    DISTANCE_MAX = 2
+    LONGUEUR_COURTE = 4
+
+    # Les suppressions ne portent que sur le début des mots (voir _suppressions)
+    LONGUEUR_PREFIXE = 7
+
+    def __init__(self, vocab):
+        """
+        Initialise le dictionnaire des termes d'un vocabulaire :
+        - les termes triés, et triés à l'envers, pour trouver par dichotomie ceux qui commencent
+          ou finissent par une chaîne (expansion de préfixe et de motifs comme intellig* ou *ment) ;
+        - un index de suppressions à la SymSpell pour la correction des fautes de frappe :
+          chaque terme est rangé sous toutes les chaînes obtenues en supprimant jusqu'à DISTANCE_MAX lettres
+          de son début ; un mot mal saisi est cherché sous ses propres suppressions, et seuls ces candidats
+          sont comparés par distance d'édition.
+        Les termes ajoutés au vocabulaire sont pris en compte par mettre_a_jour().
+        Les expansions sont classées par nombre d'occurrences (lu dans le vocabulaire à chaque appel)
+        et ne retiennent que des termes présents dans le contenu des documents actifs.
+
+        :param vocab: Vocabulary du moteur de recherche.
+        """
+        self.vocab = vocab
+        self.suppressions = {}  # chaîne -> identifiants des termes
+        self.nb_termes = 0
+        self._tries = None  # (termes triés, identifiants), recalculés après un ajout
+        self._inverses = None
+        self.mettre_a_jour()
+
+    def mettre_a_jour(self):
+        """
+        Indexe les termes ajoutés au vocabulaire depuis le dernier appel (les identifiants ne font que croître).
+
+        :return: Nombre de termes ajoutés (int).
+        """
+        termes = self.vocab.termes
+        nouveaux = range(self.nb_termes, len(termes))
+        for term_id in nouveaux:
+            for cle in self._suppressions(termes[term_id]):
+                self.suppressions.setdefault(cle, []).append(term_id)
+        if len(nouveaux):
+            self.nb_termes = len(termes)
+            self._tries = self._inverses = None
+        return len(nouveaux)
+
+    def _suppressions(self, mot, distance_max=None):
+        """Chaînes obtenues en supprimant de 0 à distance_max lettres des LONGUEUR_PREFIXE premières lettres du mot."""
+        distance_max = self.DISTANCE_MAX if distance_max is None else distance_max
+        prefixe = mot[:self.LONGUEUR_PREFIXE]
+        resultat = {prefixe}
+        for nb in range(1, min(distance_max, len(prefixe)) + 1):
+            for positions in combinations(range(len(prefixe)), nb):
+                resultat.add("".join(c for i, c in enumerate(prefixe) if i not in positions))
+        return resultat
+
+    def _trier(self, inverse=False):
+        """Retourne (termes triés, identifiants) des termes, à l'endroit ou à l'envers."""
+        tries = self._inverses if inverse else self._tries
+        if tries is None:
+            termes = self.vocab.termes[:self.nb_termes]
+            cles = np.array([t[::-1] for t in termes] if inverse else termes, dtype=str)
+            ordre = np.argsort(cles, kind="stable")
+            tries = (cles[ordre], ordre)
+            if inverse:
+                self._inverses = tries
+            else:
+                self._tries = tries
+        return tries
+
+    def _plage(self, debut, inverse=False):
+        """Identifiants des termes qui commencent (ou finissent, si inverse) par debut."""
+        cles, ids = self._trier(inverse)
+        # Chaînes de largeur fixe : une chaîne plus longue que tous les termes n'en commence aucun
+        if len(debut) > cles.dtype.itemsize // 4:
+            return ids[:0]
+        suivant = debut[:-1] + chr(ord(debut[-1]) + 1)
+        return ids[np.searchsorted(cles, debut, side="left"):np.searchsorted(cles, suivant, side="left")]
+
+    def prefixe(self, prefixe, n=None):
+        """
+        Retourne les termes les plus fréquents qui commencent par un préfixe.
+
+        :param prefixe: Début de mot normalisé (str).
+        :param n: Nombre maximal de termes (par défaut : MAX_EXPANSIONS).
+        :return: Liste de termes, par occurrences décroissantes.
+        """
+        ids = self.vocab.meilleurs(self._plage(prefixe), n or self.MAX_EXPANSIONS)
+        return [self.vocab.termes[i] for i in ids.tolist()]
+
+    def motif(self, motif, n=None):
+        """
+        Retourne les termes les plus fréquents qui correspondent à un motif : * remplace une suite de lettres
+        (éventuellement vide), ? une seule lettre. Les termes sont d'abord restreints par dichotomie
+        au début du motif (ou à sa fin s'il commence par un joker) ; seul un motif entouré de jokers
+        parcourt tout le vocabulaire.
+
+        :param motif: Motif normalisé (str), par exemple "intellig*" ou "*ique".
+        :param n: Nombre maximal de termes (par défaut : MAX_EXPANSIONS).
+        :return: Liste de termes, par occurrences décroissantes.
+        """
+        if "*" not in motif and "?" not in motif:
+            return [motif] if motif in self.vocab and self.vocab.occurrences[self.vocab.ids[motif]] > 0 else []
+        debut = re.split(r"[*?]", motif, maxsplit=1)[0]
+        fin = re.split(r"[*?]", motif)[-1]
+        if debut:
+            ids = self._plage(debut)
+        elif fin:
+            ids = self._plage(fin[::-1], inverse=True)
+        else:
+            ids = np.arange(self.nb_termes)
+        if motif.rstrip("*") != debut:
+            expression = re.compile("".join(".*" if c == "*" else "." if c == "?" else re.escape(c) for c in motif))
+            termes = self.vocab.termes
+            ids = np.array([i for i in ids.tolist() if expression.fullmatch(termes[i])], dtype=np.int64)
+        ids = self.vocab.meilleurs(ids, n or self.MAX_EXPANSIONS)
+        return [self.vocab.termes[i] for i in ids.tolist()]
+
+    def corrections(self, mot, n=None):
+        """
+        Retourne les termes les plus proches d'un mot par distance d'édition (fautes de frappe) :
+        seuls les termes à la plus petite distance trouvée sont retenus, par occurrences décroissantes.
+
+        :param mot: Mot normalisé (str).
+        :param n: Nombre maximal de termes (par défaut : MAX_CORRECTIONS).
+        :return: Liste de tuples (terme, distance).
+        """
+        distance_max = 1 if len(mot) <= self.LONGUEUR_COURTE else self.DISTANCE_MAX
+        termes, occurrences = self.vocab.termes, self.vocab.occurrences
+        candidats = set()
+        for cle in self._suppressions(mot, distance_max):
+            candidats.update(self.suppressions.get(cle, ()))
+
+        meilleure, retenus = distance_max + 1, []
+        for term_id in candidats:
+            if occurrences[term_id] <= 0:
+                continue
+            distance = distance_edition(mot, termes[term_id], min(meilleure, distance_max))
+            if distance < meilleure:
+                meilleure, retenus = distance, [term_id]
+            elif distance == meilleure and distance <= distance_max:
+                retenus.append(term_id)
+        ids = self.vocab.meilleurs(np.array(retenus, dtype=np.int64), n or self.MAX_CORRECTIONS)
+        return [(termes[i], meilleure) for i in ids.tolist()]
+
+    def developper(self, mot):
+        """
+        Retourne les termes du vocabulaire désignés par un mot de requête :
+        le mot lui-même s'il est dans le vocabulaire, les termes d'un motif (joker * ou ?), sinon ses corrections.
+
+        :param mot: Mot ou motif normalisé (str).
+        :return: Liste de termes (vide si rien ne correspond).
+        """
+        if "*" in mot or "?" in mot:
+            return self.motif(mot)
+        if mot in self.vocab:
+            return [mot]
+        return [terme for terme, _ in self.corrections(mot)]
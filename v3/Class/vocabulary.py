@@ -0,0 +1,153 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class Vocabulary(Mapping):
+    # Nombre de termes les plus fréquents tenus à jour (voir top)
+    TAILLE_TOP = 100
+
+    def __init__(self, termes=(), occurrences=None, df=None):
+        """
+        Initialise le vocabulaire du moteur de recherche : un identifiant par terme et les statistiques
+        de chaque terme dans des tableaux NumPy indexés par identifiant (occurrences totales,
+        nombre de documents contenant le terme). La liste des termes les plus fréquents est
+        précalculée et mise à jour à chaque ajout de documents.
+        Le vocabulaire se lit comme un dictionnaire {mot: {"id", "occurrences", "document_frequency"}},
+        dont les valeurs sont construites à la lecture.
+
+        :param termes: Mot de chaque identifiant.
+        :param occurrences: Occurrences totales de chaque terme.
+        :param df: Nombre de documents contenant chaque terme.
+        """
+        self.termes = list(termes)
+        self.ids = {mot: i for i, mot in enumerate(self.termes)}
+        nb_termes = len(self.termes)
+        self.occurrences = np.zeros(nb_termes, dtype=np.int64) if occurrences is None else np.array(occurrences, dtype=np.int64)
+        self.df = np.zeros(nb_termes, dtype=np.int64) if df is None else np.array(df, dtype=np.int64)
+        self._top = None  # identifiants des termes les plus fréquents, triés ; None s'il faut le recalculer
+
+    def __getitem__(self, mot):
+        i = self.ids[mot]
+        return {"id": i, "occurrences": int(self.occurrences[i]), "document_frequency": int(self.df[i])}
+
+    def __contains__(self, mot):
+        return mot in self.ids
+
+    def __iter__(self):
+        return iter(self.termes)
+
+    def __len__(self):
+        return len(self.termes)
+
+    def tableaux(self):
+        """
+        Retourne les tableaux à enregistrer (voir SearchEngine.save) : les termes encodés en un seul bloc
+        UTF-8 avec la position de chacun dans le bloc (un tableau de chaînes NumPy aurait la largeur fixe
+        du plus long terme), et leurs occurrences.
+
+        :return: Dictionnaire {"vocab_octets", "vocab_positions", "vocab_occurrences"} de np.ndarray.
+        """
+        encodes = [terme.encode("utf-8") for terme in self.termes]
+        positions = np.zeros(len(encodes) + 1, dtype=np.int64)
+        np.cumsum([len(encode) for encode in encodes], out=positions[1:])
+        return {
+            "vocab_octets": np.frombuffer(b"".join(encodes), dtype=np.uint8),
+            "vocab_positions": positions,
+            "vocab_occurrences": self.occurrences,
+        }
+
+    @staticmethod
+    def decoder_termes(octets, positions):
+        """
+        Décode les termes enregistrés par tableaux().
+
+        :param octets: Bloc UTF-8 des termes (np.ndarray de uint8).
+        :param positions: Position de chaque terme dans le bloc, suivie de la fin du bloc.
+        :return: Liste des termes (str).
+        """
+        octets = octets.tobytes()
+        return [octets[debut:fin].decode("utf-8") for debut, fin in zip(positions[:-1].tolist(), positions[1:].tolist())]
+
+    def nb_termes_presents(self):
+        """
+        Retourne le nombre de termes présents dans le contenu des documents actifs
+        (sans les termes des seuls titres et descriptions, ni ceux des documents supprimés).
+
+        :return: int
+        """
+        return int(np.count_nonzero(self.occurrences))
+
+    def identifiant(self, mot):
+        """
+        Retourne l'identifiant d'un mot, en l'ajoutant au vocabulaire s'il est nouveau.
+        Les statistiques des nouveaux termes sont créées par ajouter_comptes().
+
+        :param mot: Terme (str).
+        :return: Identifiant (int).
+        """
+        i = self.ids.get(mot)
+        if i is None:
+            i = self.ids[mot] = len(self.termes)
+            self.termes.append(mot)
+        return i
+
+    def ajouter_comptes(self, mat):
+        """
+        Ajoute aux statistiques les postings d'une matrice Documents x Termes et met à jour
+        les termes les plus fréquents : les comptes ne font qu'augmenter, seuls les termes
+        de la matrice peuvent entrer dans le classement.
+
+        :param mat: Matrice csr_matrix des nouveaux documents.
+        """
+        nb_termes = len(self.termes)
+        occurrences = np.zeros(nb_termes, dtype=np.int64)
+        occurrences[:len(self.occurrences)] = self.occurrences
+        df = np.zeros(nb_termes, dtype=np.int64)
+        df[:len(self.df)] = self.df
+        # Nouveaux tableaux (et non modification en place) : les lecteurs gardent un état cohérent
+        self.occurrences = occurrences + np.bincount(mat.indices, weights=mat.data, minlength=nb_termes).astype(np.int64)
+        self.df = df + np.bincount(mat.indices, minlength=nb_termes)
+
+        if self._top is not None:
+            candidats = np.union1d(self._top, mat.indices)
+            self._top = self.meilleurs(candidats, self.TAILLE_TOP)
+
+    def retirer_comptes(self, term_ids, tfs):
+        """
+        Retire des statistiques les termes de documents supprimés (en un seul appel pour tous les documents).
+        Un terme du classement peut alors être dépassé par un terme absent du classement :
+        celui-ci sera recalculé à la prochaine lecture.
+
+        :param term_ids: Termes des documents, concaténés (un terme apparaît une fois par document).
+        :param tfs: Fréquences des termes dans leur document.
+        """
+        # Comme dans ajouter_comptes : nouveaux tableaux, jamais de modification en place
+        nb_termes = len(self.occurrences)
+        occurrences = self.occurrences - np.bincount(term_ids, weights=tfs, minlength=nb_termes).astype(np.int64)
+        df = self.df - np.bincount(term_ids, minlength=nb_termes)
+        self.occurrences, self.df = occurrences, df
+        self._top = None
+
+    def meilleurs(self, candidats, n):
+        """Retourne les n candidats de plus grand nombre d'occurrences, triés (argpartition puis tri de n éléments)."""
+        candidats = candidats[self.occurrences[candidats] > 0]
+        if len(candidats) > n:
+            candidats = candidats[np.argpartition(-self.occurrences[candidats], n - 1)[:n]]
+        return candidats[np.lexsort((candidats, -self.occurrences[candidats]))]
+
+    def top(self, n=10):
+        """
+        Retourne les n termes les plus fréquents du corpus.
+        Jusqu'à TAILLE_TOP termes, c'est une lecture du classement précalculé.
+
+        :param n: Nombre de termes (int).
+        :return: Liste de tuples (mot, occurrences, document_frequency) par occurrences décroissantes.
+        """
+        if n > self.TAILLE_TOP:
+            ids = self.meilleurs(np.arange(len(self.occurrences)), n)
+        else:
+            if self._top is None:
+                self._top = self.meilleurs(np.arange(len(self.occurrences)), self.TAILLE_TOP)
+            ids = self._top[:n]
+        return [(self.termes[i], int(self.occurrences[i]), int(self.df[i])) for i in ids.tolist()]
@@ -0,0 +1,52 @@
+#### BENCHMARK : DEBIT DE L'ANALYSEUR DE TEXTE ####
+# lancer depuis v3 : python benchmarks/bench_analyzer.py [articles.pkl] [nb_repetitions]
+import os
+import pickle
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Class.analyzer import ANALYSEUR_FR, STOP_WORDS_FR
+
+
+def nettoyer_texte_reference(texte):
+    """Version historique de Source.nettoyer_texte (liste de stop words, regex non compilées)."""
+    stop_words_fr = list(STOP_WORDS_FR)
+    texte = texte.lower()
+    texte = texte.replace("\n", " ")
+    texte = re.sub(r'[^\w\s]', '', texte)
+    texte = re.sub(r'\d+', '', texte)
+    texte = texte.encode("ascii", "ignore").decode("utf-8")
+    return " ".join([mot for mot in texte.split() if mot not in stop_words_fr])
+
+
+def mesurer(fonction, textes, repetitions):
+    """
+    Mesure le débit d'une fonction de nettoyage.
+
+    :return: Débit en Mo/s de texte source (UTF-8).
+    """
+    taille = sum(len(t.encode("utf-8")) for t in textes) * repetitions
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        for texte in textes:
+            fonction(texte)
+    duree = time.perf_counter() - debut
+    return taille / duree / 1e6
+
+
+if __name__ == "__main__":
+    chemin = sys.argv[1] if len(sys.argv) > 1 else "articles.pkl"
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    with open(chemin, "rb") as f:
+        articles = pickle.load(f)
+    textes = [t for t in articles["full_content"] if isinstance(t, str)]
+    print(f"{len(textes)} articles, {sum(len(t.encode('utf-8')) for t in textes) / 1e6:.2f} Mo")
+
+    print(f"Référence (nettoyer_texte historique) : {mesurer(nettoyer_texte_reference, textes, repetitions):6.2f} Mo/s")
+    print(f"Analyzer.analyser                      : {mesurer(ANALYSEUR_FR.analyser, textes, repetitions):6.2f} Mo/s")
+    print(f"Analyzer.tokens                        : {mesurer(ANALYSEUR_FR.tokens, textes, repetitions):6.2f} Mo/s")
+    print(f"Analyzer.positions                     : {mesurer(ANALYSEUR_FR.positions, textes, repetitions):6.2f} Mo/s")
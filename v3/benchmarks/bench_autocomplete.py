@@ -0,0 +1,67 @@
+#### BENCHMARK : LATENCE DES SUGGESTIONS DE RECHERCHE AU FIL DE LA SAISIE ####
+# lancer depuis v3 : python benchmarks/bench_autocomplete.py [articles.pkl] [nb_requetes]
+# Chaque requête est tapée caractère par caractère : une suggestion est demandée à chaque frappe.
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from fonctions.f_ingest import articles_pickle, ingest
+
+
+def suggestions_reference(moteur, prefix, n=5):
+    """Parcours complet du vocabulaire à chaque frappe (dernier mot seulement), trié par occurrences."""
+    debut = moteur.analyseur.normaliser(prefix.split()[-1]).replace(" ", "") if prefix.split() else ""
+    vocab = moteur.vocab
+    candidats = [(mot, int(vocab.occurrences[i])) for i, mot in enumerate(vocab.termes)
+                 if mot.startswith(debut) and vocab.occurrences[i] > 0]
+    return sorted(candidats, key=lambda c: -c[1])[:n]
+
+
+def frappes(requetes):
+    """Tous les débuts de chaque requête, dans l'ordre de la saisie."""
+    return [requete[:i] for requete in requetes for i in range(1, len(requete) + 1)]
+
+
+def mesurer(fonction, prefixes):
+    """
+    Mesure la latence d'une fonction de suggestion.
+
+    :return: Tuple (moyenne, médiane, 99e centile) en microsecondes.
+    """
+    durees = np.empty(len(prefixes))
+    for i, prefix in enumerate(prefixes):
+        debut = time.perf_counter()
+        fonction(prefix)
+        durees[i] = time.perf_counter() - debut
+    durees *= 1e6
+    return durees.mean(), np.median(durees), np.percentile(durees, 99)
+
+
+if __name__ == "__main__":
+    chemin = sys.argv[1] if len(sys.argv) > 1 else "articles.pkl"
+    nb_requetes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    moteur = ingest(articles_pickle(chemin))
+    print(f"{moteur.nb_documents_actifs()} documents, {moteur.vocab.nb_termes_presents()} termes")
+
+    # Requêtes tirées des titres (2 ou 3 premiers mots) et des termes du vocabulaire
+    random.seed(0)
+    titres = [doc.titre for doc in moteur.documents if isinstance(doc.titre, str)]
+    requetes = [" ".join(titre.split()[:random.choice((2, 3))]) for titre in random.choices(titres, k=nb_requetes // 2)]
+    requetes += random.choices([mot for mot, _, _ in moteur.vocab.top(500)], k=nb_requetes - len(requetes))
+    prefixes = frappes(requetes)
+
+    debut = time.perf_counter()
+    moteur.autocomplete("a")
+    print(f"Construction du trie de complétion : {(time.perf_counter() - debut) * 1e3:.1f} ms")
+    print(f"{len(requetes)} requêtes, {len(prefixes)} frappes")
+
+    for nom, fonction in [("Parcours du vocabulaire", lambda p: suggestions_reference(moteur, p)),
+                          ("SearchEngine.autocomplete", moteur.autocomplete)]:
+        moyenne, mediane, centile = mesurer(fonction, prefixes)
+        print(f"{nom:26s} : moyenne {moyenne:8.1f} µs, médiane {mediane:8.1f} µs, 99e centile {centile:8.1f} µs")
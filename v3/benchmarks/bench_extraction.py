@@ -0,0 +1,88 @@
+#### BENCHMARK : DEBIT DE L'EXTRACTION DU TEXTE DES PAGES HTML ####
+# lancer depuis v3 : python benchmarks/bench_extraction.py [dossier_de_pages_html] [nb_repetitions]
+# Sans dossier, des pages d'actualité sont synthétisées à partir des articles de articles.pkl.
+import glob
+import html
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Class.html_extractor import EXTRACTEURS, decoder_html
+
+# Gabarit d'une page d'actualité : en-tête, scripts, menus, article et pied de page
+GABARIT = """<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>{titre}</title>
+<style>body {{ font-family: sans-serif; }} p.intro::before {{ content: "<p>"; }}</style>
+<script>window.dataLayer = []; var html = "<p>pas du texte</p>"; {script}</script>
+</head><body>
+<nav><ul>{menu}</ul></nav>
+<header><h1>{titre}</h1><p class="intro">{description}</p></header>
+<article><div class="contenu">{paragraphes}</div>
+<aside><script type="application/ld+json">{{"@type": "NewsArticle", "headline": "{titre}"}}</script></aside>
+</article>
+<footer><p>&copy; Journal &mdash; tous droits réservés</p>{script_fin}</footer>
+</body></html>"""
+
+
+def synthetiser_pages(chemin="articles.pkl"):
+    """
+    Construit une page HTML par article de chemin, avec le balisage parasite d'un site d'actualité.
+
+    :return: Liste de pages (bytes).
+    """
+    with open(chemin, "rb") as f:
+        articles = pickle.load(f)
+    pages = []
+    for _, article in articles.iterrows():
+        texte = article["full_content"] if isinstance(article["full_content"], str) else ""
+        phrases = [html.escape(p) for p in texte.split(". ") if p]
+        paragraphes = "".join(f"<p>{p}. <a href='#'>lien</a> <em>{i}</em></p>\n" for i, p in enumerate(phrases))
+        pages.append(GABARIT.format(
+            titre=html.escape(str(article["title"])),
+            description=html.escape(str(article["description"])),
+            script="function f(a) { return a < 2 && a > 0; }\n" * 200,
+            menu="".join(f"<li><a href='/rubrique/{i}'>Rubrique {i}</a></li>" for i in range(40)),
+            paragraphes=paragraphes,
+            script_fin="<script>" + "track('vue');\n" * 100 + "</script>",
+        ).encode("utf-8"))
+    return pages
+
+
+def charger_pages(dossier):
+    """Lit les pages HTML enregistrées dans un dossier (*.html, *.htm)."""
+    pages = []
+    for chemin in sorted(glob.glob(os.path.join(dossier, "*.htm*"))):
+        with open(chemin, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+def mesurer(extracteur, pages, repetitions):
+    """
+    Mesure le débit d'un extracteur.
+
+    :return: Tuple (débit en Mo/s de HTML, durée moyenne par page en ms).
+    """
+    taille = sum(len(p) for p in pages) * repetitions
+    textes = [decoder_html(p) for p in pages]
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        for texte in textes:
+            extracteur(texte)
+    duree = time.perf_counter() - debut
+    return taille / duree / 1e6, duree / (len(pages) * repetitions) * 1e3
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    pages = charger_pages(sys.argv[1]) if len(sys.argv) > 1 else synthetiser_pages()
+    print(f"{len(pages)} pages, {sum(len(p) for p in pages) / 1e6:.2f} Mo de HTML")
+
+    reference = [EXTRACTEURS["bs4"](decoder_html(p)) for p in pages]
+    for nom, extracteur in EXTRACTEURS.items():
+        debit, par_page = mesurer(extracteur, pages, repetitions)
+        identiques = sum(extracteur(decoder_html(p)) == r for p, r in zip(pages, reference))
+        print(f"{nom:12s} : {debit:6.2f} Mo/s, {par_page:6.2f} ms/page, {identiques}/{len(pages)} textes identiques à bs4")
@@ -0,0 +1,62 @@
+#### BENCHMARK : LATENCE DES RECHERCHES PAR BACKEND ####
+# lancer depuis v3 : python benchmarks/bench_search.py [nb_documents] [nb_requetes]
+# Corpus synthétique (fréquences des mots selon une loi de Zipf), requêtes de 1 à 3 termes ;
+# le cache des classements est vidé avant chaque requête.
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Class.Document import Document
+from Class.search_engine import SearchEngine
+
+
+def corpus_synthetique(nb_documents, nb_mots=20000, longueur=200, graine=0):
+    """Documents dont les mots sont tirés selon une loi de Zipf sur un vocabulaire de nb_mots mots."""
+    generateur = np.random.default_rng(graine)
+    mots = np.array(["".join(chr(97 + (i // 26 ** p) % 26) for p in range(4)) + "mot" for i in range(nb_mots)])
+    rangs = np.minimum(generateur.zipf(1.2, (nb_documents, longueur)), nb_mots) - 1
+    return [Document("Synthétique", "Auteur", f"Document {i}", "", f"https://exemple.fr/{i}", "",
+                     "2024-01-01T00:00:00Z", "", " ".join(mots[ligne])) for i, ligne in enumerate(rangs)]
+
+
+def mesurer(moteur, requetes, nb_doc, **options):
+    """
+    Mesure la latence de SearchEngine.search, sans cache des classements.
+
+    :return: Tuple (moyenne, médiane, 99e centile) en millisecondes.
+    """
+    durees = np.empty(len(requetes))
+    for i, requete in enumerate(requetes):
+        moteur._resultats.clear()
+        debut = time.perf_counter()
+        moteur.search(requete, nb_doc, **options)
+        durees[i] = time.perf_counter() - debut
+    durees *= 1e3
+    return durees.mean(), np.median(durees), np.percentile(durees, 99)
+
+
+if __name__ == "__main__":
+    nb_documents = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    nb_requetes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    debut = time.perf_counter()
+    moteur = SearchEngine({})
+    moteur.add_documents(corpus_synthetique(nb_documents))
+    print(f"{nb_documents} documents, {len(moteur.vocab)} termes, "
+          f"indexés en {time.perf_counter() - debut:.1f} s")
+
+    # Requêtes tirées parmi les 2000 termes les plus fréquents
+    generateur = np.random.default_rng(1)
+    termes = [mot for mot, _, _ in moteur.vocab.top(2000)]
+    requetes = [" ".join(generateur.choice(termes, generateur.integers(1, 4), replace=False))
+                for _ in range(nb_requetes)]
+
+    for backend in ("matrix", "taat", "daat"):
+        for ranker in ("cosine", "bm25"):
+            moyenne, mediane, centile = mesurer(moteur, requetes, 10, backend=backend, ranker=ranker, total=False)
+            print(f"{backend:6s} {ranker:6s} : moyenne {moyenne:6.2f} ms, médiane {mediane:6.2f} ms, "
+                  f"99e centile {centile:6.2f} ms")
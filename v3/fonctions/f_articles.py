@@ -1,17 +1,176 @@
 #### CLASS IMPORTER ####
+import random
+import threading
+import time
+from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+
 import requests
-from bs4 import BeautifulSoup
+
+#### CLASS LOCAL ####
+from Class.html_extractor import EXTRACTEURS, EXTRACTEUR_PAR_DEFAUT, decoder_html
+from Class.http_session import creer_session
+
+# Délais (connexion, lecture) en secondes pour chaque requête
+TIMEOUT = (5, 15)
+# Nombre maximal de téléchargements simultanés, au total et par site
+MAX_WORKERS = 16
+MAX_PAR_HOTE = 4
+# Nombre de tentatives par URL et délai de base de l'attente exponentielle (secondes)
+NB_ESSAIS = 3
+DELAI_BASE = 0.5
+
+# Statuts HTTP pour lesquels une nouvelle tentative a du sens
+STATUTS_TEMPORAIRES = {429, 500, 502, 503, 504}
+
+# Marque la fin de l'itérable d'URL (une URL peut valoir None, par exemple "url": null dans NewsAPI)
+_FIN = object()
+
+_session_partagee = None
+_verrou_session = threading.Lock()
+
+
+def session_partagee():
+    """Retourne la session HTTP partagée par tous les téléchargements du processus."""
+    global _session_partagee
+    with _verrou_session:
+        if _session_partagee is None:
+            _session_partagee = creer_session()
+        return _session_partagee
+
+
+def telecharger(url, session=None, timeout=TIMEOUT, nb_essais=NB_ESSAIS, entetes=None):
+    """
+    Télécharge une URL avec délai maximal et nouvelles tentatives (attente exponentielle avec gigue)
+    en cas d'erreur réseau ou de statut HTTP temporaire.
+
+    :param url: URL à télécharger.
+    :param session: Session HTTP (par défaut : session partagée).
+    :param timeout: Délais (connexion, lecture) en secondes.
+    :param nb_essais: Nombre maximal de tentatives.
+    :param entetes: En-têtes HTTP supplémentaires (requêtes conditionnelles).
+    :return: requests.Response (dernière réponse obtenue).
+    :raises requests.RequestException: si toutes les tentatives échouent sur une erreur réseau.
+    """
+    session = session or session_partagee()
+    for essai in range(nb_essais):
+        try:
+            response = session.get(url, timeout=timeout, headers=entetes)
+            if response.status_code not in STATUTS_TEMPORAIRES or essai == nb_essais - 1:
+                return response
+        except (requests.ConnectionError, requests.Timeout):
+            if essai == nb_essais - 1:
+                raise
+        time.sleep(DELAI_BASE * 2 ** essai * (1 + random.random()))
+
+
+def extraire_paragraphes(html, extracteur=None):
+    """
+    Extrait le texte des paragraphes <p> d'une page HTML.
+
+    :param html: Contenu HTML (str).
+    :param extracteur: Nom d'un extracteur de Class.html_extractor.EXTRACTEURS ("lxml", "html_parser", "bs4")
+                       ou fonction str -> str (par défaut : html_parser).
+    :return: Texte des paragraphes séparés par des espaces.
+    """
+    if not callable(extracteur):
+        extracteur = EXTRACTEURS[extracteur or EXTRACTEUR_PAR_DEFAUT]
+    return extracteur(html)
+
+
+def texte_reponse(response):
+    """
+    Retourne le HTML d'une réponse, décodé avec l'encodage déclaré par le serveur ou la page
+    (et non ISO-8859-1 par défaut comme response.text).
+    """
+    declare = "charset" in response.headers.get("Content-Type", "").lower()
+    return decoder_html(response.content, response.encoding if declare else None)
+
 
 # Fonction pour récupérer le contenu complet d'un article via son URL
-def get_full_content(url):
+# Si un cache (Class.http_cache.ContentCache) est fourni, une entrée fraîche est servie sans requête
+# et une entrée expirée est revalidée par une requête conditionnelle
+def get_full_content(url, session=None, timeout=TIMEOUT, nb_essais=NB_ESSAIS, cache=None, extracteur=None):
     try:
-        response = requests.get(url)
+        entree = cache.get(url) if cache is not None else None
+        if entree and entree["frais"]:
+            return entree["contenu"]
+        entetes = cache.entetes_conditionnels(entree) if cache is not None else None
+        response = telecharger(url, session, timeout, nb_essais, entetes)
+        if response.status_code == 304 and entree:
+            cache.touch(url)
+            return entree["contenu"]
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            paragraphs = soup.find_all('p')
-            full_content = " ".join([p.get_text() for p in paragraphs])
-            return full_content
+            contenu = extraire_paragraphes(texte_reponse(response), extracteur)
+            if cache is not None:
+                cache.put(url, contenu, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return contenu
         else:
             return "Impossible de récupérer le contenu. Erreur HTTP."
     except Exception as e:
-        return f"Erreur lors de la récupération du contenu : {e}"
\ No newline at end of file
+        return f"Erreur lors de la récupération du contenu : {e}"
+
+
+def get_full_contents(urls, max_workers=MAX_WORKERS, max_par_hote=MAX_PAR_HOTE,
+                      timeout=TIMEOUT, nb_essais=NB_ESSAIS, session=None, cache=None,
+                      extracteur=None):
+    """
+    Récupère le contenu complet de plusieurs articles en parallèle.
+    Les URL sont lues au fur et à mesure (l'itérable peut être un générateur) et les résultats
+    sont produits dès qu'ils sont disponibles, dans l'ordre d'arrivée. Au plus max_workers
+    téléchargements sont en cours, dont au plus max_par_hote vers un même site : un site lent
+    ne bloque que ses propres articles.
+
+    :param urls: Itérable d'URL.
+    :param max_workers: Nombre maximal de téléchargements simultanés.
+    :param max_par_hote: Nombre maximal de téléchargements simultanés vers un même site.
+    :param timeout: Délais (connexion, lecture) en secondes.
+    :param nb_essais: Nombre maximal de tentatives par URL.
+    :param session: Session HTTP partagée (par défaut : session partagée du processus).
+    :param cache: Cache disque du contenu (ContentCache, optionnel).
+    :param extracteur: Extracteur de texte (voir extraire_paragraphes).
+    :return: Générateur de tuples (url, contenu) ; contenu est un message d'erreur en cas d'échec
+        (ou si l'URL est vide ou None, sans téléchargement).
+    """
+    session = session or session_partagee()
+    urls = iter(urls)
+    en_attente = defaultdict(deque)  # URL en attente, par site
+    nb_en_attente = 0
+    en_cours = {}  # future -> (url, site)
+    par_hote = defaultdict(int)  # téléchargements en cours par site
+    epuise = False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executeur:
+        while True:
+            # Lancer des téléchargements tant que la limite globale le permet
+            while len(en_cours) < max_workers:
+                hote = next((h for h, file in en_attente.items() if file and par_hote[h] < max_par_hote), None)
+                if hote is None:
+                    # Aucun site disponible : lire une URL de plus, dans la limite d'un tampon borné
+                    if epuise or nb_en_attente >= 4 * max_workers:
+                        break
+                    url = next(urls, _FIN)
+                    if url is _FIN:
+                        epuise = True
+                        break
+                    if not url:
+                        yield url, "URL non disponible."
+                        continue
+                    en_attente[urlsplit(url).netloc].append(url)
+                    nb_en_attente += 1
+                    continue
+                url = en_attente[hote].popleft()
+                nb_en_attente -= 1
+                par_hote[hote] += 1
+                en_cours[executeur.submit(get_full_content, url, session, timeout, nb_essais, cache, extracteur)] = (url, hote)
+
+            if not en_cours:
+                return
+
+            # Produire les résultats dès qu'ils arrivent
+            termines, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+            for future in termines:
+                url, hote = en_cours.pop(future)
+                par_hote[hote] -= 1
+                yield url, future.result()
@@ -0,0 +1,86 @@
+#### GENERATIONS DE L'INDEX SUR DISQUE ####
+# Un répertoire d'index contient une génération par enregistrement (gen-000001, gen-000002, ...)
+# et un fichier CURRENT qui désigne la génération active. Une nouvelle génération est entièrement
+# écrite avant que CURRENT ne soit remplacé (os.replace, atomique) : un lecteur voit toujours
+# soit l'ancienne génération complète, soit la nouvelle.
+import os
+import re
+import shutil
+
+#### CLASS LOCAL ####
+from Class.search_engine import SearchEngine
+
+FICHIER_COURANT = "CURRENT"
+_MOTIF_GENERATION = re.compile(r"^gen-(\d+)$")
+
+
+def generations(racine):
+    """
+    Liste les générations présentes dans un répertoire d'index.
+
+    :param racine: Répertoire de l'index.
+    :return: Liste des noms de générations, de la plus ancienne à la plus récente.
+    """
+    if not os.path.isdir(racine):
+        return []
+    noms = [nom for nom in os.listdir(racine) if _MOTIF_GENERATION.match(nom)]
+    return sorted(noms, key=lambda nom: int(_MOTIF_GENERATION.match(nom).group(1)))
+
+
+def generation_courante(racine):
+    """
+    Retourne la génération active d'un répertoire d'index.
+
+    :param racine: Répertoire de l'index.
+    :return: Nom de la génération (str) ou None si aucune n'a été publiée.
+    """
+    try:
+        with open(os.path.join(racine, FICHIER_COURANT), encoding="utf-8") as f:
+            nom = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return nom if os.path.isdir(os.path.join(racine, nom)) else None
+
+
+def charger_index(racine, generation=None, mmap=True):
+    """
+    Charge une génération de l'index (par défaut : la génération active).
+
+    :param racine: Répertoire de l'index.
+    :param generation: Nom de la génération à charger.
+    :param mmap: Projeter les tableaux en mémoire (voir SearchEngine.load).
+    :return: SearchEngine, ou None si aucune génération n'a été publiée.
+    """
+    generation = generation or generation_courante(racine)
+    if generation is None:
+        return None
+    return SearchEngine.load(os.path.join(racine, generation), mmap=mmap)
+
+
+def publier_index(moteur, racine, conserver=2):
+    """
+    Enregistre le moteur dans une nouvelle génération puis la rend active.
+    Les générations les plus anciennes sont supprimées (les conserver dernières sont gardées,
+    car des processus peuvent encore lire la précédente).
+
+    :param moteur: SearchEngine à enregistrer.
+    :param racine: Répertoire de l'index.
+    :param conserver: Nombre de générations conservées, dont la nouvelle.
+    :return: Nom de la nouvelle génération.
+    """
+    os.makedirs(racine, exist_ok=True)
+    existantes = generations(racine)
+    numero = int(_MOTIF_GENERATION.match(existantes[-1]).group(1)) + 1 if existantes else 1
+    nom = f"gen-{numero:06d}"
+    moteur.save(os.path.join(racine, nom))
+
+    # Bascule atomique de la génération active
+    temporaire = os.path.join(racine, FICHIER_COURANT + ".tmp")
+    with open(temporaire, "w", encoding="utf-8") as f:
+        f.write(nom)
+    os.replace(temporaire, os.path.join(racine, FICHIER_COURANT))
+
+    for ancienne in generations(racine)[:-conserver]:
+        # Sous Windows, une génération encore projetée en mémoire ne peut pas être supprimée : elle le sera plus tard
+        shutil.rmtree(os.path.join(racine, ancienne), ignore_errors=True)
+    return nom
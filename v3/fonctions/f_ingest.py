@@ -0,0 +1,207 @@
+#### PIPELINE D'INGESTION : COLLECTE -> CONTENU -> DOCUMENT -> SOURCE -> INDEX ####
+# Chaque étape est un générateur qui consomme la précédente : les articles circulent un par un,
+# la mémoire utilisée est bornée par la taille des lots et le nombre de téléchargements en cours,
+# et une étape lente ralentit naturellement les étapes en amont.
+#
+# lancer depuis v3 : python -m fonctions.f_ingest --themes "intelligence artificielle" --index index
+import argparse
+import os
+import pickle
+from collections import deque
+from itertools import islice
+
+#### CLASS LOCAL ####
+from Class.DocumentFactory import DocumentFactory
+from Class.search_engine import SearchEngine
+
+#### FONCTION LOCAL ####
+from fonctions.f_articles import get_full_contents, MAX_WORKERS
+
+# Nombre de documents indexés par segment
+TAILLE_LOT = 256
+
+
+def articles_newsapi(client, themes, fenetres=None, page_size=100, max_pages=None):
+    """
+    Étape 1 (collecte) : articles de NewsAPI, au fil de la pagination.
+
+    :param client: NewsAPIClient.
+    :param themes: Thème ou liste de thèmes.
+    :param fenetres: Fenêtres de dates (voir Class.classNewsApi.date_windows).
+    :return: Générateur d'articles (dictionnaires de l'API).
+    """
+    return client.harvest(themes, fenetres, page_size=page_size, max_pages=max_pages)
+
+
+def articles_pickle(chemin="articles.pkl"):
+    """
+    Étape 1 (collecte) : articles d'un fichier articles.pkl existant (DataFrame pandas).
+
+    :param chemin: Chemin du fichier pickle.
+    :return: Générateur d'articles (dictionnaires).
+    """
+    with open(chemin, "rb") as f:
+        articles = pickle.load(f)
+    # to_dict("records") évite la construction d'une Series par ligne de iterrows()
+    yield from articles.to_dict("records")
+
+
+def nouveaux(articles, moteur):
+    """
+    Écarte les articles dont l'URL est déjà indexée (ou déjà vue dans le flux), avant tout téléchargement.
+
+    :param articles: Itérable d'articles (dictionnaires).
+    :param moteur: SearchEngine alimenté par le pipeline.
+    :return: Générateur d'articles.
+    """
+    # Colonne des URL du magasin : aucun Document n'est construit
+    urls_vues = {url for url, supprime in zip(moteur.documents.colonnes["url"], moteur.supprimes.tolist())
+                 if not supprime}
+    for article in articles:
+        url = article.get('url')
+        if url:
+            if url in urls_vues:
+                continue
+            urls_vues.add(url)
+        yield article
+
+
+def avec_contenu(articles, cache=None, max_workers=MAX_WORKERS, **options):
+    """
+    Étape 2 (téléchargement et extraction) : complète chaque article par le texte de sa page.
+    Les articles qui ont déjà un contenu complet (même vide) passent sans téléchargement ; les autres
+    sont produits dès que leur page est extraite (l'ordre d'entrée n'est pas conservé).
+
+    :param articles: Itérable d'articles (dictionnaires).
+    :param cache: Cache disque du contenu (ContentCache, optionnel).
+    :param max_workers: Nombre maximal de téléchargements simultanés.
+    :param options: Options transmises à get_full_contents (max_par_hote, timeout, extracteur...).
+    :return: Générateur d'articles avec la clé 'full_content'.
+    """
+    articles = iter(articles)
+    en_attente = {}  # url -> articles en attente de ce contenu
+    prets = deque()  # articles sans téléchargement, produits entre deux pages
+    epuise = False
+
+    def urls():
+        nonlocal epuise
+        for article in articles:
+            url = article.get('url')
+            contenu = article.get('full_content')
+            if isinstance(contenu, str) or not url:
+                if not isinstance(contenu, str):
+                    article['full_content'] = "URL non disponible."
+                prets.append(article)
+                # Rendre la main pour vider prets : get_full_contents termine ses téléchargements en cours
+                if len(prets) >= max_workers:
+                    return
+            elif url in en_attente:
+                en_attente[url].append(article)
+            else:
+                en_attente[url] = [article]
+                yield url
+        epuise = True
+
+    while not epuise:
+        for url, contenu in get_full_contents(urls(), max_workers=max_workers, cache=cache, **options):
+            while prets:
+                yield prets.popleft()
+            for article in en_attente.pop(url):
+                article['full_content'] = contenu
+                yield article
+        while prets:
+            yield prets.popleft()
+
+
+def en_documents(articles):
+    """
+    Étape 3 : construit un Document par article.
+
+    :param articles: Itérable d'articles (dictionnaires).
+    :return: Générateur de Document.
+    """
+    for article in articles:
+        yield DocumentFactory.create_document(article)
+
+
+def indexer(documents, moteur, taille_lot=TAILLE_LOT):
+    """
+    Étapes 4 et 5 : range les documents dans leur Source et les indexe, par lots
+    (SearchEngine.add_documents crée un segment par lot et range chaque document dans sa source).
+
+    :param documents: Itérable de Document.
+    :param moteur: SearchEngine à alimenter.
+    :param taille_lot: Nombre de documents par segment.
+    :return: Générateur de tuples (doc_id, Document), au fil de l'indexation.
+    """
+    documents = iter(documents)
+    while True:
+        lot = list(islice(documents, taille_lot))
+        if not lot:
+            return
+        yield from zip(moteur.add_documents(lot), lot)
+
+
+def pipeline(articles, moteur, cache=None, taille_lot=TAILLE_LOT, **options):
+    """
+    Enchaîne les étapes de l'ingestion à partir d'un flux d'articles.
+    Les articles déjà présents dans l'index (même URL) sont ignorés.
+
+    :param articles: Itérable d'articles (voir articles_newsapi, articles_pickle).
+    :param moteur: SearchEngine à alimenter (SearchEngine({}) pour un nouvel index).
+    :param cache: Cache disque du contenu (ContentCache, optionnel).
+    :param taille_lot: Nombre de documents par segment.
+    :param options: Options de téléchargement (voir avec_contenu).
+    :return: Générateur de tuples (doc_id, Document), pour suivre l'avancement.
+    """
+    articles = nouveaux(articles, moteur)
+    return indexer(en_documents(avec_contenu(articles, cache, **options)), moteur, taille_lot)
+
+
+def ingest(articles, moteur=None, cache=None, taille_lot=TAILLE_LOT, **options):
+    """
+    Ingère un flux d'articles jusqu'au bout.
+
+    :param articles: Itérable d'articles.
+    :param moteur: SearchEngine à alimenter (par défaut : nouvel index vide).
+    :return: Le SearchEngine alimenté.
+    """
+    moteur = moteur if moteur is not None else SearchEngine({})
+    for _ in pipeline(articles, moteur, cache, taille_lot, **options):
+        pass
+    return moteur
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from Class.classNewsApi import NewsAPIClient, date_windows
+    from Class.http_cache import ContentCache
+    from fonctions.f_index import charger_index, publier_index
+
+    parser = argparse.ArgumentParser(description="Ingestion d'articles dans l'index du moteur de recherche.")
+    parser.add_argument("--themes", nargs="+", default=["intelligence artificielle"])
+    parser.add_argument("--depuis", help="Date de début (YYYY-MM-DD), découpée en fenêtres de --jours jours")
+    parser.add_argument("--jusqua", help="Date de fin incluse (YYYY-MM-DD)")
+    parser.add_argument("--jours", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--pickle", help="Ingérer un fichier articles.pkl au lieu d'interroger NewsAPI")
+    parser.add_argument("--index", default="index",
+                        help="Répertoire de l'index : la génération active est complétée et publiée comme nouvelle génération")
+    parser.add_argument("--cache", default="cache_http.sqlite")
+    args = parser.parse_args()
+
+    if args.pickle:
+        flux = articles_pickle(args.pickle)
+    else:
+        load_dotenv()
+        fenetres = date_windows(args.depuis, args.jusqua, args.jours) if args.depuis and args.jusqua else None
+        flux = articles_newsapi(NewsAPIClient(os.getenv("NEWSAPI_KEY")), args.themes, fenetres,
+                                max_pages=args.max_pages)
+
+    moteur = charger_index(args.index) or SearchEngine({})
+    nb = 0
+    for nb, (doc_id, document) in enumerate(pipeline(flux, moteur, ContentCache(args.cache)), start=1):
+        if nb % 100 == 0:
+            print(f"{nb} documents indexés")
+    generation = publier_index(moteur, args.index)
+    print(f"{nb} documents indexés, {moteur.nb_documents_actifs()} dans l'index '{args.index}' ({generation})")
@@ -1,18 +1,15 @@
 #### CLASS LOCAL ####
 import Class.classNewsApi as news
-import Class.Document as doc
-import Class.Source as source
-import Class.DocumentFactory as DF
-from Class.search_engine import SearchEngine
+from Class.http_cache import ContentCache
+from Class.query_parser import est_booleenne
 
 #### FONCTION LOCAL ####
-from fonctions.f_articles import get_full_content
+from fonctions.f_ingest import articles_newsapi, articles_pickle, ingest
+from fonctions.f_index import charger_index, generation_courante, publier_index
 #### CLASS IMPORTER ####
 from dotenv import load_dotenv
 import os
 
-import pickle
-import pandas as pd
 import streamlit as st
 import numpy as np
 
@@ -24,82 +21,52 @@ import numpy as np
 # Charger les variables d'environnement depuis le fichier .env
 load_dotenv()
 
-#  si articles.pkl n'existe pas 
-if not os.path.exists("articles.pkl"):
-    # Récupérer la clé API depuis les variables d'environnement
-    api_key = os.getenv("NEWSAPI_KEY")
+# Cache disque du contenu des articles (revalidé par requêtes conditionnelles)
+CACHE_HTTP = "cache_http.sqlite"
 
-    # Créer une instance de la classe NewsAPIClient
-    news_client = news.NewsAPIClient(api_key)
+# Répertoire de l'index persistant : une génération par publication et un fichier CURRENT
+# désignant la génération active (voir fonctions/f_index.py)
+INDEX_DIR = "index"
 
-    # Rechercher d'articles sur le thème "intelligence artificielle"
-    articles = news_client.search_news("intelligence artificielle", page_size=100)
 
-## 1.1 RECUPERATION DU CONTENU COMPLET DES ARTICLES ##
-    # Ajouter le contenu complet à chaque article
-    for article in articles:
-        url = article.get('url')
-        if url:
-            article['full_content'] = get_full_content(url)
-        else:
-            article['full_content'] = "URL non disponible."
+# Le moteur est une ressource partagée par toutes les sessions et toutes les réexécutions du script :
+# il n'est chargé qu'une fois par génération de l'index. Quand une nouvelle génération est publiée
+# (par exemple par python -m fonctions.f_ingest), la réexécution suivante la charge entièrement,
+# puis l'utilise à la place de l'ancienne, libérée du cache.
+@st.cache_resource(max_entries=1, show_spinner="Chargement de l'index...")
+def charger_moteur(generation):
+    return charger_index(INDEX_DIR, generation)
 
-## 1.2 SAUVEGARDE DES ARTICLES ##
 
-    # créer un DataFrame à partir de la liste d'articles
-    dfArticles = pd.DataFrame(articles)
-
-    # Enregistrer les articles dans un fichier pickle
-    ## Save 
-    with open("articles.pkl", "wb") as f:
-        pickle.dump(dfArticles, f)
-
-## 1.3 CHARGEMENT DES ARTICLES ##
-
-# Charger les articles depuis le fichier pickle
-with open("articles.pkl", "rb") as f:
-    articlesPickel = pickle.load(f)
-
-##### 2 . CREATION DE DOCUMENTS et de SOURCE  #####
-
-# Créer une collection de documents à partir des articles
-CollectionWithID = {}
-
-# Créer une collection de Sources à partir des articles
-SourceWithName = {}
+# Construction de l'index au premier lancement, une seule fois par processus
+@st.cache_resource(show_spinner="Construction de l'index...")
+def construire_index():
+    # Construire l'index en flux : collecte -> contenu complet -> Document -> Source -> index
+    # (voir fonctions/f_ingest.py, utilisable aussi en ligne de commande)
+    if os.path.exists("articles.pkl"):
+        # Articles déjà récupérés : leur contenu complet n'est pas retéléchargé
+        flux = articles_pickle("articles.pkl")
+    else:
+        # Récupérer la clé API depuis les variables d'environnement
+        api_key = os.getenv("NEWSAPI_KEY")
 
-for index, row in articlesPickel.iterrows():
-    # Créer un objet Document
-    document = DF.DocumentFactory.create_document(row)
-    # Ajouter le document à la collection
-    CollectionWithID[index] = document
+        # Créer une instance de la classe NewsAPIClient
+        news_client = news.NewsAPIClient(api_key)
 
-    # Gérer les sources
-    source_name = row['source']['name'] if isinstance(row['source'], dict) else "Source inconnue"
+        # Rechercher les articles sur le thème "intelligence artificielle"
+        flux = articles_newsapi(news_client, "intelligence artificielle")
 
-    # Vérifier si la source existe déjà dans SourceWithID
-    if source_name not in SourceWithName:
-        # Créer une nouvelle Source si elle n'existe pas
-        SourceWithName[source_name] = source.Source(source_name)
-    
-    # Ajouter le document à la production de la source
-    SourceWithName[source_name].add(document, index)
+    # Publier l'index comme première génération
+    return publier_index(ingest(flux, cache=ContentCache(CACHE_HTTP)), INDEX_DIR)
 
-# Sauvegarder SourceWithName 
-with open("sources.pkl", "wb") as f:
-    pickle.dump(SourceWithName, f)
 
-# supprimer les variables inutiles
-del SourceWithName
-# Charger SourceWithName
-with open("sources.pkl", "rb") as f:
-    SourceWithName = pickle.load(f)
+# Seule la lecture du fichier CURRENT a lieu à chaque réexécution
+generation = generation_courante(INDEX_DIR) or construire_index()
+search_engine = charger_moteur(generation)
 
 ## AFFICHAGE AVEC STREAMLIT ##
 # lancer streamlit run .\main.py
 
-search_engine = SearchEngine(SourceWithName)
-
 # Titre de l'application
 st.title("Moteur de recherche sur l'intelligence artificielle")
 
@@ -108,11 +75,27 @@ st.title("Moteur de recherche sur l'intelligence artificielle")
 st.sidebar.title("STATISTIQUES")
 
 st.sidebar.subheader("Statistiques globales")
-st.sidebar.markdown(f"**Total de documents** : {len(search_engine.documents)}")
-st.sidebar.markdown(f"**Taille du vocabulaire** : {len(search_engine.vocab)}")
+st.sidebar.markdown(f"**Total de documents** : {search_engine.nb_documents_actifs()}")
+st.sidebar.markdown(f"**Taille du vocabulaire** : {search_engine.vocab.nb_termes_presents()}")
+
+
+
+# Une suggestion choisie complète le dernier mot de la requête saisie (avant la réexécution du script)
+def choisir_suggestion():
+    st.session_state.requete = search_engine.apply_suggestion(st.session_state.requete, st.session_state.suggestion)
+    st.session_state.suggestion = None
+
 
 # Saisie des mots-clés par l'utilisateur
-query = st.text_input("Entrez les mots-clés à rechercher :", "")
+query = st.text_input("Entrez les mots-clés à rechercher :", "", key="requete")
+
+# Suggestions de complétion du texte saisi (termes fréquents et n-grammes des titres),
+# sauf pour une requête booléenne, une expression exacte ou une recherche de proximité
+if query and not est_booleenne(query) and '"' not in query and "NEAR" not in query:
+    suggestions = [s for s, _ in search_engine.autocomplete(query, 5)
+                   if s != " ".join(search_engine.analyseur.tokens(query))]
+    if suggestions:
+        st.pills("Suggestions :", suggestions, key="suggestion", on_change=choisir_suggestion)
 
 # Vérifier si une requête est saisie
 if query:
@@ -129,7 +112,7 @@ if query:
         format="%d"
     )
     # Afficher les résultats
-    resultats, _ = search_engine.search(query, nb_doc=x)
+    resultats, _ = search_engine.search(query, nb_doc=x, total=False)
     st.subheader(f"Résultats pour : '{query}'")
     if resultats:
         for doc, score in resultats:
@@ -149,14 +132,17 @@ if query:
     if word_stats:
         st.sidebar.markdown(f"- **Occurrences totales** : {word_stats['occurrences']}")
         st.sidebar.markdown(f"- **Documents contenant ce mot** : {word_stats['document_frequency']}")
+        # Motif ou mot corrigé : termes du vocabulaire effectivement comptés
+        if len(word_stats["termes"]) > 1 or word_stats["termes"][0] != search_engine.analyseur.normaliser(query).strip():
+            st.sidebar.markdown(f"- **Termes** : {', '.join(word_stats['termes'])}")
     else:
         st.sidebar.write("Aucune statistique disponible pour ce mot.")
 
     # Top mots fréquents
     st.sidebar.subheader("Top 5 des mots fréquents")
-    top_words = sorted(search_engine.vocab.items(), key=lambda x: x[1]['occurrences'], reverse=True)[:5]
-    for word, info in top_words:
-        st.sidebar.markdown(f"- {word} : {info['occurrences']} occurrences")
+    top_words = search_engine.get_top_words(5)
+    for word, occurrences, _ in top_words:
+        st.sidebar.markdown(f"- {word} : {occurrences} occurrences")
 
 
 
@@ -0,0 +1,103 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from Class.Document import Document
+from Class.search_engine import SearchEngine
+
+# Petit corpus : trois sources, des titres qui partagent des n-grammes, une expression répétée
+CORPUS = [
+    ("Le Monde", "Alice", "Intelligence artificielle et emploi", "L'IA change le travail.",
+     "Une intelligence artificielle transforme l'emploi. Un robot remplace une tâche, "
+     "une intelligence artificielle en invente une autre."),
+    ("Le Monde", "Bob", "Intelligence artificielle générative", "Les modèles génératifs.",
+     "Les modèles de la nouvelle intelligence artificielle générative écrivent du texte et des images."),
+    ("Numerama", "Alice", "Apple intelligence arrive en France", "Apple lance son assistant.",
+     "Apple intelligence arrive sur l'iPhone : Apple promet une intelligence artificielle privée."),
+    ("Numerama", "Carla", "Un robot aspirateur intelligent", "Test du robot.",
+     "Ce robot aspirateur intelligent cartographie la maison. Le robot évite les obstacles."),
+    ("Les Echos", "Bob", "OpenAI lance un nouveau modèle", "OpenAI et ChatGPT.",
+     "OpenAI lance un modèle : ChatGPT gagne en intelligence artificielle et en vitesse."),
+]
+
+
+def document(source, auteur, titre, description, contenu, jour=1):
+    return Document(source, auteur, titre, description, f"https://exemple.fr/{titre.replace(' ', '-')}", "",
+                    f"2024-01-{jour:02d}T00:00:00Z", contenu[:50], contenu)
+
+
+@pytest.fixture
+def documents():
+    return [document(*ligne, jour=i + 1) for i, ligne in enumerate(CORPUS)]
+
+
+@pytest.fixture
+def moteur(documents):
+    moteur = SearchEngine({})
+    moteur.add_documents(documents)
+    return moteur
+
+
+class ServeurLocal:
+    """
+    Serveur HTTP local dans un thread, qui remplace les sites et l'API pendant les tests.
+    Chaque chemin reçoit une suite de réponses (statut, en-têtes, corps) servies dans l'ordre ;
+    la dernière est répétée. Les requêtes reçues sont enregistrées (chemin, en-têtes).
+    """
+
+    def __init__(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.reponses = {}
+        self.requetes = []
+        self.en_cours = 0
+        self.max_en_cours = 0
+        self.delai = 0.0
+        self._verrou = threading.Lock()
+        serveur = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                import time
+                with serveur._verrou:
+                    serveur.requetes.append((self.path, dict(self.headers)))
+                    serveur.en_cours += 1
+                    serveur.max_en_cours = max(serveur.max_en_cours, serveur.en_cours)
+                    suite = serveur.reponses.get(self.path.split("?")[0], [(404, {}, b"")])
+                    statut, entetes, corps = suite.pop(0) if len(suite) > 1 else suite[0]
+                time.sleep(serveur.delai)
+                with serveur._verrou:
+                    serveur.en_cours -= 1
+                corps = corps.encode("utf-8") if isinstance(corps, str) else corps
+                self.send_response(statut)
+                for nom, valeur in entetes.items():
+                    self.send_header(nom, valeur)
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Gestionnaire)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def servir(self, chemin, *reponses):
+        self.reponses[chemin] = list(reponses)
+
+    def fermer(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def serveur():
+    serveur = ServeurLocal()
+    yield serveur
+    serveur.fermer()
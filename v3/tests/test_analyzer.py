@@ -0,0 +1,75 @@
+from Class.analyzer import (ANALYSEUR_FR, Analyzer, STOP_WORDS_FR, minuscules, reparer_encodage, replier_accents,
+                            supprimer_non_ascii, supprimer_ponctuation)
+from Class.Source import Source
+
+
+def test_minuscules_ponctuation_et_chiffres():
+    assert ANALYSEUR_FR.tokens("L'IA change le travail, en 2024 !") == ["lia", "change", "travail"]
+    assert ANALYSEUR_FR.analyser("Robot-aspirateur : 3 tests") == "robotaspirateur tests"
+    assert ANALYSEUR_FR.tokens("") == [] and ANALYSEUR_FR.tokens("42 !") == []
+
+
+def test_stop_words():
+    assert ANALYSEUR_FR.tokens("Le robot et la maison") == ["robot", "maison"]
+    assert ANALYSEUR_FR.tokens("Ce sont les nôtres") == ["notres"]
+    # Sans liste de stop words, tous les mots sont gardés
+    analyseur = Analyzer([minuscules, supprimer_ponctuation], stop_words=None)
+    assert analyseur.tokens("Le robot et la maison") == ["le", "robot", "et", "la", "maison"]
+    assert "le" in STOP_WORDS_FR
+
+
+def test_positions_alignees_sur_tokens():
+    texte = "Le robot, évite (les) obstacles... Le robot !"
+    positions = ANALYSEUR_FR.positions(texte)
+    assert [mot for mot, _, _ in positions] == ANALYSEUR_FR.tokens(texte)
+    # Emplacement du morceau d'origine, sans la ponctuation qui l'entoure
+    assert [texte[debut:fin] for _, debut, fin in positions] == ["robot", "évite", "obstacles", "robot"]
+
+
+def test_positions_blancs_encodage_et_filtres():
+    # L'espace insécable n'est pas un blanc ASCII : "l’été\xa0chaud" forme un seul morceau, deux mots
+    texte = "\tprÃ©senter l’été\xa0chaud ; « 42 » robot_1\r\n"
+    positions = ANALYSEUR_FR.positions(texte)
+    assert [mot for mot, _, _ in positions] == ANALYSEUR_FR.tokens(texte) == ["presenter", "lete", "chaud", "robot_"]
+    assert [texte[debut:fin] for _, debut, fin in positions] == ["prÃ©senter", "l’été\xa0chaud", "l’été\xa0chaud",
+                                                                 "robot_1"]
+    assert ANALYSEUR_FR.positions("") == ANALYSEUR_FR.positions(" \n ") == ANALYSEUR_FR.positions("— ! 42") == []
+
+    # Filtre qui ajoute des sauts de ligne : chaque morceau est normalisé séparément
+    analyseur = Analyzer([minuscules, lambda texte: texte.replace("-", "\n")], stop_words=None)
+    assert analyseur.positions("Robot-aspirateur test") == [("robot", 0, 16), ("aspirateur", 0, 16), ("test", 17, 21)]
+
+
+def test_source_nettoyer_texte():
+    assert Source("Le Monde").nettoyer_texte("Le Robot et LA Maison.") == "robot maison"
+
+
+def test_accents_replies():
+    assert ANALYSEUR_FR.tokens("Été naïve façade ÉCOLE où") == ["naive", "facade", "ecole"]
+    assert ANALYSEUR_FR.tokens("œuvre cœur Æther straße ﬁn") == ["oeuvre", "coeur", "aether", "strasse", "fin"]
+    assert replier_accents("Ça coûte 3 €") == "Ca coute 3 €"
+    # Les stop words passent par les mêmes filtres : "été" devient "ete" et reste ignoré
+    assert "ete" in ANALYSEUR_FR.stop_words and ANALYSEUR_FR.tokens("ete") == []
+
+
+def test_accents_supprimes_sans_repliement():
+    analyseur = Analyzer([minuscules, supprimer_non_ascii, supprimer_ponctuation])
+    assert analyseur.tokens("Château école") == ["chteau", "cole"]
+
+
+def test_reparer_encodage():
+    assert reparer_encodage("prÃ©senter") == "présenter"
+    assert reparer_encodage("lâ\x80\x99Ã©tÃ©") == "l’été"
+    # Séquence incomplète ou texte déjà correct : inchangés
+    assert reparer_encodage("Ã") == "Ã"
+    assert reparer_encodage("présenter à Noël") == "présenter à Noël"
+    assert ANALYSEUR_FR.tokens("prÃ©senter") == ANALYSEUR_FR.tokens("présenter") == ["presenter"]
+
+
+def test_documents_et_requetes_analyses_de_la_meme_facon(moteur):
+    titres = {doc.titre for doc, _ in moteur.search("générative", 10)[0]}
+    assert titres == {"Intelligence artificielle générative"}
+    for requete in ("generative", "GÉNÉRATIVE", "gÃ©nÃ©rative"):
+        assert {doc.titre for doc, _ in moteur.search(requete, 10)[0]} == titres
+    assert moteur.concordance("évite") == moteur.concordance("EVITE")
+    assert moteur.concordance("evite")[0][2] == "évite"
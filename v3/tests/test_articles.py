@@ -0,0 +1,69 @@
+import pytest
+
+import fonctions.f_articles as f_articles
+from fonctions.f_articles import get_full_contents
+
+PAGE = "<html><body><nav><p>Menu</p></nav><article><p>Premier paragraphe.</p><p>Second.</p></article></body></html>"
+
+
+@pytest.fixture(autouse=True)
+def sans_attente(monkeypatch):
+    monkeypatch.setattr(f_articles, "DELAI_BASE", 0)
+
+
+def test_contenus_extraits(serveur):
+    for i in range(5):
+        serveur.servir(f"/article/{i}", (200, {"Content-Type": "text/html; charset=utf-8"}, PAGE.replace("Second", f"N{i}")))
+    urls = [f"{serveur.url}/article/{i}" for i in range(5)]
+    contenus = dict(get_full_contents(iter(urls), extracteur="html_parser"))
+    assert set(contenus) == set(urls)
+    assert all("Premier paragraphe." in contenus[url] and f"N{i}" in contenus[url] for i, url in enumerate(urls))
+
+
+def test_limite_par_site(serveur):
+    serveur.delai = 0.1
+    serveur.servir("/lent", (200, {}, PAGE))
+    urls = [f"{serveur.url}/lent?{i}" for i in range(8)]
+    resultats = list(get_full_contents(urls, max_workers=8, max_par_hote=2))
+    assert len(resultats) == 8
+    assert serveur.max_en_cours == 2
+
+
+def test_limite_globale_sur_plusieurs_sites(serveur):
+    serveur.delai = 0.1
+    serveur.servir("/lent", (200, {}, PAGE))
+    port = serveur.url.rsplit(":", 1)[1]
+    # Deux noms pour le même serveur : deux sites distincts pour la limite par site
+    urls = [f"http://{hote}:{port}/lent?{i}" for i in range(6) for hote in ("127.0.0.1", "localhost")]
+    resultats = list(get_full_contents(urls, max_workers=3, max_par_hote=2))
+    assert len(resultats) == 12
+    assert serveur.max_en_cours == 3
+
+
+def test_statut_temporaire_retente(serveur):
+    serveur.servir("/instable", (503, {}, ""), (429, {}, ""), (200, {}, PAGE))
+    [(url, contenu)] = get_full_contents([serveur.url + "/instable"], nb_essais=3)
+    assert "Premier paragraphe." in contenu
+    assert len(serveur.requetes) == 3
+
+
+def test_messages_d_erreur(serveur):
+    serveur.servir("/absent", (404, {}, "introuvable"))
+    serveur.servir("/panne", (500, {}, ""))
+    urls = [serveur.url + "/absent", serveur.url + "/panne", "http://127.0.0.1:1/ferme"]
+    contenus = dict(get_full_contents(urls, nb_essais=2))
+    assert contenus[urls[0]] == "Impossible de récupérer le contenu. Erreur HTTP."
+    assert contenus[urls[1]] == "Impossible de récupérer le contenu. Erreur HTTP."
+    assert contenus[urls[2]].startswith("Erreur lors de la récupération du contenu : ")
+    # 404 : pas de nouvelle tentative ; 500 : nb_essais tentatives
+    assert [chemin for chemin, _ in serveur.requetes].count("/absent") == 1
+    assert [chemin for chemin, _ in serveur.requetes].count("/panne") == 2
+
+
+def test_url_none_ne_termine_pas_le_flux(serveur):
+    serveur.servir("/article", (200, {}, PAGE))
+    urls = [serveur.url + "/article?1", None, "", serveur.url + "/article?2"]
+    resultats = dict(get_full_contents(iter(urls)))
+    assert set(resultats) == {urls[0], None, "", urls[3]}
+    assert resultats[None] == "URL non disponible."
+    assert "Premier paragraphe." in resultats[urls[3]]
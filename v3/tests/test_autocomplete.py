@@ -0,0 +1,53 @@
+from Class.autocomplete import CompletionTrie
+
+
+def scores_decroissants(suggestions):
+    scores = [score for _, score in suggestions]
+    return scores == sorted(scores, reverse=True)
+
+
+def test_completer_garde_les_meilleurs_par_prefixe():
+    trie = CompletionTrie([("robot", 5, 2), ("robotique", 9, 3), ("rouge", 1, 1), ("robots", 5, 4)], taille_top=2)
+    assert trie.completer("rob") == [("robotique", 9), ("robots", 5)]
+    assert trie.completer("ro", 1) == [("robotique", 9)]
+    assert trie.completer("x") == []
+
+
+def test_autocomplete_termes_et_ngrammes_des_titres(moteur):
+    suggestions = moteur.autocomplete("intel", 10)
+    textes = [texte for texte, _ in suggestions]
+    assert "intelligence" in textes and "intelligence artificielle" in textes
+    assert scores_decroissants(suggestions)
+
+
+def test_autocomplete_ne_melange_pas_les_baremes(moteur):
+    # Le n-gramme des titres existe : aucun mot complété seul n'est ajouté à sa suite
+    suggestions = moteur.autocomplete("intelligence art", 5)
+    assert suggestions == [("intelligence artificielle", 2 * CompletionTrie.POIDS_TITRE)]
+    assert scores_decroissants(suggestions)
+
+
+def test_autocomplete_dernier_mot_seul(moteur):
+    # Aucun n-gramme ne commence par "robot tr" : seul le dernier mot est complété
+    suggestions = moteur.autocomplete("robot tr", 5)
+    assert suggestions and all(texte.startswith("robot tr") for texte, _ in suggestions)
+    assert scores_decroissants(suggestions)
+
+
+def test_autocomplete_suit_les_generations(moteur, documents):
+    assert moteur.autocomplete("zyx") == []
+    document = documents[0]
+    document.full_content = "zyxwvu zyxwvu"
+    moteur.add_documents([document])
+    assert moteur.autocomplete("zyx") == [("zyxwvu", 2)]
+
+
+def test_suggestion_appliquee_au_dernier_mot(moteur):
+    # Le début de la requête est gardé tel que saisi, seul le dernier mot est complété
+    assert moteur.apply_suggestion("Le Robot asp", "robot aspirateur") == "Le Robot aspirateur"
+    assert moteur.apply_suggestion("Intelligence art", "intelligence artificielle") == "Intelligence artificielle"
+    # Suggestion qui prolonge les mots saisis, après un mot terminé
+    assert moteur.apply_suggestion("Intelligence ", "intelligence artificielle") == "Intelligence artificielle"
+    assert moteur.apply_suggestion("intel", "intelligence artificielle") == "intelligence artificielle"
+    for texte, _ in moteur.autocomplete("Un robot aspi", 5):
+        assert moteur.apply_suggestion("Un robot aspi", texte).startswith("Un robot aspi")
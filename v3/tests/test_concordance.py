@@ -0,0 +1,28 @@
+def test_concordance_contextes(moteur):
+    occurrences = moteur.concordance("intelligence artificielle", context_size=10)
+    assert len(occurrences) == 5
+    for doc_id, gauche, motif, droit in occurrences:
+        assert motif.lower() == "intelligence artificielle"
+        assert len(gauche) <= 10 and len(droit) <= 10
+
+
+def test_concordance_nb_max_garde_la_forme_des_resultats(moteur):
+    toutes = moteur.concordance("intelligence artificielle", context_size=10)
+    limitees = moteur.concordance("intelligence artificielle", context_size=10, nb_max=2)
+    assert len(toutes) > 2
+    assert limitees == toutes[:2]
+    assert all(len(occurrence) == 4 and isinstance(occurrence[2], str) for occurrence in limitees)
+
+
+def test_concordance_nb_max_sur_plusieurs_segments(moteur, documents):
+    moteur.add_documents(documents[:2])
+    assert len(moteur.segments) > 1
+    toutes = moteur.concordance("intelligence artificielle")
+    for nb_max in range(len(toutes) + 2):
+        assert moteur.concordance("intelligence artificielle", nb_max=nb_max) == toutes[:nb_max]
+
+
+def test_concordance_source(moteur):
+    dataframe = moteur.source["Numerama"].concorde("robot", context_size=5)
+    assert list(dataframe.columns) == ["doc_id", "contexte gauche", "motif trouvé", "contexte droit"]
+    assert len(dataframe) == 2
@@ -0,0 +1,22 @@
+import pytest
+
+from Class.html_extractor import EXTRACTEUR_PAR_DEFAUT, EXTRACTEURS
+from fonctions.f_articles import extraire_paragraphes
+
+PAGE = """<html><head><style>p { color: red; }</style></head><body>
+<p>Premier <b>paragraphe</b> &amp; suite.</p>
+<script>var p = "<p>faux</p>";</script>
+<div>Hors paragraphe</div>
+<p>Second paragraphe.</p>
+</body></html>"""
+
+
+def test_extracteur_par_defaut():
+    # Le défaut ne dépend pas des bibliothèques optionnelles installées
+    assert EXTRACTEUR_PAR_DEFAUT == "html_parser"
+    assert extraire_paragraphes(PAGE) == "Premier paragraphe & suite. Second paragraphe."
+
+
+@pytest.mark.parametrize("nom", sorted(EXTRACTEURS))
+def test_extracteurs_identiques(nom):
+    assert extraire_paragraphes(PAGE, nom).split() == extraire_paragraphes(PAGE).split()
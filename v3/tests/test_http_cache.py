@@ -0,0 +1,80 @@
+import time
+
+from Class.http_cache import ContentCache
+from fonctions.f_articles import get_full_content
+
+PAGE = "<html><body><article><p>Premier paragraphe.</p><p>Second.</p></article></body></html>"
+
+
+def test_purge_a_l_ouverture(tmp_path, monkeypatch):
+    chemin = str(tmp_path / "cache.sqlite")
+    cache = ContentCache(chemin, ttl=10, conservation=100)
+    cache.put("https://ancien", "texte ancien")
+    cache.put("https://expire", "texte expiré")
+    cache.close()
+
+    # 50 s plus tard : l'entrée expirée est conservée pour une requête conditionnelle
+    maintenant = time.time()
+    monkeypatch.setattr(time, "time", lambda: maintenant + 50)
+    cache = ContentCache(chemin, ttl=10, conservation=100)
+    assert len(cache) == 2 and not cache.get("https://expire")["frais"]
+    cache.touch("https://expire")
+    cache.close()
+
+    # 120 s plus tard : seule l'entrée revalidée entre-temps reste
+    monkeypatch.setattr(time, "time", lambda: maintenant + 120)
+    cache = ContentCache(chemin, ttl=10, conservation=100)
+    assert cache.get("https://ancien") is None
+    assert cache.get("https://expire")["contenu"] == "texte expiré"
+    assert cache.purge(age_max=0) == 1 and len(cache) == 0
+    cache.close()
+
+
+def test_revalidation_conditionnelle(serveur, tmp_path, monkeypatch):
+    entetes = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    serveur.servir("/article", (200, entetes, PAGE), (304, {}, ""), (200, {}, PAGE.replace("Second", "Modifié")))
+    url = serveur.url + "/article"
+    cache = ContentCache(str(tmp_path / "cache.sqlite"), ttl=10)
+
+    contenu = get_full_content(url, cache=cache)
+    assert "Premier paragraphe." in contenu
+    # Entrée fraîche : servie sans requête
+    assert get_full_content(url, cache=cache) == contenu
+    assert len(serveur.requetes) == 1
+
+    # Entrée expirée : requête conditionnelle, la réponse 304 garde le texte et prolonge l'entrée
+    maintenant = time.time()
+    monkeypatch.setattr(time, "time", lambda: maintenant + 50)
+    assert get_full_content(url, cache=cache) == contenu
+    _, en_tetes_requete = serveur.requetes[-1]
+    assert en_tetes_requete["If-None-Match"] == '"v1"'
+    assert en_tetes_requete["If-Modified-Since"] == entetes["Last-Modified"]
+    assert cache.get(url)["frais"]
+    assert get_full_content(url, cache=cache) == contenu
+    assert len(serveur.requetes) == 2
+
+    # Nouvelle expiration, page modifiée : le texte du cache est remplacé
+    monkeypatch.setattr(time, "time", lambda: maintenant + 100)
+    assert "Modifié." in get_full_content(url, cache=cache)
+    assert "Modifié." in cache.get(url)["contenu"]
+    cache.close()
+
+
+def test_eviction_lru(tmp_path, monkeypatch):
+    horloge = iter(range(1000, 2000))
+    monkeypatch.setattr(time, "time", lambda: next(horloge))
+    cache = ContentCache(str(tmp_path / "cache.sqlite"), taille_max=25)
+    cache.put("https://a", "a" * 10)
+    cache.put("https://b", "b" * 10)
+    # Lire a le rend plus récent que b
+    assert cache.get("https://a")["contenu"] == "a" * 10
+
+    cache.put("https://c", "c" * 10)
+    assert len(cache) == 2
+    assert cache.get("https://b") is None
+    assert cache.get("https://a") is not None and cache.get("https://c") is not None
+
+    # La taille est comptée en octets UTF-8 : "é" en occupe deux
+    cache.put("https://d", "é" * 6)
+    assert len(cache) == 2 and cache.get("https://a") is None
+    cache.close()
@@ -0,0 +1,48 @@
+import fonctions.f_ingest as f_ingest
+from fonctions.f_ingest import ingest, pipeline
+
+
+def article(titre, url, **champs):
+    return {"source": {"name": "Numerama"}, "author": "Alice", "title": titre, "description": "",
+            "url": url, "publishedAt": "2024-02-01T00:00:00Z", "content": "", **champs}
+
+
+def test_pipeline(moteur, documents, monkeypatch):
+    telecharges = []
+
+    def get_full_contents(urls, **options):
+        # Contenus produits dans l'ordre inverse des demandes, comme des téléchargements qui finissent dans le désordre
+        urls = list(urls)
+        telecharges.extend(urls)
+        for url in reversed(urls):
+            yield url, f"Robot {url.rsplit('/', 1)[-1]}"
+
+    monkeypatch.setattr(f_ingest, "get_full_contents", get_full_contents)
+    articles = [
+        article("Déjà indexé", documents[0].url),
+        article("Premier", "https://exemple.fr/premier"),
+        article("Deuxième", "https://exemple.fr/deuxieme"),
+        article("Premier en double", "https://exemple.fr/premier"),
+        article("Sans URL", None),
+        article("Contenu fourni", "https://exemple.fr/fourni", full_content="Robot fourni"),
+    ]
+    nb_documents = len(moteur.documents)
+    indexes = list(pipeline(articles, moteur, taille_lot=2))
+
+    # URL déjà indexées ou déjà vues dans le flux : ni téléchargées ni indexées
+    assert telecharges == ["https://exemple.fr/premier", "https://exemple.fr/deuxieme"]
+    assert sorted(doc.titre for _, doc in indexes) == ["Contenu fourni", "Deuxième", "Premier", "Sans URL"]
+
+    # Chaque contenu reste attaché à son article
+    contenus = {doc.titre: doc.full_content for _, doc in indexes}
+    assert contenus["Premier"] == "Robot premier" and contenus["Deuxième"] == "Robot deuxieme"
+    assert contenus["Contenu fourni"] == "Robot fourni" and contenus["Sans URL"] == "URL non disponible."
+
+    # Identifiants attribués dans l'ordre de sortie du pipeline, à la suite de l'index
+    assert [doc_id for doc_id, _ in indexes] == list(range(nb_documents, nb_documents + 4))
+    assert all(moteur.documents[doc_id].titre == doc.titre for doc_id, doc in indexes)
+    assert {doc.titre for doc, _ in moteur.search("premier", 10)[0]} == {"Premier"}
+
+    # Un second passage n'indexe rien de nouveau
+    assert list(pipeline(articles[1:3], moteur)) == []
+    assert ingest([], moteur) is moteur and len(moteur.documents) == nb_documents + 4
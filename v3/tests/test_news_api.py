@@ -0,0 +1,61 @@
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import Class.classNewsApi as news
+from Class.http_session import delai_retry_after
+
+
+def page(articles, total=None):
+    return json.dumps({"status": "ok", "totalResults": len(articles) if total is None else total,
+                       "articles": articles})
+
+
+@pytest.fixture
+def attentes(monkeypatch):
+    # time.sleep est remplacé pour tout le processus : les attentes nulles d'autres modules sont ignorées
+    attentes = []
+    monkeypatch.setattr(news.time, "sleep", lambda delai: delai and attentes.append(delai))
+    return attentes
+
+
+def client(serveur, **options):
+    return news.NewsAPIClient("cle", base_url=serveur.url + "/v2/everything", requetes_par_seconde=None, **options)
+
+
+def test_delai_retry_after():
+    assert delai_retry_after("7", 1) == 7
+    assert delai_retry_after(None, 2) == 2
+    assert delai_retry_after("pas une date", 3) == 3
+    dans_une_minute = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert 55 <= delai_retry_after(dans_une_minute, 1) <= 60
+    assert delai_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", 1) == 0
+
+
+def test_429_avec_date_http_retente(serveur, attentes):
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    serveur.servir("/v2/everything",
+                   (429, {"Retry-After": date}, ""),
+                   (503, {"Retry-After": "2"}, ""),
+                   (200, {"Content-Type": "application/json"}, page([{"url": "https://a", "title": "A"}])))
+    articles = list(client(serveur).harvest("ia"))
+    assert [a["url"] for a in articles] == ["https://a"]
+    assert len(serveur.requetes) == 3
+    assert 25 <= attentes[0] <= 30 and attentes[1] == 2
+
+
+def test_429_persistant_abandonne_sans_exception(serveur, attentes):
+    serveur.servir("/v2/everything", (429, {"Retry-After": "bientôt"}, ""))
+    assert list(client(serveur, nb_essais=3).harvest("ia")) == []
+    assert len(serveur.requetes) == 3
+    assert attentes == [1, 2]
+
+
+def test_harvest_pagine_et_dedoublonne(serveur, attentes):
+    articles = [{"url": f"https://exemple.fr/{i}"} for i in range(3)]
+    serveur.servir("/v2/everything", (200, {}, page(articles + articles[:1], total=4)))
+    resultats = list(client(serveur).harvest(["ia", "robot"], page_size=2, max_pages=2))
+    assert sorted(a["url"] for a in resultats) == [a["url"] for a in articles]
+    assert all("apiKey=cle" in chemin for chemin, _ in serveur.requetes)
@@ -0,0 +1,105 @@
+import os
+import pickle
+
+import pytest
+
+from Class.search_engine import SearchEngine
+from fonctions.f_index import charger_index, generation_courante, generations, publier_index
+from fonctions.f_ingest import nouveaux
+
+
+def test_load_ne_construit_aucun_document(moteur, tmp_path):
+    moteur.remove_documents([1])
+    moteur.save(str(tmp_path / "index"))
+    charge = SearchEngine.load(str(tmp_path / "index"))
+
+    assert all(doc is None for doc in charge.documents._documents)
+    assert {nom: source.ndoc for nom, source in charge.source.items()} == \
+           {nom: source.ndoc for nom, source in moteur.source.items()}
+    assert charge._cles_sources == moteur._cles_sources
+
+    resultats, _ = charge.search("robot", 5)
+    assert [doc.titre for doc, _ in resultats] == [doc.titre for doc, _ in moteur.search("robot", 5)[0]]
+
+    # Les documents d'une source sont construits au premier accès à sa production
+    production = charge.source["Le Monde"].production
+    assert list(production) == [0]
+    assert production[0].titre == "Intelligence artificielle et emploi"
+    assert charge.documents._documents[4] is None
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_vocabulaire_enregistre_en_utf8(moteur, documents, tmp_path, mmap):
+    # Termes de longueurs très différentes : le fichier ne dépend que de leur taille totale
+    document = documents[0]
+    document.full_content = "a" * 500 + " ßçéñ " + "robot"
+    moteur.add_documents([document])
+    moteur.save(str(tmp_path / "index"))
+    charge = SearchEngine.load(str(tmp_path / "index"), mmap=mmap)
+
+    assert charge.vocab.termes == moteur.vocab.termes and "a" * 500 in charge.vocab
+    assert charge.vocab["sscen"] == moteur.vocab["sscen"]
+    assert os.path.getsize(tmp_path / "index" / "vocab_octets.npy") < 1000 + sum(map(len, moteur.vocab.termes))
+    assert [doc.titre for doc, _ in charge.search("sscen", 5)[0]] == [document.titre]
+
+
+def test_source_differee_suppression_et_pickle(moteur, tmp_path):
+    moteur.save(str(tmp_path / "index"))
+    charge = SearchEngine.load(str(tmp_path / "index"))
+    numerama = charge.source["Numerama"]
+    assert charge.remove_documents([2]) == 1
+    assert numerama.ndoc == 1 and list(numerama.production) == [3]
+
+    copie = pickle.loads(pickle.dumps(numerama))
+    assert list(copie.production) == [3] and copie.moteur is None
+
+
+def test_nouveaux_lit_la_colonne_des_url(moteur, documents, tmp_path):
+    moteur.remove_documents([0])
+    moteur.save(str(tmp_path / "index"))
+    charge = SearchEngine.load(str(tmp_path / "index"))
+    articles = [{"url": documents[0].url}, {"url": documents[1].url}, {"url": None}, {"url": "https://nouveau"}]
+    assert [a["url"] for a in nouveaux(articles, charge)] == [documents[0].url, None, "https://nouveau"]
+    assert all(doc is None for doc in charge.documents._documents)
+
+
+def test_generations_publiees(moteur, documents, tmp_path, monkeypatch):
+    racine = str(tmp_path / "index")
+    assert generation_courante(racine) is None and charger_index(racine) is None
+
+    assert publier_index(moteur, racine) == "gen-000001"
+    assert generation_courante(racine) == "gen-000001"
+
+    # Pendant l'écriture d'une génération, CURRENT désigne toujours la précédente, complète
+    pendant_ecriture = []
+    enregistrer = moteur.save
+
+    def save(path):
+        pendant_ecriture.append(generation_courante(racine))
+        enregistrer(path)
+
+    monkeypatch.setattr(moteur, "save", save)
+    moteur.remove_documents([0])
+    assert publier_index(moteur, racine) == "gen-000002"
+    moteur.add_documents([documents[0]])
+    assert publier_index(moteur, racine) == "gen-000003"
+    assert pendant_ecriture == ["gen-000001", "gen-000002"]
+
+    # Seules les deux dernières générations sont gardées ; aucun fichier temporaire ne reste
+    assert generations(racine) == ["gen-000002", "gen-000003"]
+    assert sorted(os.listdir(racine)) == ["CURRENT", "gen-000002", "gen-000003"]
+
+    # Une génération qui échoue à s'écrire ne devient pas active
+    def save_en_echec(path):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(moteur, "save", save_en_echec)
+    with pytest.raises(OSError):
+        publier_index(moteur, racine)
+    assert generation_courante(racine) == "gen-000003"
+
+    charge = charger_index(racine)
+    assert charge.nb_documents_actifs() == len(documents)
+    assert [doc.titre for doc, _ in charge.search("intelligence", 10)[0]] == \
+           [doc.titre for doc, _ in moteur.search("intelligence", 10)[0]]
+    assert charger_index(racine, "gen-000002").nb_documents_actifs() == len(documents) - 1
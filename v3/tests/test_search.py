@@ -0,0 +1,344 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from Class.analyzer import ANALYSEUR_FR
+from Class.Document import Document
+from Class.inverted_index import InvertedIndex, top_k_taat, top_k_wand
+from Class.positions import decoder_deltas, encoder_deltas
+from Class.query_parser import plan_requete
+from Class.ranking import RANKERS
+from Class.search_engine import SearchEngine
+
+
+@pytest.mark.parametrize("ranker", RANKERS)
+def test_backends_identiques(moteur, ranker):
+    reference, total = moteur.search("intelligence robot apple", 10, backend="matrix", ranker=ranker)
+    for backend in ("taat", "daat"):
+        resultats, nb_hits = moteur.search("intelligence robot apple", 10, backend=backend, ranker=ranker)
+        assert nb_hits == total
+        # Les ex aequo peuvent être rangés différemment d'un backend à l'autre
+        assert {doc.titre for doc, _ in resultats} == {doc.titre for doc, _ in reference}
+        assert [score for _, score in resultats] == pytest.approx([score for _, score in reference])
+
+
+@pytest.mark.parametrize("ranker", RANKERS)
+def test_classement_par_ranker(moteur, ranker):
+    robot, apple, openai = "Un robot aspirateur intelligent", "Apple intelligence arrive en France", \
+        "OpenAI lance un nouveau modèle"
+    resultats, nb_hits = moteur.search("robot", 10, ranker=ranker)
+    assert nb_hits == 2 and resultats[0][0].titre == robot
+    assert [score for _, score in resultats] == sorted((score for _, score in resultats), reverse=True)
+    assert moteur.search("intelligence openai", 10, ranker=ranker)[0][0][0].titre == openai
+    # Pondération par l'IDF : apple (1 document) l'emporte sur robot (2 documents), pas avec le cosinus sur TF brut
+    premier = moteur.search("apple robot", 10, ranker=ranker)[0][0][0].titre
+    assert premier == (robot if ranker == "cosine" else apple)
+
+
+@pytest.mark.parametrize("ranker", RANKERS)
+def test_etat_du_ranker_apres_ajout(moteur, documents, ranker):
+    moteur.search("robot apple", 10, ranker=ranker)
+    etat = moteur._ranker(ranker)[1]
+    assert moteur._ranker(ranker)[1] is etat
+
+    contenu = "Un robot cuisinier prépare le dîner ; le robot range la cuisine."
+    nouveau = Document("Le Monde", "Alice", "Robot cuisinier", "Un robot en cuisine.", "https://exemple.fr/robot",
+                       "", "2024-01-06T00:00:00Z", contenu, contenu)
+    moteur.add_documents([nouveau])
+    assert moteur._ranker(ranker)[1] is not etat
+
+    # Mêmes scores qu'un index construit en une fois sur tous les documents
+    reference = SearchEngine({})
+    reference.add_documents(documents + [nouveau])
+    resultats, nb_hits = moteur.search("robot apple", 10, ranker=ranker)
+    attendus, total = reference.search("robot apple", 10, ranker=ranker)
+    assert nb_hits == total == 4
+    assert [doc.titre for doc, _ in resultats] == [doc.titre for doc, _ in attendus]
+    assert [score for _, score in resultats] == pytest.approx([score for _, score in attendus])
+
+
+def test_daat_ne_classe_que_le_debut(moteur, monkeypatch):
+    profondeurs = []
+
+    def wand(listes, k, compter=False):
+        profondeurs.append(k)
+        return top_k_wand(listes, k, compter)
+
+    monkeypatch.setattr("Class.search_engine.top_k_wand", wand)
+    monkeypatch.setattr(moteur, "PROFONDEUR_DAAT", 1)
+    reference, total = moteur.search("intelligence robot apple", 10, backend="taat")
+
+    premiers, _ = moteur.search("intelligence robot apple", 1, backend="daat")
+    moteur.search("intelligence robot apple", 1, backend="daat")
+    assert profondeurs == [1]
+
+    # Page plus profonde : le classement mis en cache est trop court et est recalculé
+    resultats, nb_hits = moteur.search("intelligence robot apple", 3, backend="daat")
+    assert profondeurs == [1, 3]
+    assert nb_hits == total
+    assert premiers[0][0].titre == resultats[0][0].titre
+    assert [score for _, score in resultats] == pytest.approx([score for _, score in reference[:3]])
+
+
+def test_wand_sans_decompte():
+    listes = [(np.array([0, 2, 4, 6]), np.array([1.0, 2.0, 3.0, 4.0])),
+              (np.array([1, 2, 7]), np.array([5.0, 1.0, 0.5]))]
+    assert top_k_wand(listes, 2, compter=True, taille_bloc=1)[2] == 6
+    # Un document par bloc : bornes 5 (doc 1), 4 (doc 6), 3 (docs 2 et 4)... ; au-delà de 4, rien n'est évalué
+    docs, scores, nb_hits = top_k_wand(listes, 2, taille_bloc=1)
+    assert docs.tolist() == [1, 6] and scores.tolist() == [5.0, 4.0] and nb_hits is None
+    # Aucun bloc élagué : le décompte est exact sans union
+    for taille_bloc in (1, 4, 128):
+        docs, _, nb_hits = top_k_wand(listes, 10, taille_bloc=taille_bloc)
+        assert docs.tolist() == [1, 6, 2, 4, 0, 7] and nb_hits == 6
+    assert top_k_wand(listes, 0)[2] is None and top_k_wand([], 3)[2] == 0
+
+
+@pytest.mark.parametrize("taille_bloc", [1, 7, 128])
+def test_wand_par_blocs_identique_a_taat(taille_bloc):
+    generateur = np.random.default_rng(0)
+    for _ in range(20):
+        listes = []
+        for _ in range(generateur.integers(1, 5)):
+            docs = np.unique(generateur.integers(0, 2000, generateur.integers(1, 300)))
+            listes.append((docs, generateur.random(len(docs)) * generateur.random()))
+        for k in (1, 10, 100):
+            attendus, scores_attendus, total = top_k_taat(listes, k)
+            docs, scores, nb_hits = top_k_wand(listes, k, taille_bloc=taille_bloc)
+            assert scores.tolist() == pytest.approx(scores_attendus.tolist())
+            assert set(docs.tolist()) == set(attendus.tolist())
+            assert nb_hits in (None, total) and top_k_wand(listes, k, True, taille_bloc)[2] == total
+
+
+def test_daat_decompte_a_la_demande(moteur, monkeypatch):
+    _, total = moteur.search("intelligence robot apple", 10, backend="taat")
+    unions = []
+    monkeypatch.setattr("Class.inverted_index.nombre_documents_trouves",
+                        lambda listes: unions.append(1) or total)
+    monkeypatch.setattr(moteur, "PROFONDEUR_DAAT", 1)
+    monkeypatch.setattr("Class.inverted_index.TAILLE_BLOC", 1)
+
+    resultats, nb_hits = moteur.search("intelligence robot apple", 1, backend="daat", total=False)
+    assert len(resultats) == 1 and nb_hits is None and unions == []
+    # Le total n'est calculé (une fois, puis mis en cache) que lorsqu'il est demandé
+    assert moteur.search("intelligence robot apple", 1, backend="daat")[1] == total
+    assert moteur.search("intelligence robot apple", 1, backend="daat", total=False)[1] == total
+    assert unions == [1]
+
+
+def test_suppression_pendant_une_fusion(documents, monkeypatch):
+    moteur = SearchEngine({})
+    for doc in documents:
+        moteur.add_documents([doc])
+    assert len(moteur.segments) > 1
+    attendues = [c for c in moteur.concordance("intelligence artificielle") if c[0] != 0]
+
+    # Suppression entre le masquage des postings et celui des positions
+    fusionner_positions = InvertedIndex._fusionner_positions
+
+    def suppression_concurrente(segments, supprimes):
+        moteur.remove_documents([0])
+        return fusionner_positions(segments, supprimes)
+
+    monkeypatch.setattr(InvertedIndex, "_fusionner_positions", staticmethod(suppression_concurrente))
+    moteur.fusionner()
+
+    assert len(moteur.segments) == 1 and moteur.supprimes[0]
+    assert moteur.concordance("intelligence artificielle") == attendues
+    resultats, nb_hits = moteur.search('"intelligence artificielle"', 10)
+    assert nb_hits == len({doc_id for doc_id, *_ in attendues})
+    assert "Intelligence artificielle et emploi" not in {doc.titre for doc, _ in resultats}
+
+
+def test_politique_de_fusion_par_niveaux(monkeypatch):
+    moteur = SearchEngine({})
+
+    def choix(*tailles):
+        monkeypatch.setattr(moteur, "segments", [InvertedIndex(csr_matrix(np.ones((1, taille))))
+                                                 for taille in tailles])
+        return moteur._choisir_fusion()
+
+    # Seuls des segments voisins de tailles comparables sont fusionnés, SEGMENTS_PAR_NIVEAU à la fois
+    assert choix(5000, *[100] * 7) is None
+    assert choix(5000, *[100] * 9, 2) == (1, 9)
+    assert choix(*[5000] * 8, *[100] * 8) == (0, 8)
+    # Un petit segment entre des segments plus grands ne bloque pas leur fusion
+    assert choix(5000, 100, 90, 1, 110, 100, 100, 120, 100, 100) == (1, 9)
+
+
+def test_fusions_en_arriere_plan(documents):
+    moteur = SearchEngine({})
+    for _ in range(12):
+        for doc in documents:
+            moteur.add_documents([doc])
+            if moteur._fusion is not None:
+                moteur._fusion.join()
+    # 60 segments d'un document ajoutés : fusionnés par niveaux, peu de segments restent
+    assert len(moteur.segments) < 2 * moteur.SEGMENTS_PAR_NIVEAU and moteur._choisir_fusion() is None
+    assert moteur.segments[0].nb_documents > 1
+
+    reference = SearchEngine({})
+    reference.add_documents(documents * 12)
+    for requete in ("intelligence artificielle", '"robot aspirateur"', "apple NOT openai"):
+        assert moteur.search(requete, 100)[1] == reference.search(requete, 100)[1]
+    assert moteur.concordance("robot") == reference.concordance("robot")
+
+
+def test_suppression_groupee_des_comptes(moteur, monkeypatch):
+    appels = []
+    retirer_comptes = moteur.vocab.retirer_comptes
+    monkeypatch.setattr(moteur.vocab, "retirer_comptes", lambda *args: appels.append(1) or retirer_comptes(*args))
+    robot = moteur.vocab.termes.index("robot")
+    assert moteur.remove_documents([0, 3, 3, 99]) == 2
+    assert appels == [1]
+    assert moteur.vocab.occurrences[robot] == 0 and moteur.vocab.df[robot] == 0
+
+
+def titres(moteur, requete):
+    return [doc.titre for doc, _ in moteur.search(requete, 10)[0]]
+
+
+@pytest.mark.parametrize("requete, plan", [
+    ("intelligence OR robot AND apple", "(intelligence OR (robot AND apple))"),
+    ("intelligence AND robot OR apple", "((intelligence AND robot) OR apple)"),
+    ("intelligence AND (robot OR apple)", "(intelligence AND (robot OR apple))"),
+    ("intelligence NOT apple", "(intelligence AND NOT apple)"),
+    ("NOT robot AND apple", "(NOT robot AND apple)"),
+    ("robot AND NOT NOT aspirateur", "(robot AND aspirateur)"),
+    ("NOT NOT NOT robot AND apple", "(NOT robot AND apple)"),
+    ("titre:(robot OR apple)^2", "(titre:robot OR titre:apple)^2"),
+])
+def test_plan_booleen_priorites(requete, plan):
+    assert repr(plan_requete(requete, ANALYSEUR_FR)) == plan
+
+
+def test_requete_booleenne_operateurs(moteur):
+    assert titres(moteur, "intelligence AND robot OR apple") == \
+           ["Apple intelligence arrive en France", "Intelligence artificielle et emploi"]
+    assert set(titres(moteur, "intelligence AND (robot OR apple)")) == \
+           {"Apple intelligence arrive en France", "Intelligence artificielle et emploi"}
+    sans_apple = titres(moteur, "intelligence NOT apple")
+    assert len(sans_apple) == 3 and "Apple intelligence arrive en France" not in sans_apple
+    # Une négation seule ne sélectionne aucun document
+    assert moteur.search("NOT apple", 10) == ([], 0)
+    # Une double négation s'annule, même dans un AND
+    assert titres(moteur, "robot AND NOT NOT aspirateur") == titres(moteur, "robot AND aspirateur") == \
+           ["Un robot aspirateur intelligent"]
+    assert titres(moteur, "NOT NOT apple") == titres(moteur, "apple")
+
+
+@pytest.mark.parametrize("requete", ["(intelligence", "intelligence)", "((intelligence))", ")(intelligence"])
+def test_requete_booleenne_parentheses_desequilibrees(moteur, requete):
+    assert sorted(titres(moteur, requete)) == sorted(titres(moteur, "(intelligence)"))
+
+
+@pytest.mark.parametrize("requete", ["()", "(", "AND", "NOT", "titre:", "^2"])
+def test_requete_booleenne_vide(moteur, requete):
+    assert moteur.search(requete, 10) == ([], 0)
+
+
+def test_requete_booleenne_imbrication_profonde(moteur):
+    for requete in ("(" * 300 + "robot", "(" * 300 + "robot" + ")" * 300, "NOT " * 300 + "robot apple"):
+        resultats, _ = moteur.search(requete, 10)
+        assert resultats
+    assert titres(moteur, "(" * 300 + "robot") == titres(moteur, "(robot)")
+
+
+def test_requete_booleenne_champ(moteur):
+    # "robot" apparaît dans le contenu de deux documents, dans le titre d'un seul
+    assert len(titres(moteur, "robot")) == 2
+    assert titres(moteur, "titre:robot") == ["Un robot aspirateur intelligent"]
+    assert titres(moteur, "titre:openai") == ["OpenAI lance un nouveau modèle"]
+    assert titres(moteur, "description:chatgpt") == ["OpenAI lance un nouveau modèle"]
+    assert titres(moteur, "titre:chatgpt") == []
+
+
+def test_requete_booleenne_poids(moteur):
+    robot, apple = "Un robot aspirateur intelligent", "Apple intelligence arrive en France"
+    assert titres(moteur, "robot^3 OR apple")[:2] == [robot, apple]
+    assert titres(moteur, "robot OR apple^3")[:2] == [apple, robot]
+    scores = dict((doc.titre, score) for doc, score in moteur.search("robot OR apple", 10)[0])
+    scores_pondere = dict((doc.titre, score) for doc, score in moteur.search("robot^3 OR apple", 10)[0])
+    assert scores_pondere[robot] == pytest.approx(3 * scores[robot])
+    assert scores_pondere[apple] == pytest.approx(scores[apple])
+
+
+def test_deltas_aller_retour():
+    # Trois postings, dont un vide : les valeurs repartent de zéro à chaque posting
+    valeurs = np.array([3, 7, 8, 0, 250, 1000])
+    pos_indptr = np.array([0, 3, 3, 6])
+    deltas = encoder_deltas(valeurs, pos_indptr)
+    assert deltas.tolist() == [3, 4, 1, 0, 250, 750] and deltas.dtype == np.uint16
+    assert decoder_deltas(deltas, pos_indptr).tolist() == valeurs.tolist()
+    # Suite de postings lue au milieu (voir PositionalPostings.lire)
+    assert decoder_deltas(deltas[3:], pos_indptr[2:] - 3).tolist() == [0, 250, 1000]
+    assert len(decoder_deltas(encoder_deltas([], np.array([0])), np.array([0]))) == 0
+
+
+def test_recherche_expression(moteur):
+    assert titres(moteur, '"robot aspirateur"') == ["Un robot aspirateur intelligent"]
+    assert titres(moteur, '"aspirateur robot"') == []
+    assert titres(moteur, '"apple intelligence"') == ["Apple intelligence arrive en France"]
+    assert len(titres(moteur, "apple intelligence")) > 1
+    assert titres(moteur, '"artificielle intelligence"') == []
+    # Guillemet fermant manquant, stop words ignorés dans l'expression
+    assert titres(moteur, '"robot aspirateur') == titres(moteur, '"le robot aspirateur"') == \
+           ["Un robot aspirateur intelligent"]
+
+
+@pytest.mark.parametrize("distance, trouve", [(2, False), (3, True), (4, True)])
+def test_recherche_proximite(moteur, distance, trouve):
+    # "Ce robot aspirateur intelligent cartographie la maison" : aspirateur au rang 1, maison au rang 4
+    attendu = ["Un robot aspirateur intelligent"] if trouve else []
+    assert titres(moteur, f"aspirateur NEAR/{distance} maison") == attendu
+    assert titres(moteur, f"maison NEAR/{distance} aspirateur") == attendu
+
+
+def jours(moteur, requete, **filtres):
+    resultats, nb_hits = moteur.search(requete, 10, **filtres)
+    assert nb_hits == len(resultats)
+    return sorted(doc.datePubication.day for doc, _ in resultats)
+
+
+@pytest.mark.parametrize("backend", ["matrix", "taat", "daat"])
+def test_filtre_dates_bornes_incluses(moteur, backend):
+    # "intelligence" : documents publiés les 1er, 2, 3 et 5 janvier
+    assert jours(moteur, "intelligence", backend=backend) == [1, 2, 3, 5]
+    assert jours(moteur, "intelligence", backend=backend, since="2024-01-02") == [2, 3, 5]
+    assert jours(moteur, "intelligence", backend=backend, until="2024-01-03") == [1, 2, 3]
+    assert jours(moteur, "intelligence", backend=backend, since=date(2024, 1, 2), until=date(2024, 1, 3)) == [2, 3]
+    # L'heure d'un datetime est ignorée : la journée entière est incluse
+    assert jours(moteur, "intelligence", backend=backend, until=datetime(2024, 1, 3, 0, 0)) == [1, 2, 3]
+    assert jours(moteur, "intelligence", backend=backend, since="2024-01-04", until="2024-01-04") == []
+    assert jours(moteur, "intelligence", backend=backend, since="2024-01-06") == []
+
+
+def test_filtre_sources_et_auteurs(moteur):
+    assert jours(moteur, "intelligence", sources=["Le Monde"]) == [1, 2]
+    assert jours(moteur, "intelligence", authors=["Bob"]) == [2, 5]
+    assert jours(moteur, "intelligence", sources=["Le Monde"], authors=["Bob"]) == [2]
+    assert jours(moteur, "intelligence OR robot", sources=["Numerama"]) == [3, 4]
+    # Noms inconnus : ignorés parmi des noms connus, aucun document sinon
+    assert jours(moteur, "intelligence", sources=["Le Monde", "Inconnu"]) == [1, 2]
+    assert jours(moteur, "intelligence", sources=["Inconnu"]) == []
+    assert jours(moteur, "intelligence", authors=["Inconnu"]) == []
+    assert jours(moteur, "intelligence", sources=[]) == []
+
+
+def test_filtres_et_cache_des_classements(moteur, documents):
+    assert jours(moteur, "intelligence", sources=["Le Monde"]) == [1, 2]
+    assert jours(moteur, "intelligence", sources=["Numerama"]) == [3]
+    assert jours(moteur, "intelligence") == [1, 2, 3, 5]
+    assert len(moteur._resultats) == 3
+
+    # Mêmes filtres sous une autre forme : même entrée du cache
+    assert jours(moteur, "intelligence", sources=["Le Monde", "Numerama"], since="2024-01-02") == [2, 3]
+    assert jours(moteur, "intelligence", sources=("Numerama", "Le Monde", "Numerama"), since=date(2024, 1, 2)) == [2, 3]
+    assert len(moteur._resultats) == 4
+
+    # Un ajout invalide les classements mémorisés : le nouveau document passe le filtre
+    moteur.add_documents([documents[0]])
+    assert jours(moteur, "intelligence", sources=["Le Monde"]) == [1, 1, 2]
+    assert len(moteur._resultats) == 1
@@ -0,0 +1,73 @@
+import pickle
+from collections import Counter
+
+from Class.Document import Document
+from Class.analyzer import ANALYSEUR_FR
+from Class.Source import Source
+
+
+def comptes_reference(source):
+    return {doc_id: Counter(ANALYSEUR_FR.tokens(doc.full_content)) for doc_id, doc in source.production.items()}
+
+
+def test_stats_lues_dans_l_index(moteur, monkeypatch):
+    source = moteur.source["Numerama"]
+    reference = comptes_reference(source)
+    # Les statistiques ne retokenisent aucun document
+    monkeypatch.setattr(ANALYSEUR_FR, "tokens", None)
+    assert source.comptes_termes() == reference
+
+    stats = source.stats(n=3)
+    total = sum(reference.values(), Counter())
+    assert stats["freq_totale"] == dict(total)
+    assert stats["freq_documents"] == dict(sum((Counter(set(c)) for c in reference.values()), Counter()))
+    assert list(stats["vocabulaire"]) == sorted(total)
+    assert stats["freq_table"]["term_frequency"].tolist() == sorted(total.values(), reverse=True)[:3]
+
+
+def test_stats_suivent_les_suppressions(moteur):
+    moteur.remove_documents([3])
+    stats = moteur.source["Numerama"].stats()
+    assert "robot" not in stats["freq_totale"] and stats["freq_totale"]["apple"] == 2
+
+
+def test_source_seule_et_pickle(documents):
+    source = Source("Le Monde")
+    for doc_id, doc in enumerate(documents[:2]):
+        source.add(doc, doc_id)
+    assert source.stats()["freq_totale"]["intelligence"] == 3
+    etat = source.__getstate__()
+    assert "moteur" not in etat and "_comptes" not in etat
+    assert pickle.loads(pickle.dumps(source)).stats()["freq_totale"]["intelligence"] == 3
+
+
+def test_cles_locales_des_sources(documents):
+    # Sources dont les identifiants ne sont pas ceux de l'index (numérotation propre à chaque source)
+    from Class.search_engine import SearchEngine
+    sources = {"A": Source("A"), "B": Source("B")}
+    for i, doc in enumerate(documents):
+        source = sources["A" if i < 2 else "B"]
+        source.add(doc, source.ndoc)
+    SearchEngine(sources)
+    assert sources["B"].comptes_termes() == comptes_reference(sources["B"])
+    assert sources["B"].stats()["freq_totale"] == dict(sum(comptes_reference(sources["B"]).values(), Counter()))
+
+
+def test_ajout_apres_indexation(documents):
+    source = Source("Le Monde")
+    source.add(documents[3], 0)
+    assert "chat" not in source.stats()["freq_totale"]
+
+    # Le document ajouté à une source déjà indexée est indexé à son tour
+    chat = Document("Le Monde", "Alice", "Un chat", "", "https://exemple.fr/chat", "",
+                    "2024-01-06T00:00:00Z", "", "chat chat chat")
+    source.add(chat, 1)
+    assert source.stats()["freq_totale"]["chat"] == 3
+    assert source.search("chat") and len(source.concorde("chat")) == 3
+    assert source.index().search("chat", 5)[0][0][0] is chat and source.ndoc == 2
+
+    # Un document ajouté sous un identifiant existant remplace l'ancien, dans l'index aussi
+    source.add(documents[0], 1)
+    stats = source.stats()["freq_totale"]
+    assert "chat" not in stats and stats["robot"] == 3 and source.ndoc == 2
+    assert source.comptes_termes() == comptes_reference(source)
@@ -0,0 +1,56 @@
+from Class.Document import Document
+from Class.term_dictionary import TermDictionary, distance_edition
+
+
+def test_prefixe_et_motifs(moteur):
+    dictionnaire = TermDictionary(moteur.vocab)
+    # Par occurrences décroissantes : intelligence (6) avant intelligent (1)
+    assert dictionnaire.prefixe("intel") == ["intelligence", "intelligent"]
+    assert dictionnaire.prefixe("zz") == []
+    assert dictionnaire.motif("intellig*") == ["intelligence", "intelligent"]
+    assert dictionnaire.motif("r?bot") == ["robot"]
+    assert dictionnaire.motif("*teur") == ["aspirateur"]
+    assert dictionnaire.motif("*tel*") == ["intelligence", "intelligent"]
+    assert dictionnaire.motif("robot") == ["robot"] and dictionnaire.motif("robo") == []
+
+
+def test_nombre_maximal_d_expansions(moteur, monkeypatch):
+    dictionnaire = TermDictionary(moteur.vocab)
+    assert len(dictionnaire.motif("*e")) > 2
+    monkeypatch.setattr(TermDictionary, "MAX_EXPANSIONS", 2)
+    assert dictionnaire.motif("*e") == ["intelligence", "artificielle"]
+    assert dictionnaire.prefixe("i", n=1) == ["intelligence"]
+
+
+def test_corrections(moteur):
+    dictionnaire = TermDictionary(moteur.vocab)
+    assert distance_edition("robto", "robot", 2) == 1
+    assert dictionnaire.corrections("robto") == [("robot", 1)]
+    assert dictionnaire.corrections("intelligance") == [("intelligence", 1)]
+    assert dictionnaire.corrections("artficiele") == [("artificielle", 2)]
+    # Une seule faute tolérée pour un mot court
+    assert dictionnaire.corrections("aple") == [("apple", 1)]
+    assert dictionnaire.corrections("rbt") == []
+
+
+def test_developper_suit_le_vocabulaire(moteur, documents):
+    dictionnaire = TermDictionary(moteur.vocab)
+    assert dictionnaire.developper("robot") == ["robot"]
+    assert dictionnaire.developper("robto") == ["robot"]
+    assert dictionnaire.developper("aple") == ["apple"]
+
+    # Termes des documents supprimés écartés, termes ajoutés indexés par mettre_a_jour
+    moteur.remove_documents([2])
+    assert dictionnaire.developper("aple") == []
+    moteur.add_documents([documents[2]])
+    assert dictionnaire.mettre_a_jour() == 0
+    assert dictionnaire.developper("aple") == ["apple"]
+
+
+def test_ordre_des_expansions_apres_un_ajout(moteur):
+    assert moteur._analyser_requete("intellig*")[4] == {"intellig*": ("intelligence", "intelligent")}
+    # Uniquement des termes connus : le vocabulaire ne grandit pas, seuls les comptes changent
+    contenu = " ".join(["intelligent"] * 10)
+    moteur.add_documents([Document("Numerama", "Carla", "Robot", "", "https://exemple.fr/robot", "",
+                                   "2024-01-06T00:00:00Z", contenu, contenu)])
+    assert moteur._analyser_requete("intellig*")[4] == {"intellig*": ("intelligent", "intelligence")}
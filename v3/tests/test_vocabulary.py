@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def test_suppression_sans_modification_en_place(moteur):
+    vocab = moteur.vocab
+    # Tableaux tenus par un lecteur pendant la suppression
+    occurrences, df = vocab.occurrences, vocab.df
+    avant = occurrences.copy(), df.copy()
+    robot = vocab.ids["robot"]
+
+    moteur.remove_documents([3])
+
+    assert np.array_equal(occurrences, avant[0]) and np.array_equal(df, avant[1])
+    assert vocab.occurrences is not occurrences and vocab.df is not df
+    assert vocab.df[robot] == df[robot] - 1
+    assert vocab.occurrences[robot] < occurrences[robot]
+
+
+
+def verifier_top(vocab, n):
+    """Compare top(n) à un tri complet du vocabulaire (les ex aequo à la limite peuvent différer)."""
+    top = vocab.top(n)
+    presents = [i for i in range(len(vocab.occurrences)) if vocab.occurrences[i] > 0]
+    reference = sorted((int(vocab.occurrences[i]) for i in presents), reverse=True)[:n]
+    assert [occurrences for _, occurrences, _ in top] == reference
+    assert all(vocab[mot]["occurrences"] == occurrences and vocab[mot]["document_frequency"] == df
+               for mot, occurrences, df in top)
+    if top:
+        limite = top[-1][1]
+        assert {vocab.termes[i] for i in presents if vocab.occurrences[i] > limite} <= {mot for mot, _, _ in top}
+    return top
+
+
+def test_top_tenu_a_jour(moteur, documents, monkeypatch):
+    vocab = moteur.vocab
+    monkeypatch.setattr(vocab, "TAILLE_TOP", 5)
+    assert moteur.get_top_words(3) == verifier_top(vocab, 3)
+    verifier_top(vocab, 5)
+
+    # Ajout : le classement est complété à partir des seuls termes ajoutés, sans recalcul complet
+    moteur.add_documents([documents[3], documents[3]])
+    assert vocab._top is not None
+    assert verifier_top(vocab, 5)[0] == ("robot", 7, 4)
+
+    # Suppression : le classement est recalculé à la lecture suivante
+    moteur.remove_documents([0, 1, 4])
+    assert verifier_top(vocab, 5)[0] == ("robot", 6, 3)
+    verifier_top(vocab, 40)
+
+    moteur.add_documents(documents[:2])
+    assert verifier_top(vocab, 5)[:2] == [("robot", 7, 4), ("intelligence", 5, 3)]